@@ -0,0 +1,53 @@
+"""Store user session tokens as SHA-256 digests.
+
+Revision ID: 202610190001
+Revises: 202411180002
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "202610190001"
+down_revision = "202411180002"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("user_sessions", sa.Column("access_token_hash", sa.LargeBinary(length=32), nullable=True))
+    op.add_column("user_sessions", sa.Column("refresh_token_hash", sa.LargeBinary(length=32), nullable=True))
+
+    # Existing sessions stay valid: digests are computed from the stored JWTs.
+    op.execute(
+        "UPDATE user_sessions SET "
+        "access_token_hash = sha256(convert_to(access_token, 'UTF8')), "
+        "refresh_token_hash = sha256(convert_to(refresh_token, 'UTF8'))"
+    )
+
+    op.alter_column("user_sessions", "access_token_hash", nullable=False)
+    op.alter_column("user_sessions", "refresh_token_hash", nullable=False)
+    op.create_unique_constraint("uq_user_sessions_access_token_hash", "user_sessions", ["access_token_hash"])
+    op.create_unique_constraint("uq_user_sessions_refresh_token_hash", "user_sessions", ["refresh_token_hash"])
+
+    op.drop_column("user_sessions", "access_token")
+    op.drop_column("user_sessions", "refresh_token")
+
+
+def downgrade() -> None:
+    # Plain tokens cannot be recovered from digests, so all sessions are revoked.
+    op.execute("DELETE FROM user_sessions")
+
+    op.add_column("user_sessions", sa.Column("access_token", sa.String(length=1024), nullable=False))
+    op.add_column("user_sessions", sa.Column("refresh_token", sa.String(length=1024), nullable=False))
+    op.create_unique_constraint("user_sessions_access_token_key", "user_sessions", ["access_token"])
+    op.create_unique_constraint("user_sessions_refresh_token_key", "user_sessions", ["refresh_token"])
+
+    op.drop_constraint("uq_user_sessions_refresh_token_hash", "user_sessions", type_="unique")
+    op.drop_constraint("uq_user_sessions_access_token_hash", "user_sessions", type_="unique")
+    op.drop_column("user_sessions", "refresh_token_hash")
+    op.drop_column("user_sessions", "access_token_hash")
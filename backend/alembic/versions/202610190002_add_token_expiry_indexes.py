@@ -0,0 +1,40 @@
+"""Index token expiry columns for batched cleanup.
+
+Revision ID: 202610190002
+Revises: 202610190001
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190002"
+down_revision = "202610190001"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+INDEXES = {
+    "ix_oauth_states_expires_at": ("oauth_states", ["expires_at"]),
+    "ix_telegram_link_tokens_expires_at": ("telegram_link_tokens", ["expires_at"]),
+    "ix_telegram_link_tokens_used_at": ("telegram_link_tokens", ["used_at"]),
+    "ix_email_verification_tokens_expires_at": ("email_verification_tokens", ["expires_at"]),
+    "ix_email_verification_tokens_used_at": ("email_verification_tokens", ["used_at"]),
+    "ix_user_sessions_refresh_expires_at": ("user_sessions", ["refresh_expires_at"]),
+}
+
+
+def upgrade() -> None:
+    # Sessions and tokens are written on every login; avoid blocking writes.
+    with op.get_context().autocommit_block():
+        for name, (table, columns) in INDEXES.items():
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, (table, _) in reversed(INDEXES.items()):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
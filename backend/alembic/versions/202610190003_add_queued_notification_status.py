@@ -0,0 +1,27 @@
+"""Add queued notification status for background email delivery.
+
+Revision ID: 202610190003
+Revises: 202610190002
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190003"
+down_revision = "202610190002"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE notification_status ADD VALUE IF NOT EXISTS 'queued' BEFORE 'sent'")
+
+
+def downgrade() -> None:
+    # Postgres cannot drop enum values; mark pending deliveries as failed instead.
+    op.execute("UPDATE notifications SET status = 'failed', error = 'Delivery abandoned' WHERE status = 'queued'")
@@ -0,0 +1,25 @@
+"""Add keyset pagination index for subscriptions.
+
+Revision ID: 202610190004
+Revises: 202610190003
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190004"
+down_revision = "202610190003"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_subscriptions_user_end_at_id", "subscriptions", ["user_id", "end_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subscriptions_user_end_at_id", table_name="subscriptions")
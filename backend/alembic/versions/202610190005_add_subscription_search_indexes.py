@@ -0,0 +1,39 @@
+"""Add trigram indexes for subscription search.
+
+Revision ID: 202610190005
+Revises: 202610190004
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "202610190005"
+down_revision = "202610190004"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+SEARCHABLE_COLUMNS = ("name", "vendor", "category", "notes")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for column in SEARCHABLE_COLUMNS:
+            op.create_index(
+                f"ix_subscriptions_{column}_trgm",
+                "subscriptions",
+                [sa.text(f"lower({column}) gin_trgm_ops")],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    for column in reversed(SEARCHABLE_COLUMNS):
+        op.drop_index(f"ix_subscriptions_{column}_trgm", table_name="subscriptions")
@@ -0,0 +1,56 @@
+"""Add per-user subscription summaries.
+
+Revision ID: 202610190006
+Revises: 202610190005
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "202610190006"
+down_revision = "202610190005"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+subscription_status_enum = postgresql.ENUM(
+    "active",
+    "canceled",
+    "expired",
+    "archived",
+    name="subscription_status",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "subscription_summaries",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("status", subscription_status_enum, nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("user_id", "status", "currency", name="pk_subscription_summaries"),
+    )
+    op.execute(
+        "INSERT INTO subscription_summaries (user_id, status, currency, count, total) "
+        "SELECT user_id, status, currency, count(*), sum(price_numeric) "
+        "FROM subscriptions GROUP BY user_id, status, currency"
+    )
+    op.create_index(
+        "ix_subscriptions_user_next_reminder_at",
+        "subscriptions",
+        ["user_id", "next_reminder_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subscriptions_user_next_reminder_at", table_name="subscriptions")
+    op.drop_table("subscription_summaries")
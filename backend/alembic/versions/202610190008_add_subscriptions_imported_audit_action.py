@@ -0,0 +1,29 @@
+"""Add audit action for bulk subscription imports.
+
+Revision ID: 202610190008
+Revises: 202610190007
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190008"
+down_revision = "202610190007"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TYPE audit_action ADD VALUE IF NOT EXISTS 'subscriptions_imported' AFTER 'subscription_snoozed'"
+        )
+
+
+def downgrade() -> None:
+    # Postgres cannot drop enum values; the unused value is left in place.
+    pass
@@ -0,0 +1,68 @@
+"""Track subscription change versions and keep tombstones for delta sync.
+
+Revision ID: 202610190009
+Revises: 202610190008
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "202610190009"
+down_revision = "202610190008"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "subscriptions",
+        sa.Column("change_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_subscriptions_user_change_version",
+        "subscriptions",
+        ["user_id", "change_version"],
+    )
+    op.create_table(
+        "subscription_tombstones",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("change_version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name="fk_subscription_tombstones_user_id_users",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_subscription_tombstones"),
+    )
+    op.create_index(
+        "ix_subscription_tombstones_user_change_version",
+        "subscription_tombstones",
+        ["user_id", "change_version"],
+    )
+    op.create_index(
+        "ix_subscription_tombstones_deleted_at",
+        "subscription_tombstones",
+        ["deleted_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subscription_tombstones_deleted_at", table_name="subscription_tombstones")
+    op.drop_index("ix_subscription_tombstones_user_change_version", table_name="subscription_tombstones")
+    op.drop_table("subscription_tombstones")
+    op.drop_index("ix_subscriptions_user_change_version", table_name="subscriptions")
+    op.drop_column("subscriptions", "change_version")
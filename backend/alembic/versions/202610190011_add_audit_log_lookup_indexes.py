@@ -0,0 +1,34 @@
+"""Add audit log lookup indexes for per-user and per-entity history.
+
+Revision ID: 202610190011
+Revises: 202610190010
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190011"
+down_revision = "202610190010"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+INDEXES = {
+    "ix_audit_log_user_id_ts_id": ["user_id", "ts", "id"],
+    "ix_audit_log_entity_id_ts_id": ["entity_id", "ts", "id"],
+}
+
+
+def upgrade() -> None:
+    # audit_log is large and written on every request; avoid blocking writes.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, "audit_log", columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name in reversed(INDEXES):
+        op.drop_index(name, table_name="audit_log")
@@ -0,0 +1,113 @@
+"""Range partition notifications and audit_log by month.
+
+Revision ID: 202610190012
+Revises: 202610190011
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190012"
+down_revision = "202610190011"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# Months created ahead of the current one; the maintenance task keeps this up.
+PREMAKE_MONTHS = 3
+
+# table -> (partition key, statements creating keys and indexes)
+TABLES: dict[str, tuple[str, list[str]]] = {
+    "notifications": (
+        "created_at",
+        [
+            "ALTER TABLE notifications ADD CONSTRAINT pk_notifications PRIMARY KEY (id, created_at)",
+            "ALTER TABLE notifications ADD CONSTRAINT fk_notifications_subscription_id_subscriptions"
+            " FOREIGN KEY (subscription_id) REFERENCES subscriptions (id) ON DELETE CASCADE",
+            "CREATE INDEX ix_notifications_subscription_id_created_at ON notifications (subscription_id, created_at)",
+        ],
+    ),
+    "audit_log": (
+        "ts",
+        [
+            "ALTER TABLE audit_log ADD CONSTRAINT pk_audit_log PRIMARY KEY (id, ts)",
+            "CREATE INDEX ix_audit_log_user_id_ts_id ON audit_log (user_id, ts, id)",
+            "CREATE INDEX ix_audit_log_entity_id_ts_id ON audit_log (entity_id, ts, id)",
+        ],
+    ),
+}
+
+# Keys and indexes of the plain tables restored on downgrade.
+UNPARTITIONED_TABLES: dict[str, list[str]] = {
+    "notifications": [
+        "ALTER TABLE notifications ADD CONSTRAINT notifications_pkey PRIMARY KEY (id)",
+        "ALTER TABLE notifications ADD CONSTRAINT notifications_subscription_id_fkey"
+        " FOREIGN KEY (subscription_id) REFERENCES subscriptions (id) ON DELETE CASCADE",
+    ],
+    "audit_log": [
+        "ALTER TABLE audit_log ADD CONSTRAINT audit_log_pkey PRIMARY KEY (id)",
+        "CREATE INDEX ix_audit_log_user_id_ts_id ON audit_log (user_id, ts, id)",
+        "CREATE INDEX ix_audit_log_entity_id_ts_id ON audit_log (entity_id, ts, id)",
+    ],
+}
+
+
+def _create_monthly_partitions(parent: str, table: str, column: str) -> None:
+    """Create partitions of ``parent`` named after ``table`` for every month holding rows."""
+
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month timestamptz;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', coalesce(min({column}), now())),
+                    date_trunc('month', now()) + interval '{PREMAKE_MONTHS} months',
+                    interval '1 month'
+                )
+                FROM {table}
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_p' || to_char(month, 'YYYYMM'),
+                    '{parent}',
+                    month,
+                    month + interval '1 month'
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+
+
+def _swap_table(table: str, replacement: str, statements: list[str]) -> None:
+    op.execute(f"INSERT INTO {replacement} SELECT * FROM {table}")
+    op.execute(f"DROP TABLE {table}")
+    op.execute(f"ALTER TABLE {replacement} RENAME TO {table}")
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    # Month boundaries are computed in UTC, matching app.services.partitions.
+    op.execute("SET LOCAL TimeZone = 'UTC'")
+    for table, (column, statements) in TABLES.items():
+        # Reads continue while rows are copied; writes wait for the migration.
+        op.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+        op.execute(
+            f"CREATE TABLE {table}_partitioned (LIKE {table} INCLUDING DEFAULTS) PARTITION BY RANGE ({column})"
+        )
+        _create_monthly_partitions(f"{table}_partitioned", table, column)
+        _swap_table(table, f"{table}_partitioned", statements)
+
+
+def downgrade() -> None:
+    for table, statements in UNPARTITIONED_TABLES.items():
+        op.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+        op.execute(f"CREATE TABLE {table}_unpartitioned (LIKE {table} INCLUDING DEFAULTS)")
+        _swap_table(table, f"{table}_unpartitioned", statements)
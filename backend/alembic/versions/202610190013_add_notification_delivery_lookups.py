@@ -0,0 +1,76 @@
+"""Add notification delivery index and per-channel last sent times.
+
+Revision ID: 202610190013
+Revises: 202610190012
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "202610190013"
+down_revision = "202610190012"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+INDEX_NAME = "ix_notifications_subscription_channel_status_sent_at"
+INDEX_COLUMNS = "subscription_id, channel, status, sent_at"
+
+notification_channel_enum = postgresql.ENUM(name="notification_channel", create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_last_sent",
+        sa.Column("subscription_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("channel", notification_channel_enum, nullable=False),
+        sa.Column("last_sent_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["subscription_id"],
+            ["subscriptions.id"],
+            name="fk_notification_last_sent_subscription_id_subscriptions",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("subscription_id", "channel", name="pk_notification_last_sent"),
+    )
+
+    # Partitioned indexes cannot be built concurrently: create the parent
+    # index on its own, build each partition's index without blocking
+    # writes and attach it; the parent index becomes valid with the last one.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        op.execute(f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON ONLY notifications ({INDEX_COLUMNS})")
+        partitions = bind.execute(
+            sa.text(
+                "SELECT inhrelid::regclass::text FROM pg_inherits"
+                " WHERE inhparent = 'notifications'::regclass ORDER BY 1"
+            )
+        ).scalars().all()
+        for partition in partitions:
+            partition_index = f"{partition}_delivery_idx"
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} ({INDEX_COLUMNS})"
+            )
+            op.execute(f"ALTER INDEX {INDEX_NAME} ATTACH PARTITION {partition_index}")
+
+    op.execute(
+        """
+        INSERT INTO notification_last_sent (subscription_id, channel, last_sent_at)
+        SELECT subscription_id, channel, max(sent_at)
+        FROM notifications
+        WHERE subscription_id IS NOT NULL AND status = 'sent' AND sent_at IS NOT NULL
+        GROUP BY subscription_id, channel
+        ON CONFLICT (subscription_id, channel)
+        DO UPDATE SET last_sent_at = greatest(notification_last_sent.last_sent_at, excluded.last_sent_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="notifications")
+    op.drop_table("notification_last_sent")
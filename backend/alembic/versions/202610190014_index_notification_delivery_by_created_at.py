@@ -0,0 +1,62 @@
+"""Key the notification delivery index by created_at instead of sent_at.
+
+The delivery summary filters on the partition key, so queued and failed
+attempts are counted and partitions outside the window are pruned.
+
+Revision ID: 202610190014
+Revises: 202610190013
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "202610190014"
+down_revision = "202610190013"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# index name -> (columns, suffix of the per-partition index names)
+SENT_AT_INDEX = (
+    "ix_notifications_subscription_channel_status_sent_at",
+    "subscription_id, channel, status, sent_at",
+    "delivery_idx",
+)
+CREATED_AT_INDEX = (
+    "ix_notifications_subscription_channel_status_created_at",
+    "subscription_id, channel, status, created_at",
+    "delivery_created_at_idx",
+)
+
+
+def _create_partitioned_index(name: str, columns: str, suffix: str) -> None:
+    # Partitioned indexes cannot be built concurrently: create the parent
+    # index on its own, build each partition's index without blocking
+    # writes and attach it; the parent index becomes valid with the last one.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY notifications ({columns})")
+        partitions = bind.execute(
+            sa.text(
+                "SELECT inhrelid::regclass::text FROM pg_inherits"
+                " WHERE inhparent = 'notifications'::regclass ORDER BY 1"
+            )
+        ).scalars().all()
+        for partition in partitions:
+            partition_index = f"{partition}_{suffix}"
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} ({columns})")
+            op.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}")
+
+
+def upgrade() -> None:
+    _create_partitioned_index(*CREATED_AT_INDEX)
+    op.drop_index(SENT_AT_INDEX[0], table_name="notifications")
+
+
+def downgrade() -> None:
+    _create_partitioned_index(*SENT_AT_INDEX)
+    op.drop_index(CREATED_AT_INDEX[0], table_name="notifications")
@@ -0,0 +1,173 @@
+"""Response compression negotiated from ``Accept-Encoding``.
+
+Gzip is always available; Brotli is offered when the optional ``brotli``
+package is installed. Routes adjust the defaults with the :func:`compression`
+dependency, e.g. ``dependencies=[Depends(compression(minimum_size=0))]``.
+"""
+from __future__ import annotations
+
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # pragma: no cover - optional dependency
+    import brotli
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    brotli = None
+
+_STATE_KEY = "compression"
+_SKIPPED_MEDIA_TYPES = ("text/event-stream", "image/", "audio/", "video/", "application/zip", "application/gzip")
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """Per-route override of the middleware defaults."""
+
+    enabled: bool = True
+    minimum_size: int | None = None
+
+
+def compression(*, enabled: bool = True, minimum_size: int | None = None) -> Callable[[Request], None]:
+    """Return dependency applying a compression policy to a route or router."""
+
+    policy = CompressionPolicy(enabled=enabled, minimum_size=minimum_size)
+
+    def dependency(request: Request) -> None:
+        request.state.compression = policy
+
+    return dependency
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Return content codings supported by this deployment, preferred first."""
+
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def select_encoding(accept_encoding: str) -> str | None:
+    """Return best supported coding accepted by the client, if any."""
+
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best: str | None = None
+    best_weight = 0.0
+    for coding in available_encodings():
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class _Compressor:
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int) -> None:
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress chunk and flush it so streamed rows reach the client."""
+
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses above a size threshold.
+
+    Buffered responses are compressed in one go; streamed responses are
+    compressed chunk by chunk and flushed, so NDJSON rows still arrive
+    incrementally.
+    """
+
+    def __init__(self, app: ASGIApp, *, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                policy = scope.get("state", {}).get(_STATE_KEY) or CompressionPolicy()
+                minimum_size = self.minimum_size if policy.minimum_size is None else policy.minimum_size
+                media_type = headers.get("content-type", "")
+                if (
+                    not policy.enabled
+                    or "content-encoding" in headers
+                    or start_message["status"] in (204, 304)
+                    or media_type.startswith(_SKIPPED_MEDIA_TYPES)
+                    or (not more_body and len(body) < minimum_size)
+                ):
+                    passthrough = True
+                    if policy.enabled and start_message["status"] == 304:
+                        # The full response would have varied on the encoding.
+                        headers.add_vary_header("Accept-Encoding")
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(coding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers and not headers["etag"].startswith("W/"):
+                    # The encoded representation differs byte-wise from the original.
+                    headers["ETag"] = f"W/{headers['etag']}"
+                if not more_body:
+                    body = compressor.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                del headers["Content-Length"]
+                await send(start_message)
+
+            chunk = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,52 @@
+"""Helpers for conditional GET handling with weak ETags."""
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "private, no-cache"
+_REVALIDATION_HEADERS = ("Cache-Control", "Vary")
+
+
+def make_etag(*parts: object) -> str:
+    """Return weak ETag derived from the given validator parts."""
+
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode("utf-8"),
+        digest_size=12,
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return whether ``If-None-Match`` lists the ETag (weak comparison)."""
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str, response: Response | None = None) -> Response:
+    """Return empty ``304 Not Modified`` response carrying validators.
+
+    ``Vary`` and ``Cache-Control`` are copied from ``response``, the
+    headers the full ``200`` would have carried, so caches keep storing
+    and matching the representation the same way.
+    """
+
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if response is not None:
+        headers.update({name: response.headers[name] for name in _REVALIDATION_HEADERS if name in response.headers})
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach validators to a full response."""
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,133 @@
+"""``Idempotency-Key`` support for retried POST requests.
+
+Routes opt in with ``dependencies=[Depends(idempotency)]``. The dependency
+claims the key before the handler runs and replays the stored response for
+repeated requests; :class:`IdempotencyMiddleware` records the response of
+the request holding the claim.
+"""
+from __future__ import annotations
+
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.responses import Response
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.deps import get_current_user
+from app.db.session import get_sessionmaker
+from app.models.user import User
+from app.services.idempotency import (
+    IdempotencyClaim,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyMismatchError,
+    StoredResponse,
+    claim_idempotency_key,
+    complete_idempotency_key,
+    hash_request,
+    release_idempotency_key,
+)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+_STATE_KEY = "idempotency"
+
+
+class IdempotentReplay(Exception):
+    """Raised by the dependency to answer with a stored response."""
+
+    def __init__(self, response: StoredResponse) -> None:
+        super().__init__("Idempotent replay")
+        self.response = response
+
+
+async def idempotency(
+    request: Request,
+    idempotency_key: str | None = Header(default=None, alias=IDEMPOTENCY_KEY_HEADER, min_length=1, max_length=255),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    """Claim the request's idempotency key or replay the recorded response."""
+
+    if idempotency_key is None:
+        return
+    request_hash = hash_request(
+        [request.method.encode(), request.url.path.encode(), request.url.query.encode(), await request.body()]
+    )
+    try:
+        outcome = await claim_idempotency_key(
+            get_sessionmaker(), user_id=current_user.id, key=idempotency_key, request_hash=request_hash
+        )
+    except IdempotencyKeyMismatchError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    except IdempotencyKeyInProgressError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(exc), headers={"Retry-After": "1"}
+        ) from exc
+    if isinstance(outcome, StoredResponse):
+        raise IdempotentReplay(outcome)
+    request.state.idempotency = outcome
+
+
+async def replay_response(request: Request, exc: IdempotentReplay) -> Response:
+    """Exception handler answering with the stored response."""
+
+    stored = exc.response
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type=stored.content_type,
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+class IdempotencyMiddleware:
+    """Record responses of requests that claimed an idempotency key.
+
+    The response is stored before its last chunk is sent, so a retry issued
+    after the client saw the answer always finds it. Server errors release
+    the claim instead, letting the client retry the request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        content_type: str | None = None
+        body = bytearray()
+        settled = False
+
+        async def settle(claim: IdempotencyClaim) -> None:
+            nonlocal settled
+            settled = True
+            if status_code >= 500:
+                await release_idempotency_key(get_sessionmaker(), claim)
+            else:
+                response = StoredResponse(status_code=status_code, content_type=content_type, body=bytes(body))
+                await complete_idempotency_key(get_sessionmaker(), claim, response)
+
+        async def send_recorded(message: Message) -> None:
+            nonlocal status_code, content_type
+            claim = scope.get("state", {}).get(_STATE_KEY)
+            if claim is None:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = Headers(raw=message["headers"]).get("content-type")
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await settle(claim)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_recorded)
+        except Exception:
+            claim = scope.get("state", {}).get(_STATE_KEY)
+            if claim is not None and not settled:
+                status_code = 500
+                await settle(claim)
+            raise
@@ -0,0 +1,70 @@
+"""Optional MessagePack representation of subscription collections.
+
+Enabled when the ``msgpack`` package is installed. Documents mirror the
+JSON shape except that timestamps use the standard MessagePack timestamp
+extension instead of ISO strings.
+"""
+from __future__ import annotations
+
+import enum
+import uuid
+from collections.abc import Sequence
+from decimal import Decimal
+from typing import Any
+
+from fastapi import Request
+
+try:  # pragma: no cover - optional dependency
+    import msgpack
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_MEDIA_TYPES = frozenset({MSGPACK_MEDIA_TYPE, "application/x-msgpack"})
+_JSON_MEDIA_TYPES = frozenset({"application/json", "application/*", "*/*"})
+
+
+def msgpack_available() -> bool:
+    """Return whether the MessagePack encoding can be offered."""
+
+    return msgpack is not None
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Return whether ``Accept`` prefers MessagePack over JSON."""
+
+    if msgpack is None:
+        return False
+    msgpack_weight = json_weight = 0.0
+    for item in request.headers.get("accept", "").split(","):
+        media_type, _, params = item.strip().partition(";")
+        media_type = media_type.strip().lower()
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if media_type in _MSGPACK_MEDIA_TYPES:
+            msgpack_weight = max(msgpack_weight, weight)
+        elif media_type in _JSON_MEDIA_TYPES:
+            json_weight = max(json_weight, weight)
+    return msgpack_weight > 0 and msgpack_weight >= json_weight
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return format(value, "0.2f")
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__} to MessagePack")
+
+
+def pack_rows(rows: Sequence[dict[str, Any]]) -> bytes:
+    """Encode ``SubscriptionReadRow`` dicts as a MessagePack array."""
+
+    return msgpack.packb(rows, default=_default, datetime=True)
@@ -0,0 +1,45 @@
+"""Per-request SQL profiling middleware."""
+from __future__ import annotations
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.profiling import finish_profile, start_profile
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time"
+
+
+class SQLProfilerMiddleware:
+    """Profile the statements of every request.
+
+    With ``expose_headers`` the number of statements and their total time in
+    milliseconds, as of the start of the response, are sent in
+    ``X-DB-Query-Count`` and ``X-DB-Time``.
+    """
+
+    def __init__(self, app: ASGIApp, *, expose_headers: bool = False) -> None:
+        self.app = app
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile(f"{scope['method']} {scope['path']}")
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(profile.count)
+                headers[QUERY_TIME_HEADER] = f"{profile.total_seconds * 1000:.1f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                profile.name = f"{scope['method']} {route.path}"
+            finish_profile(profile, token)
@@ -0,0 +1,104 @@
+"""Audit log endpoints."""
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import ColumnElement, func, null, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_db
+from app.core.config import settings
+from app.models.subscription import AuditAction, AuditLog
+from app.models.user import User
+from app.schemas.audit import AuditLogRead
+from app.services.pagination import InvalidCursorError, decode_datetime_uuid_cursor, encode_cursor
+
+router = APIRouter(prefix="/api/v1/audit", tags=["audit"])
+
+_MAX_PAGE_SIZE = 500
+_MAX_META_KEYS = 20
+
+
+def _meta_column(meta_keys: str | None) -> ColumnElement:
+    """Return ``meta`` reduced to the comma-separated keys, all of it by default."""
+
+    if meta_keys is None:
+        return AuditLog.meta
+    keys = sorted({key.strip() for key in meta_keys.split(",") if key.strip()})
+    if len(keys) > _MAX_META_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {_MAX_META_KEYS} meta keys are allowed"
+        )
+    if not keys:
+        return null()
+    entries = func.jsonb_each(AuditLog.meta).table_valued("key", "value")
+    return (
+        select(func.jsonb_object_agg(entries.c.key, entries.c.value))
+        .where(entries.c.key.in_(keys))
+        .scalar_subquery()
+    )
+
+
+@router.get("", response_model=list[AuditLogRead], summary="List audit log entries")
+async def list_audit_log(
+    response: Response,
+    user_id: UUID | None = Query(default=None, description="Actor; defaults to the current user"),
+    entity_id: UUID | None = Query(default=None, description="Affected entity"),
+    action: list[AuditAction] | None = Query(default=None, description="Repeat to match several actions"),
+    since: datetime | None = Query(default=None, description="Only entries at or after this time"),
+    until: datetime | None = Query(default=None, description="Only entries before this time"),
+    meta_keys: str | None = Query(
+        default=None, description="Comma-separated meta keys to return; empty omits meta, absent returns all"
+    ),
+    limit: int = Query(default=50, ge=1, le=_MAX_PAGE_SIZE, description="Page size"),
+    cursor: str | None = Query(default=None, description="Cursor from X-Next-Cursor header"),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> list[dict]:
+    """Return audit log entries, newest first.
+
+    Users read their own entries; accounts listed in ``AUDIT_ADMIN_EMAILS``
+    may query any ``user_id`` or omit it. Lookups by user or entity are
+    served by the ``(user_id, ts, id)`` and ``(entity_id, ts, id)`` indexes,
+    and the ``X-Next-Cursor`` header carries the cursor of the next page.
+    """
+
+    if current_user.email.lower() not in settings.audit_admin_email_set:
+        if user_id is not None and user_id != current_user.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to read this audit log")
+        user_id = current_user.id
+
+    stmt = select(
+        AuditLog.id,
+        AuditLog.user_id,
+        AuditLog.action,
+        AuditLog.entity,
+        AuditLog.entity_id,
+        AuditLog.ts,
+        _meta_column(meta_keys).label("meta"),
+    )
+    if user_id is not None:
+        stmt = stmt.where(AuditLog.user_id == user_id)
+    if entity_id is not None:
+        stmt = stmt.where(AuditLog.entity_id == entity_id)
+    if action:
+        stmt = stmt.where(AuditLog.action.in_(action))
+    if since is not None:
+        stmt = stmt.where(AuditLog.ts >= since)
+    if until is not None:
+        stmt = stmt.where(AuditLog.ts < until)
+    if cursor is not None:
+        try:
+            cursor_ts, cursor_id = decode_datetime_uuid_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        stmt = stmt.where(tuple_(AuditLog.ts, AuditLog.id) < tuple_(cursor_ts, cursor_id))
+
+    result = await session.execute(stmt.order_by(AuditLog.ts.desc(), AuditLog.id.desc()).limit(limit + 1))
+    rows = [dict(row) for row in result.mappings()]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1]["ts"], rows[-1]["id"])
+    return rows
@@ -8,16 +8,14 @@ from urllib.parse import urlencode
 
 import logging
 
-import httpx
-
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import delete, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
 from app.core.config import settings
 from app.models.subscription import AuditAction
-from app.models.user import Identity, OAuthProvider, OAuthState, User
+from app.models.user import Identity, OAuthProvider, User
 from app.schemas.auth import (
     AuthCallbackResponse,
     AuthLoginResponse,
@@ -28,18 +26,20 @@ from app.schemas.auth import (
     TokenPair,
 )
 from app.schemas.user import UserRead
+from app.services import google_oauth
 from app.services.audit import record_audit_log
 from app.services.auth import (
     create_user_session,
     get_user_by_refresh_token,
     rotate_session_tokens,
 )
-from app.services.email import EmailDeliveryError
+from app.services.email import create_email_notification, mark_email_notification_failed
 from app.services.email_verification import (
     create_verification_token,
     send_verification_email,
     verify_token,
 )
+from app.services.token_store import OAuthStateRecord, get_token_store
 
 
 logger = logging.getLogger(__name__)
@@ -64,41 +64,11 @@ async def _exchange_google_code(*, code: str, redirect_uri: str) -> tuple[str, s
     if not settings.oauth_client_id or not settings.oauth_client_secret:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Google OAuth client not configured")
 
-    token_payload = {
-        "client_id": settings.oauth_client_id,
-        "client_secret": settings.oauth_client_secret,
-        "code": code,
-        "grant_type": "authorization_code",
-        "redirect_uri": redirect_uri,
-    }
-
-    async with httpx.AsyncClient(timeout=10) as client:
-        token_response = await client.post("https://oauth2.googleapis.com/token", data=token_payload)
-        if token_response.status_code != status.HTTP_200_OK:
-            logger.warning("Google token exchange failed: %s", token_response.text)
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to exchange authorization code")
-        token_data = token_response.json()
-        access_token = token_data.get("access_token")
-        if not access_token:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Google token response missing access token")
-
-        userinfo_response = await client.get(
-            "https://openidconnect.googleapis.com/v1/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        if userinfo_response.status_code != status.HTTP_200_OK:
-            logger.warning("Google userinfo failed: %s", userinfo_response.text)
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to fetch user info")
-        userinfo = userinfo_response.json()
-
-    sub = userinfo.get("sub")
-    email = userinfo.get("email")
-    email_verified = bool(userinfo.get("email_verified", False))
-
-    if not sub or not email:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incomplete user info")
-
-    return sub, email, email_verified
+    try:
+        identity = await google_oauth.exchange_code(code=code, redirect_uri=redirect_uri)
+    except google_oauth.GoogleOAuthError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return identity.sub, identity.email, identity.email_verified
 
 
 def _default_provider() -> OAuthProvider:
@@ -136,14 +106,13 @@ async def login(
     selected_provider = provider or _default_provider()
     state = secrets.token_urlsafe(32)
     expires_at = _current_time() + timedelta(minutes=10)
-    oauth_state = OAuthState(
+    oauth_state = OAuthStateRecord(
         provider=selected_provider,
         state=state,
         redirect_uri=redirect_uri,
         expires_at=expires_at,
     )
-    session.add(oauth_state)
-    await session.flush()
+    await get_token_store().put_oauth_state(session, oauth_state)
     await session.commit()
 
     authorization_url = _build_authorization_url(selected_provider, redirect_uri, state)
@@ -166,9 +135,8 @@ async def auth_callback(
 ) -> AuthCallbackResponse:
     """Exchange OAuth callback for tokens and profile."""
 
-    result = await session.execute(select(OAuthState).where(OAuthState.state == state))
-    oauth_state = result.scalar_one_or_none()
-    if oauth_state is None or oauth_state.expires_at < _current_time():
+    oauth_state = await get_token_store().consume_oauth_state(session, state)
+    if oauth_state is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired state")
 
     provider = oauth_state.provider
@@ -190,7 +158,6 @@ async def auth_callback(
 
     if email_verified is None:
         email_verified = True
-    await session.execute(delete(OAuthState).where(OAuthState.id == oauth_state.id))
 
     identity_stmt = (
         select(Identity, User)
@@ -202,6 +169,7 @@ async def auth_callback(
 
     needs_email_verification = False
     verification_token = None
+    email_notification = None
 
     if identity_row:
         identity, user = identity_row
@@ -231,8 +199,9 @@ async def auth_callback(
 
     if needs_email_verification:
         verification_token = await create_verification_token(session, user)
+        email_notification = await create_email_notification(session)
 
-    user_session = await create_user_session(session, user)
+    _, issued = await create_user_session(session, user)
     await record_audit_log(
         session,
         user_id=user.id,
@@ -245,13 +214,20 @@ async def auth_callback(
 
     if verification_token is not None:
         try:
-            send_verification_email(user, verification_token)
-        except EmailDeliveryError:
-            logger.warning("Failed to send verification email to %s", user.email, exc_info=True)
+            await send_verification_email(
+                user,
+                verification_token,
+                notification_id=email_notification.id if email_notification else None,
+            )
+        except Exception as exc:  # pragma: no cover - broker unavailable
+            logger.warning("Failed to queue verification email to %s", user.email, exc_info=True)
+            if email_notification is not None:
+                # Otherwise the record would stay queued with no task to update it.
+                await mark_email_notification_failed(session, email_notification, f"Failed to queue email: {exc}")
 
     tokens = TokenPair(
-        access_token=user_session.access_token,
-        refresh_token=user_session.refresh_token,
+        access_token=issued.access_token,
+        refresh_token=issued.refresh_token,
         expires_in=settings.access_token_expires_minutes * 60,
         refresh_expires_in=settings.refresh_token_expires_minutes * 60,
     )
@@ -269,12 +245,12 @@ async def refresh_tokens(
     if row is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
     user, user_session = row
-    await rotate_session_tokens(session, user_session)
+    issued = await rotate_session_tokens(session, user_session)
     await session.commit()
 
     tokens = TokenPair(
-        access_token=user_session.access_token,
-        refresh_token=user_session.refresh_token,
+        access_token=issued.access_token,
+        refresh_token=issued.refresh_token,
         expires_in=settings.access_token_expires_minutes * 60,
         refresh_expires_in=settings.refresh_token_expires_minutes * 60,
     )
@@ -1,6 +1,9 @@
-"""Health check endpoint."""
-from fastapi import APIRouter
-from fastapi.responses import PlainTextResponse
+"""Health check and metrics endpoints."""
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse, Response
+
+from app.core.config import settings
+from app.core.metrics import render_metrics
 
 router = APIRouter()
 
@@ -10,3 +13,13 @@ async def health_check() -> str:
     """Return a simple OK response for health checks."""
 
     return "OK"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose Prometheus metrics unless ``METRICS_ENABLED`` is off."""
+
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
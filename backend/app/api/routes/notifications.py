@@ -1,20 +1,36 @@
 """Notification endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
+from app.api.idempotency import idempotency
 from app.models.subscription import AuditAction, Notification, NotificationChannel, NotificationStatus
 from app.models.user import User
-from app.schemas.notification import NotificationTestRequest, NotificationTestResponse
+from app.schemas.notification import (
+    NotificationChannelSummary,
+    NotificationSummaryRead,
+    NotificationTestRequest,
+    NotificationTestResponse,
+)
 from app.services.audit import record_audit_log
+from app.services.notifications import load_delivery_summary, record_last_sent
 from app.services.subscriptions import current_time
 
 router = APIRouter(prefix="/api/v1/notifications", tags=["notifications"])
 
+_SUMMARY_DEFAULT_DAYS = 30
+
 
-@router.post("/test", response_model=NotificationTestResponse, summary="Create test notification")
+@router.post(
+    "/test",
+    response_model=NotificationTestResponse,
+    summary="Create test notification",
+    dependencies=[Depends(idempotency)],
+)
 async def create_test_notification(
     payload: NotificationTestRequest,
     session: AsyncSession = Depends(get_db),
@@ -35,6 +51,13 @@ async def create_test_notification(
     )
     session.add(notification)
     await session.flush()
+    if notification.subscription_id is not None:
+        await record_last_sent(
+            session,
+            subscription_id=notification.subscription_id,
+            channel=notification.channel,
+            sent_at=notification.sent_at,
+        )
 
     await record_audit_log(
         session,
@@ -48,3 +71,26 @@ async def create_test_notification(
     await session.commit()
     await session.refresh(notification)
     return notification
+
+
+@router.get("/summary", response_model=NotificationSummaryRead, summary="Delivery summary")
+async def read_delivery_summary(
+    since: datetime | None = Query(default=None, description=f"Defaults to {_SUMMARY_DEFAULT_DAYS} days ago"),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> NotificationSummaryRead:
+    """Return per-channel delivery counts and last sent times of the user's subscriptions."""
+
+    since = since or current_time() - timedelta(days=_SUMMARY_DEFAULT_DAYS)
+    channels = await load_delivery_summary(session, current_user.id, since=since)
+    return NotificationSummaryRead(
+        since=since,
+        channels=[
+            NotificationChannelSummary(
+                channel=summary.channel,
+                last_sent_at=summary.last_sent_at,
+                **{str(delivery_status): count for delivery_status, count in summary.counts.items()},
+            )
+            for summary in channels
+        ],
+    )
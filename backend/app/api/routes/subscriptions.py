@@ -1,41 +1,162 @@
 """Subscription endpoints."""
 from __future__ import annotations
 
-from datetime import timedelta
-from uuid import UUID
+import asyncio
+import csv
+import enum
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, or_, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import ColumnElement, Select, delete, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.compression import compression
 from app.api.deps import get_current_user, get_db
-from app.models.subscription import AuditAction, Subscription, SubscriptionStatus
+from app.api.etag import etag_matches, make_etag, not_modified, set_etag
+from app.api.idempotency import idempotency
+from app.api.msgpack_codec import MSGPACK_MEDIA_TYPE, msgpack_available, pack_rows, wants_msgpack
+from app.core.config import settings
+from app.db.session import get_sessionmaker
+from app.models.subscription import (
+    AuditAction,
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+    Subscription,
+    SubscriptionStatus,
+    SubscriptionTombstone,
+)
 from app.models.user import User
+from app.schemas.notification import NotificationRead
 from app.schemas.subscription import (
+    SubscriptionBatchCreate,
+    SubscriptionBatchDelete,
+    SubscriptionBatchRequest,
+    SubscriptionBatchResponse,
+    SubscriptionBatchResult,
+    SubscriptionBatchStatus,
+    SubscriptionChangesRead,
+    SubscriptionChangesRow,
     SubscriptionCreate,
+    SubscriptionImportReport,
     SubscriptionRead,
+    SubscriptionReadRow,
+    SubscriptionStatusCounts,
     SubscriptionStatusUpdate,
+    SubscriptionSummaryRead,
+    SubscriptionTombstoneRow,
     SubscriptionUpdate,
+    subscription_changes_adapter,
+    subscription_row_adapter,
+    subscription_rows_adapter,
+)
+from app.services.audit import AuditEntry, record_audit_log, record_audit_logs
+from app.services.pagination import (
+    InvalidCursorError,
+    decode_datetime_uuid_cursor,
+    decode_version_datetime_cursor,
+    encode_cursor,
+)
+from app.services.subscription_changes import record_subscription_change
+from app.services.subscription_events import get_change_listener
+from app.services.subscription_summary import (
+    SummaryKey,
+    apply_summary_delta,
+    apply_summary_deltas,
+    load_summary,
+    summary_key,
+)
+from app.services.subscription_transfer import (
+    ImportLimitError,
+    TransferFormat,
+    csv_header,
+    encode_csv_rows,
+    import_subscriptions,
+    iter_import_rows,
 )
-from app.services.audit import record_audit_log
 from app.services.subscriptions import (
     calculate_next_reminder,
     current_time,
+    new_subscription_values,
     normalize_price,
     resolve_subscription_status,
 )
 
 router = APIRouter(prefix="/api/v1/subscriptions", tags=["subscriptions"])
 
+_MAX_PAGE_SIZE = 500
+_STREAM_BATCH_SIZE = 200
+# Deletes that started before a cursor was issued may commit after it, so
+# cursors expire a little before their tombstones are purged.
+_SYNC_CURSOR_SLACK = timedelta(hours=1)
+_EVENTS_RETRY_MILLISECONDS = 5000
+
+# Columns backing ``SubscriptionRead``, labelled with the response field names.
+_READ_COLUMNS: dict[str, ColumnElement] = {
+    "id": Subscription.id,
+    "user_id": Subscription.user_id,
+    "name": Subscription.name,
+    "price": Subscription.price_numeric.label("price"),
+    "currency": Subscription.currency,
+    "end_at": Subscription.end_at,
+    "status": Subscription.status,
+    "category": Subscription.category,
+    "vendor": Subscription.vendor,
+    "notes": Subscription.notes,
+    "next_reminder_at": Subscription.next_reminder_at,
+    "last_notified_at": Subscription.last_notified_at,
+    "created_at": Subscription.created_at,
+    "updated_at": Subscription.updated_at,
+}
+READ_FIELDS = tuple(SubscriptionRead.model_fields)
+
+
+def subscription_fields(
+    fields: str | None = Query(
+        default=None,
+        description="Comma-separated SubscriptionRead fields to return; id is always included",
+    ),
+) -> tuple[str, ...]:
+    """Parse sparse fieldset into response fields in declaration order."""
+
+    if fields is None:
+        return READ_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(READ_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    requested.add("id")
+    return tuple(name for name in READ_FIELDS if name in requested)
+
+
+def _read_columns(fields: Sequence[str]) -> list[ColumnElement]:
+    return [_READ_COLUMNS[name] for name in fields]
+
 
 async def _get_subscription_or_404(
     session: AsyncSession, subscription_id: UUID, user_id: UUID
 ) -> Subscription:
+    """Load subscription for modification, locking its row until commit.
+
+    Callers derive the summary delta from the loaded state, so concurrent
+    writers must not both start from the same old values.
+    """
+
     result = await session.execute(
-        select(Subscription).where(
+        select(Subscription)
+        .where(
             Subscription.id == subscription_id,
             Subscription.user_id == user_id,
         )
+        .with_for_update()
+        .execution_options(populate_existing=True)
     )
     subscription = result.scalar_one_or_none()
     if subscription is None:
@@ -43,28 +164,114 @@ async def _get_subscription_or_404(
     return subscription
 
 
-@router.get("", response_model=list[SubscriptionRead], summary="List subscriptions")
-async def list_subscriptions(
-    status_filter: SubscriptionStatus | None = Query(default=None, alias="status"),
-    q: str | None = Query(default=None, description="Search query"),
-    soon: bool = Query(default=False, description="Only subscriptions with upcoming reminders"),
-    session: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> list[Subscription]:
-    """Return list of subscriptions for current user with optional filters."""
+def _new_subscription(payload: SubscriptionCreate, current_user: User, now: datetime) -> Subscription:
+    return Subscription(
+        **new_subscription_values(payload, user_id=current_user.id, now=now, user_timezone=current_user.tz)
+    )
+
+
+def _apply_update(subscription: Subscription, update_data: dict, current_user: User, now: datetime) -> None:
+    previous_status = subscription.status
+
+    if "name" in update_data and update_data["name"] is not None:
+        subscription.name = update_data["name"]
+    if "price" in update_data and update_data["price"] is not None:
+        subscription.price_numeric = normalize_price(update_data["price"])
+    if "currency" in update_data and update_data["currency"] is not None:
+        subscription.currency = update_data["currency"]
+    if "end_at" in update_data and update_data["end_at"] is not None:
+        subscription.end_at = update_data["end_at"]
+    if "category" in update_data:
+        subscription.category = update_data.get("category")
+    if "vendor" in update_data:
+        subscription.vendor = update_data.get("vendor")
+    if "notes" in update_data:
+        subscription.notes = update_data.get("notes")
+
+    provided_status = update_data.get("status") if "status" in update_data else None
+    subscription.status = resolve_subscription_status(
+        end_at=subscription.end_at,
+        provided_status=provided_status,
+        existing_status=previous_status,
+        now=now,
+    )
+    if "last_notified_at" in update_data:
+        subscription.last_notified_at = update_data.get("last_notified_at")
+
+    next_reminder_override = update_data.get("next_reminder_at", None)
+    if (
+        "next_reminder_at" in update_data
+        and next_reminder_override is not None
+        and next_reminder_override != subscription.next_reminder_at
+    ):
+        subscription.next_reminder_at = next_reminder_override
+    else:
+        subscription.next_reminder_at = calculate_next_reminder(
+            end_at=subscription.end_at,
+            status=subscription.status,
+            last_notified_at=subscription.last_notified_at,
+            now=now,
+            user_timezone=current_user.tz,
+        )
+
+
+def _apply_status(
+    subscription: Subscription, new_status: SubscriptionStatus, current_user: User, now: datetime
+) -> None:
+    subscription.status = resolve_subscription_status(
+        end_at=subscription.end_at,
+        provided_status=new_status,
+        existing_status=subscription.status,
+        now=now,
+    )
+    subscription.next_reminder_at = calculate_next_reminder(
+        end_at=subscription.end_at,
+        status=subscription.status,
+        last_notified_at=subscription.last_notified_at,
+        now=now,
+        user_timezone=current_user.tz,
+    )
+
+
+class ListSort(str, enum.Enum):
+    """Orderings supported by the list endpoint."""
+
+    end_at = "end_at"
+    relevance = "relevance"
 
-    stmt = select(Subscription).where(Subscription.user_id == current_user.id)
+
+def _search_columns(include_notes: bool) -> list[ColumnElement[str]]:
+    columns = [Subscription.name, Subscription.vendor, Subscription.category]
+    if include_notes:
+        columns.append(Subscription.notes)
+    return [func.lower(column) for column in columns]
+
+
+def _search_rank(q: str, include_notes: bool) -> ColumnElement[float]:
+    """Return trigram relevance of the best matching searchable column."""
+
+    term = q.lower()
+    return func.greatest(*(func.word_similarity(term, column) for column in _search_columns(include_notes)))
+
+
+def _build_list_statement(
+    *,
+    user_id: UUID,
+    status_filter: SubscriptionStatus | None,
+    q: str | None,
+    soon: bool,
+    search_notes: bool = False,
+) -> Select[tuple[Subscription]]:
+    """Return filtered subscriptions query without ordering or paging."""
+
+    stmt = select(Subscription).where(Subscription.user_id == user_id)
     if status_filter is not None:
         stmt = stmt.where(Subscription.status == status_filter)
     if q:
+        # Each lower(column) has a trigram GIN index, so the OR is served by a
+        # bitmap OR of index scans instead of scanning the user's rows.
         like_pattern = f"%{q.lower()}%"
-        stmt = stmt.where(
-            or_(
-                func.lower(Subscription.name).like(like_pattern),
-                func.lower(Subscription.vendor).like(like_pattern),
-                func.lower(Subscription.category).like(like_pattern),
-            )
-        )
+        stmt = stmt.where(or_(*(column.like(like_pattern) for column in _search_columns(search_notes))))
     if soon:
         now = current_time()
         horizon = now + timedelta(days=7)
@@ -72,50 +279,379 @@ async def list_subscriptions(
             Subscription.next_reminder_at.isnot(None),
             Subscription.next_reminder_at <= horizon,
         )
-    stmt = stmt.order_by(Subscription.end_at.asc())
-    result = await session.scalars(stmt)
-    return list(result)
+    return stmt
 
 
-@router.post("", response_model=SubscriptionRead, status_code=status.HTTP_201_CREATED)
-async def create_subscription(
-    payload: SubscriptionCreate,
+async def _stream_subscriptions(
+    stmt: Select, stream_format: TransferFormat, fields: Sequence[str] = READ_FIELDS
+) -> AsyncIterator[bytes]:
+    """Serialize rows as they arrive from a server-side cursor."""
+
+    # The request-scoped session is closed before the body is sent, so the
+    # stream owns a dedicated one for its lifetime.
+    session_factory = get_sessionmaker()
+    async with session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE))
+        first = True
+        if stream_format is TransferFormat.json:
+            yield b"["
+        elif stream_format is TransferFormat.csv:
+            yield csv_header(fields)
+        async for partition in result.mappings().partitions():
+            if stream_format is TransferFormat.csv:
+                yield encode_csv_rows(partition, fields)
+                continue
+            rows = [SubscriptionReadRow(**row) for row in partition]
+            if stream_format is TransferFormat.ndjson:
+                yield b"".join(subscription_row_adapter.dump_json(row) + b"\n" for row in rows)
+            else:
+                # Strip the array brackets so batches splice into one array.
+                payload = subscription_rows_adapter.dump_json(rows)[1:-1]
+                yield payload if first else b"," + payload
+            first = False
+        if stream_format is TransferFormat.json:
+            yield b"]"
+
+
+@router.get("", response_model=list[SubscriptionRead], summary="List subscriptions")
+async def list_subscriptions(
+    request: Request,
+    response: Response,
+    status_filter: SubscriptionStatus | None = Query(default=None, alias="status"),
+    q: str | None = Query(default=None, description="Search query"),
+    search_notes: bool = Query(default=False, description="Also match q against notes"),
+    sort: ListSort = Query(default=ListSort.end_at, description="Order by end date or search relevance"),
+    soon: bool = Query(default=False, description="Only subscriptions with upcoming reminders"),
+    limit: int | None = Query(default=None, ge=1, le=_MAX_PAGE_SIZE, description="Page size"),
+    cursor: str | None = Query(default=None, description="Cursor from X-Next-Cursor header"),
+    include_total: bool = Query(default=False, description="Return X-Total-Count header"),
+    stream: TransferFormat | None = Query(default=None, description="Stream rows as JSON array, NDJSON or CSV"),
+    fields: tuple[str, ...] = Depends(subscription_fields),
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> Subscription:
-    """Create new subscription for current user."""
+) -> Response:
+    """Return list of subscriptions for current user with optional filters.
 
-    now = current_time()
-    status_value = resolve_subscription_status(
-        end_at=payload.end_at,
-        provided_status=payload.status,
-        existing_status=None,
-        now=now,
-    )
-    subscription = Subscription(
+    Results are ordered by ``(end_at, id)``. When ``limit`` is given and more
+    rows remain, the ``X-Next-Cursor`` header carries the cursor of the next page.
+    ``sort=relevance`` orders matches of ``q`` by trigram similarity instead and
+    does not support cursors.
+
+    Only the response columns are selected and rows are encoded straight to
+    JSON by a precompiled adapter, bypassing ORM hydration and
+    ``response_model`` validation; ``response_model`` still documents the shape.
+    Clients sending ``Accept: application/msgpack`` receive MessagePack when
+    the optional encoder is installed. ``fields`` narrows both the selected
+    columns and the output, so e.g. ``notes`` is only read when requested.
+    """
+
+    by_relevance = sort is ListSort.relevance and bool(q)
+    if by_relevance and cursor is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor is not supported with relevance sort")
+
+    # Without ``stream`` the client may negotiate MessagePack via ``Accept``.
+    media_type = MSGPACK_MEDIA_TYPE if stream is None and wants_msgpack(request) else "application/json"
+    if msgpack_available():
+        response.headers["Vary"] = "Accept"
+
+    # ``soon`` depends on the clock, so only the other listings are cacheable.
+    etag = None
+    if not soon:
+        etag = make_etag(
+            "subscriptions",
+            current_user.id,
+            current_user.subscriptions_version,
+            request.url.query,
+            media_type,
+        )
+        set_etag(response, etag)
+        if etag_matches(request, etag):
+            return not_modified(etag, response)
+
+    stmt = _build_list_statement(
         user_id=current_user.id,
-        name=payload.name,
-        price_numeric=normalize_price(payload.price),
-        currency=payload.currency,
-        end_at=payload.end_at,
-        status=status_value,
-        category=payload.category,
-        vendor=payload.vendor,
-        notes=payload.notes,
+        status_filter=status_filter,
+        q=q,
+        soon=soon,
+        search_notes=search_notes,
     )
-    subscription.last_notified_at = payload.last_notified_at
-    if "next_reminder_at" in payload.model_fields_set:
-        subscription.next_reminder_at = payload.next_reminder_at
+
+    if include_total:
+        total = await session.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+        response.headers["X-Total-Count"] = str(total or 0)
+
+    if cursor is not None:
+        try:
+            cursor_end_at, cursor_id = decode_datetime_uuid_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        stmt = stmt.where(tuple_(Subscription.end_at, Subscription.id) > tuple_(cursor_end_at, cursor_id))
+    if by_relevance:
+        stmt = stmt.order_by(_search_rank(q, search_notes).desc(), Subscription.end_at.asc(), Subscription.id.asc())
     else:
-        subscription.next_reminder_at = calculate_next_reminder(
-            end_at=subscription.end_at,
-            status=subscription.status,
-            last_notified_at=subscription.last_notified_at,
-            now=now,
+        stmt = stmt.order_by(Subscription.end_at.asc(), Subscription.id.asc())
+
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name in {"x-total-count", "etag", "cache-control", "vary"}
+    }
+
+    if stream is not None:
+        stmt = stmt.with_only_columns(*_read_columns(fields))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return StreamingResponse(
+            _stream_subscriptions(stmt, stream, fields), media_type=stream.media_type, headers=headers
+        )
+
+    # The next cursor needs ``end_at`` even when the client did not ask for it.
+    needs_end_at = limit is not None and not by_relevance and "end_at" not in fields
+    stmt = stmt.with_only_columns(*_read_columns(fields), *([Subscription.end_at] if needs_end_at else []))
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    result = await session.execute(stmt)
+    mappings = result.mappings().all()
+    if limit is not None and len(mappings) > limit:
+        mappings = mappings[:limit]
+        if not by_relevance:
+            last = mappings[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last["end_at"], last["id"])
+    if needs_end_at:
+        rows = [SubscriptionReadRow(**{name: row[name] for name in fields}) for row in mappings]
+    else:
+        rows = [SubscriptionReadRow(**row) for row in mappings]
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return Response(content=pack_rows(rows), media_type=media_type, headers=headers)
+    return Response(content=subscription_rows_adapter.dump_json(rows), media_type=media_type, headers=headers)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export subscriptions",
+    dependencies=[Depends(compression(minimum_size=0))],
+    responses={200: {"content": {"text/csv": {}, "application/x-ndjson": {}, "application/json": {}}}},
+)
+async def export_subscriptions(
+    file_format: TransferFormat = Query(default=TransferFormat.csv, alias="format"),
+    fields: tuple[str, ...] = Depends(subscription_fields),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Download all subscriptions of current user as a backup file.
+
+    Rows are streamed from a server-side cursor, so memory use does not grow
+    with the number of subscriptions.
+    """
+
+    stmt = (
+        select(*_read_columns(fields))
+        .where(Subscription.user_id == current_user.id)
+        .order_by(Subscription.end_at.asc(), Subscription.id.asc())
+    )
+    filename = f"subscriptions.{file_format.value}"
+    return StreamingResponse(
+        _stream_subscriptions(stmt, file_format, fields),
+        media_type=file_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _read_body(request: Request, max_bytes: int) -> bytes:
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Import is limited to {max_bytes} bytes",
+            )
+    return bytes(body)
+
+
+@router.post("/import", response_model=SubscriptionImportReport, summary="Import subscriptions")
+async def import_subscription_file(
+    request: Request,
+    file_format: TransferFormat = Query(default=TransferFormat.csv, alias="format"),
+    dry_run: bool = Query(default=False, description="Validate without saving"),
+    skip_invalid: bool = Query(default=False, description="Import valid rows even if some rows are invalid"),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> SubscriptionImportReport:
+    """Create subscriptions from a CSV, NDJSON or JSON array request body.
+
+    Rows use the ``SubscriptionCreate`` fields; unknown columns such as the
+    ``id`` of an export are ignored. Unless ``skip_invalid`` is set, any
+    invalid row aborts the import and only the error report is returned.
+    """
+
+    body = await _read_body(request, settings.subscription_import_max_bytes)
+    try:
+        result = await import_subscriptions(
+            session,
+            iter_import_rows(body, file_format),
+            user_id=current_user.id,
             user_timezone=current_user.tz,
+            dry_run=dry_run,
+            skip_invalid=skip_invalid,
+            batch_size=settings.subscription_import_batch_size,
+            max_rows=settings.subscription_import_max_rows,
+        )
+    except ImportLimitError as exc:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)) from exc
+    except (UnicodeDecodeError, csv.Error, ValueError) as exc:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed import file") from exc
+
+    if result.imported:
+        await session.commit()
+    else:
+        await session.rollback()
+    return SubscriptionImportReport(
+        dry_run=dry_run,
+        total_rows=result.total_rows,
+        valid_rows=result.valid_rows,
+        imported=result.imported,
+        error_count=result.error_count,
+        errors=result.errors,
+    )
+
+
+@router.get("/changes", response_model=SubscriptionChangesRead, summary="Delta sync")
+async def list_subscription_changes(
+    since: str | None = Query(default=None, description="Cursor from the previous changes response"),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Return subscriptions written and tombstones of those deleted since ``since``.
+
+    Without ``since``, or with a cursor older than the tombstone retention,
+    the whole collection is returned with ``reset=true`` and clients replace
+    their replica. The returned ``cursor`` is passed as ``since`` next time.
+    """
+
+    now = current_time()
+    # Read before the rows: every change up to this version is already
+    # committed, while newer rows that slip in are simply sent again later.
+    version = current_user.subscriptions_version
+    since_version: int | None = None
+    if since is not None:
+        try:
+            since_version, issued_at = decode_version_datetime_cursor(since)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        horizon = now - timedelta(minutes=settings.subscription_tombstone_retention_minutes) + _SYNC_CURSOR_SLACK
+        if since_version > version or issued_at < horizon:
+            since_version = None
+
+    upserted: list[SubscriptionReadRow] = []
+    deleted: list[SubscriptionTombstoneRow] = []
+    if since_version is None or since_version < version:
+        stmt = select(*_read_columns(READ_FIELDS)).where(Subscription.user_id == current_user.id)
+        if since_version is not None:
+            stmt = stmt.where(Subscription.change_version > since_version)
+        result = await session.execute(stmt.order_by(Subscription.change_version.asc(), Subscription.id.asc()))
+        upserted = [SubscriptionReadRow(**row) for row in result.mappings()]
+    if since_version is not None and since_version < version:
+        result = await session.execute(
+            select(SubscriptionTombstone.id, SubscriptionTombstone.deleted_at)
+            .where(
+                SubscriptionTombstone.user_id == current_user.id,
+                SubscriptionTombstone.change_version > since_version,
+            )
+            .order_by(SubscriptionTombstone.change_version.asc())
         )
+        deleted = [SubscriptionTombstoneRow(**row) for row in result.mappings()]
+
+    content = subscription_changes_adapter.dump_json(
+        SubscriptionChangesRow(
+            cursor=encode_cursor(version, now),
+            reset=since_version is None,
+            upserted=upserted,
+            deleted=deleted,
+        )
+    )
+    return Response(content=content, media_type="application/json")
+
+
+def _change_event(version: int | None) -> bytes:
+    data = json.dumps({"version": version})
+    event_id = f"id: {version}\n" if version is not None else ""
+    return f"event: changes\n{event_id}data: {data}\n\n".encode()
+
+
+async def _stream_change_events(user_id: UUID, version: int) -> AsyncIterator[bytes]:
+    """Emit a ``changes`` event whenever user's collection version moves."""
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.subscription_events_max_age_seconds
+    async with get_change_listener().subscribe(user_id) as subscription:
+        subscription.push(version)
+        yield f"retry: {_EVENTS_RETRY_MILLISECONDS}\n".encode()
+        # Streams end after a while so clients reconnect and re-authenticate.
+        while (remaining := deadline - loop.time()) > 0:
+            if await subscription.wait(min(settings.subscription_events_heartbeat_seconds, remaining)):
+                yield _change_event(subscription.version)
+            else:
+                yield b": keepalive\n\n"
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    summary="Live change events",
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def subscription_events(current_user: User = Depends(get_current_user)) -> StreamingResponse:
+    """Stream Server-Sent Events announcing changes to user's subscriptions.
+
+    Each ``changes`` event carries the new collection version and the client
+    fetches the rows through ``GET /changes``. The first event is sent right
+    away so a (re)connecting client catches up on anything it missed.
+    """
+
+    return StreamingResponse(
+        _stream_change_events(current_user.id, current_user.subscriptions_version),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/summary", response_model=SubscriptionSummaryRead, summary="Dashboard summary")
+async def read_subscription_summary(
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> SubscriptionSummaryRead:
+    """Return per-status counts, spending per currency and due reminders."""
+
+    summary = await load_summary(session, current_user.id)
+    counts = {str(key): value for key, value in summary.counts.items()}
+    return SubscriptionSummaryRead(
+        counts=SubscriptionStatusCounts(**counts, total=sum(counts.values())),
+        reminders_due=summary.reminders_due,
+        totals_by_currency=summary.totals_by_currency,
+    )
+
+
+@router.post(
+    "",
+    response_model=SubscriptionRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(idempotency)],
+)
+async def create_subscription(
+    payload: SubscriptionCreate,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Subscription:
+    """Create new subscription for current user."""
+
+    subscription = _new_subscription(payload, current_user, current_time())
     session.add(subscription)
     await session.flush()
+    await apply_summary_delta(session, user_id=current_user.id, before=None, after=summary_key(subscription))
+    await record_subscription_change(session, user_id=current_user.id, changed=[subscription.id])
     await record_audit_log(
         session,
         user_id=current_user.id,
@@ -129,16 +665,239 @@ async def create_subscription(
     return subscription
 
 
+@router.post(
+    "/batch",
+    response_model=SubscriptionBatchResponse,
+    summary="Apply batch of mutations",
+    dependencies=[Depends(idempotency)],
+)
+async def batch_subscriptions(
+    payload: SubscriptionBatchRequest,
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> SubscriptionBatchResponse:
+    """Apply create/update/delete/status operations in a single transaction.
+
+    Operations run in request order. An operation referencing a missing
+    subscription is reported as failed without affecting the others; the
+    remaining changes are flushed, audited and committed together.
+    """
+
+    now = current_time()
+    referenced_ids = {
+        operation.id for operation in payload.operations if not isinstance(operation, SubscriptionBatchCreate)
+    }
+    existing: dict[UUID, Subscription] = {}
+    if referenced_ids:
+        # Locked in id order, so concurrent batches cannot deadlock or compute
+        # summary deltas from the same old state.
+        result = await session.scalars(
+            select(Subscription)
+            .where(
+                Subscription.user_id == current_user.id,
+                Subscription.id.in_(referenced_ids),
+            )
+            .order_by(Subscription.id)
+            .with_for_update()
+        )
+        existing = {subscription.id: subscription for subscription in result}
+
+    results: list[SubscriptionBatchResult] = []
+    previous_keys: dict[UUID, SummaryKey | None] = {}
+    touched: dict[UUID, Subscription] = {}
+    deleted: dict[UUID, Subscription] = {}
+    audit_entries: list[AuditEntry] = []
+    for index, operation in enumerate(payload.operations):
+        if isinstance(operation, SubscriptionBatchCreate):
+            subscription = _new_subscription(operation.data, current_user, now)
+            # Assigned eagerly so the id is known before the shared flush.
+            subscription.id = uuid4()
+            session.add(subscription)
+            existing[subscription.id] = subscription
+            previous_keys[subscription.id] = None
+            touched[subscription.id] = subscription
+            audit_entries.append(
+                AuditEntry(
+                    user_id=current_user.id,
+                    action=AuditAction.subscription_created,
+                    entity="subscription",
+                    entity_id=subscription.id,
+                    meta={"status": str(subscription.status)},
+                )
+            )
+            results.append(SubscriptionBatchResult(index=index, op=operation.op, id=subscription.id, ok=True))
+            continue
+
+        subscription = existing.get(operation.id)
+        if subscription is None or operation.id in deleted:
+            results.append(
+                SubscriptionBatchResult(
+                    index=index, op=operation.op, id=operation.id, ok=False, error="Subscription not found"
+                )
+            )
+            continue
+
+        previous_keys.setdefault(subscription.id, summary_key(subscription))
+        if isinstance(operation, SubscriptionBatchDelete):
+            touched.pop(subscription.id, None)
+            deleted[subscription.id] = subscription
+            audit_entries.append(
+                AuditEntry(
+                    user_id=current_user.id,
+                    action=AuditAction.subscription_deleted,
+                    entity="subscription",
+                    entity_id=subscription.id,
+                )
+            )
+        elif isinstance(operation, SubscriptionBatchStatus):
+            previous_status = subscription.status
+            _apply_status(subscription, operation.status, current_user, now)
+            touched[subscription.id] = subscription
+            audit_entries.append(
+                AuditEntry(
+                    user_id=current_user.id,
+                    action=AuditAction.subscription_status_changed,
+                    entity="subscription",
+                    entity_id=subscription.id,
+                    meta={"from": str(previous_status), "to": str(subscription.status)},
+                )
+            )
+        else:
+            _apply_update(subscription, operation.data.model_dump(exclude_unset=True), current_user, now)
+            touched[subscription.id] = subscription
+            audit_entries.append(
+                AuditEntry(
+                    user_id=current_user.id,
+                    action=AuditAction.subscription_updated,
+                    entity="subscription",
+                    entity_id=subscription.id,
+                    meta={"status": str(subscription.status)},
+                )
+            )
+        results.append(SubscriptionBatchResult(index=index, op=operation.op, id=subscription.id, ok=True))
+
+    if not audit_entries:
+        return SubscriptionBatchResponse(results=results)
+
+    # Deleted rows leave the session before the flush so pending edits to them
+    # are dropped and rows created within the batch are never inserted.
+    for subscription in deleted.values():
+        session.expunge(subscription)
+    await session.flush()
+    stored_ids = [subscription_id for subscription_id in deleted if previous_keys[subscription_id] is not None]
+    if stored_ids:
+        # Notifications go through ON DELETE CASCADE instead of per-row ORM
+        # cascades that would load each collection.
+        await session.execute(delete(Subscription).where(Subscription.id.in_(stored_ids)))
+
+    await apply_summary_deltas(
+        session,
+        user_id=current_user.id,
+        changes=[
+            (before, summary_key(touched[subscription_id]) if subscription_id in touched else None)
+            for subscription_id, before in previous_keys.items()
+        ],
+    )
+    await record_subscription_change(session, user_id=current_user.id, changed=touched, deleted=stored_ids)
+    await record_audit_logs(session, audit_entries)
+    await session.commit()
+
+    if touched:
+        # Server-side timestamps were expired by the flush; reload them in one query.
+        await session.scalars(
+            select(Subscription)
+            .where(Subscription.id.in_(touched))
+            .execution_options(populate_existing=True)
+        )
+    for item in results:
+        if item.ok and item.id in touched:
+            item.subscription = SubscriptionRead.model_validate(touched[item.id])
+    return SubscriptionBatchResponse(results=results)
+
+
 @router.get("/{subscription_id}", response_model=SubscriptionRead)
 async def get_subscription(
     subscription_id: UUID,
+    request: Request,
+    fields: tuple[str, ...] = Depends(subscription_fields),
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> Subscription:
-    """Retrieve subscription by id."""
+) -> Response:
+    """Retrieve subscription by id, optionally narrowed to ``fields``."""
 
-    subscription = await _get_subscription_or_404(session, subscription_id, current_user.id)
-    return subscription
+    # A sparse representation gets its own validator.
+    sparse = fields if fields != READ_FIELDS else ()
+    ownership = (Subscription.id == subscription_id, Subscription.user_id == current_user.id)
+    if request.headers.get("if-none-match"):
+        # Revalidation only needs the row timestamp, not the full row.
+        updated_at = await session.scalar(select(Subscription.updated_at).where(*ownership))
+        if updated_at is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found")
+        etag = make_etag("subscription", subscription_id, updated_at.isoformat(), *sparse)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    result = await session.execute(
+        select(*_read_columns(fields), Subscription.updated_at.label("_updated_at")).where(*ownership)
+    )
+    row = result.mappings().one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found")
+    response = Response(
+        content=subscription_row_adapter.dump_json(SubscriptionReadRow(**{name: row[name] for name in fields})),
+        media_type="application/json",
+    )
+    set_etag(response, make_etag("subscription", subscription_id, row["_updated_at"].isoformat(), *sparse))
+    return response
+
+
+@router.get(
+    "/{subscription_id}/notifications",
+    response_model=list[NotificationRead],
+    summary="Notification delivery history",
+)
+async def list_subscription_notifications(
+    subscription_id: UUID,
+    response: Response,
+    channel: NotificationChannel | None = Query(default=None, description="Only this channel"),
+    status_filter: NotificationStatus | None = Query(default=None, alias="status", description="Only this status"),
+    limit: int = Query(default=50, ge=1, le=_MAX_PAGE_SIZE, description="Page size"),
+    cursor: str | None = Query(default=None, description="Cursor from X-Next-Cursor header"),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> list[Notification]:
+    """Return deliveries of a subscription, newest first.
+
+    Pages are keyed on ``(created_at, id)``; the ``X-Next-Cursor`` header
+    carries the cursor of the next page.
+    """
+
+    owned = await session.scalar(
+        select(Subscription.id).where(Subscription.id == subscription_id, Subscription.user_id == current_user.id)
+    )
+    if owned is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found")
+
+    stmt = select(Notification).where(Notification.subscription_id == subscription_id)
+    if channel is not None:
+        stmt = stmt.where(Notification.channel == channel)
+    if status_filter is not None:
+        stmt = stmt.where(Notification.status == status_filter)
+    if cursor is not None:
+        try:
+            cursor_created_at, cursor_id = decode_datetime_uuid_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        stmt = stmt.where(tuple_(Notification.created_at, Notification.id) < tuple_(cursor_created_at, cursor_id))
+
+    result = await session.scalars(
+        stmt.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1)
+    )
+    notifications = list(result)
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(notifications[-1].created_at, notifications[-1].id)
+    return notifications
 
 
 @router.put("/{subscription_id}", response_model=SubscriptionRead)
@@ -175,50 +934,15 @@ async def _update_subscription(
     current_user: User,
 ) -> Subscription:
     now = current_time()
-    previous_status = subscription.status
+    previous_key = summary_key(subscription)
 
-    if "name" in update_data and update_data["name"] is not None:
-        subscription.name = update_data["name"]
-    if "price" in update_data and update_data["price"] is not None:
-        subscription.price_numeric = normalize_price(update_data["price"])
-    if "currency" in update_data and update_data["currency"] is not None:
-        subscription.currency = update_data["currency"]
-    if "end_at" in update_data and update_data["end_at"] is not None:
-        subscription.end_at = update_data["end_at"]
-    if "category" in update_data:
-        subscription.category = update_data.get("category")
-    if "vendor" in update_data:
-        subscription.vendor = update_data.get("vendor")
-    if "notes" in update_data:
-        subscription.notes = update_data.get("notes")
-
-    provided_status = update_data.get("status") if "status" in update_data else None
-    subscription.status = resolve_subscription_status(
-        end_at=subscription.end_at,
-        provided_status=provided_status,
-        existing_status=previous_status,
-        now=now,
-    )
-    if "last_notified_at" in update_data:
-        subscription.last_notified_at = update_data.get("last_notified_at")
-
-    next_reminder_override = update_data.get("next_reminder_at", None)
-    if (
-        "next_reminder_at" in update_data
-        and next_reminder_override is not None
-        and next_reminder_override != subscription.next_reminder_at
-    ):
-        subscription.next_reminder_at = next_reminder_override
-    else:
-        subscription.next_reminder_at = calculate_next_reminder(
-            end_at=subscription.end_at,
-            status=subscription.status,
-            last_notified_at=subscription.last_notified_at,
-            now=now,
-            user_timezone=current_user.tz,
-        )
+    _apply_update(subscription, update_data, current_user, now)
 
     await session.flush()
+    await apply_summary_delta(
+        session, user_id=current_user.id, before=previous_key, after=summary_key(subscription)
+    )
+    await record_subscription_change(session, user_id=current_user.id, changed=[subscription.id])
     await record_audit_log(
         session,
         user_id=current_user.id,
@@ -242,6 +966,8 @@ async def delete_subscription(
 
     subscription = await _get_subscription_or_404(session, subscription_id, current_user.id)
     await session.delete(subscription)
+    await apply_summary_delta(session, user_id=current_user.id, before=summary_key(subscription), after=None)
+    await record_subscription_change(session, user_id=current_user.id, deleted=[subscription.id])
     await record_audit_log(
         session,
         user_id=current_user.id,
@@ -264,6 +990,7 @@ async def snooze_subscription(
     now = current_time()
     subscription.next_reminder_at = now + timedelta(days=1)
     await session.flush()
+    await record_subscription_change(session, user_id=current_user.id, changed=[subscription.id])
     await record_audit_log(
         session,
         user_id=current_user.id,
@@ -286,22 +1013,14 @@ async def update_subscription_status(
     """Update subscription status explicitly."""
 
     subscription = await _get_subscription_or_404(session, subscription_id, current_user.id)
-    now = current_time()
     previous_status = subscription.status
-    subscription.status = resolve_subscription_status(
-        end_at=subscription.end_at,
-        provided_status=payload.status,
-        existing_status=previous_status,
-        now=now,
-    )
-    subscription.next_reminder_at = calculate_next_reminder(
-        end_at=subscription.end_at,
-        status=subscription.status,
-        last_notified_at=subscription.last_notified_at,
-        now=now,
-        user_timezone=current_user.tz,
-    )
+    previous_key = summary_key(subscription)
+    _apply_status(subscription, payload.status, current_user, current_time())
     await session.flush()
+    await apply_summary_delta(
+        session, user_id=current_user.id, before=previous_key, after=summary_key(subscription)
+    )
+    await record_subscription_change(session, user_id=current_user.id, changed=[subscription.id])
     await record_audit_log(
         session,
         user_id=current_user.id,
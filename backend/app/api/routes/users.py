@@ -1,9 +1,10 @@
 """User endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
 from app.api.deps import get_current_user
+from app.api.etag import etag_matches, make_etag, not_modified, set_etag
 from app.models.user import User
 from app.schemas.user import UserRead
 
@@ -11,7 +12,15 @@ router = APIRouter(prefix="/api/v1/users", tags=["users"])
 
 
 @router.get("/me", response_model=UserRead, summary="Get current user")
-async def read_current_user(current_user: User = Depends(get_current_user)) -> User:
+async def read_current_user(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+) -> User | Response:
     """Return current authenticated user."""
 
+    etag = make_etag("user", current_user.id, current_user.updated_at.isoformat())
+    set_etag(response, etag)
+    if etag_matches(request, etag):
+        return not_modified(etag, response)
     return current_user
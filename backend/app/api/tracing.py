@@ -0,0 +1,59 @@
+"""Server spans for HTTP requests."""
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.tracing import close_span, open_span
+
+_UNMATCHED_ROUTE = "unmatched"
+
+
+class TracingMiddleware:
+    """Run each request in a server span joining the caller's ``traceparent``.
+
+    The span is renamed after the route template once routing has matched,
+    and marked as failed on 5xx responses and unhandled exceptions.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        handle = open_span(
+            f"{method} {_UNMATCHED_ROUTE}",
+            headers,
+            kind="server",
+            **{"http.request.method": method, "url.path": scope["path"]},
+        )
+        if handle is None:
+            await self.app(scope, receive, send)
+            return
+
+        span = handle[0]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        error: BaseException | bool | None = None
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", _UNMATCHED_ROUTE)
+            span.update_name(f"{method} {template}")
+            span.set_attribute("http.route", template)
+            span.set_attribute("http.response.status_code", status_code)
+            close_span(handle, error=error or status_code >= 500)
@@ -17,12 +17,20 @@ class Settings(BaseSettings):
         alias="DATABASE_URL",
     )
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
+    token_store_backend: str | None = Field(default=None, alias="TOKEN_STORE_BACKEND")
     secret_key: str = Field(default="dev-secret-key", alias="SECRET_KEY")
     base_url: str = Field(default="http://localhost:8000", alias="BASE_URL")
     frontend_url: str = Field(default="http://localhost:5173", alias="FRONTEND_URL")
     oauth_provider: str | None = Field(default=None, alias="OAUTH_PROVIDER")
     oauth_client_id: str | None = Field(default=None, alias="OAUTH_CLIENT_ID")
     oauth_client_secret: str | None = Field(default=None, alias="OAUTH_CLIENT_SECRET")
+    google_token_url: str = Field(default="https://oauth2.googleapis.com/token", alias="GOOGLE_TOKEN_URL")
+    google_userinfo_url: str = Field(
+        default="https://openidconnect.googleapis.com/v1/userinfo", alias="GOOGLE_USERINFO_URL"
+    )
+    google_jwks_url: str = Field(default="https://www.googleapis.com/oauth2/v3/certs", alias="GOOGLE_JWKS_URL")
+    google_issuer: str = Field(default="https://accounts.google.com", alias="GOOGLE_ISSUER")
+    google_jwks_cache_seconds: int = Field(default=3600, alias="GOOGLE_JWKS_CACHE_SECONDS")
     smtp_host: str | None = Field(default=None, alias="SMTP_HOST")
     smtp_port: int | None = Field(default=None, alias="SMTP_PORT")
     smtp_user: str | None = Field(default=None, alias="SMTP_USER")
@@ -39,6 +47,58 @@ class Settings(BaseSettings):
         default=60 * 24 * 30, alias="REFRESH_TOKEN_EXPIRES_MINUTES"
     )
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
+    token_cleanup_batch_size: int = Field(default=500, alias="TOKEN_CLEANUP_BATCH_SIZE")
+    token_cleanup_pause_seconds: float = Field(default=0.2, alias="TOKEN_CLEANUP_PAUSE_SECONDS")
+    token_cleanup_max_batches: int = Field(default=200, alias="TOKEN_CLEANUP_MAX_BATCHES")
+    oauth_state_retention_minutes: int = Field(default=60, alias="OAUTH_STATE_RETENTION_MINUTES")
+    telegram_link_token_retention_minutes: int = Field(
+        default=60 * 24, alias="TELEGRAM_LINK_TOKEN_RETENTION_MINUTES"
+    )
+    email_verification_token_retention_minutes: int = Field(
+        default=60 * 24 * 7, alias="EMAIL_VERIFICATION_TOKEN_RETENTION_MINUTES"
+    )
+    user_session_retention_minutes: int = Field(
+        default=60 * 24 * 7, alias="USER_SESSION_RETENTION_MINUTES"
+    )
+    subscription_tombstone_retention_minutes: int = Field(
+        default=60 * 24 * 30, alias="SUBSCRIPTION_TOMBSTONE_RETENTION_MINUTES"
+    )
+    subscription_import_max_bytes: int = Field(
+        default=32 * 1024 * 1024, alias="SUBSCRIPTION_IMPORT_MAX_BYTES"
+    )
+    subscription_import_max_rows: int = Field(default=100_000, alias="SUBSCRIPTION_IMPORT_MAX_ROWS")
+    subscription_import_batch_size: int = Field(default=1000, alias="SUBSCRIPTION_IMPORT_BATCH_SIZE")
+    compression_minimum_size: int = Field(default=1024, alias="COMPRESSION_MINIMUM_SIZE")
+    compression_gzip_level: int = Field(default=6, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=4, alias="COMPRESSION_BROTLI_QUALITY")
+    subscription_events_heartbeat_seconds: float = Field(
+        default=15.0, alias="SUBSCRIPTION_EVENTS_HEARTBEAT_SECONDS"
+    )
+    subscription_events_max_age_seconds: float = Field(
+        default=60.0 * 60, alias="SUBSCRIPTION_EVENTS_MAX_AGE_SECONDS"
+    )
+    idempotency_key_ttl_minutes: int = Field(default=60 * 24, alias="IDEMPOTENCY_KEY_TTL_MINUTES")
+    idempotency_lock_seconds: float = Field(default=60.0, alias="IDEMPOTENCY_LOCK_SECONDS")
+    idempotency_wait_seconds: float = Field(default=10.0, alias="IDEMPOTENCY_WAIT_SECONDS")
+    audit_log_durability: str = Field(default="transaction", alias="AUDIT_LOG_DURABILITY")
+    audit_log_batch_size: int = Field(default=500, alias="AUDIT_LOG_BATCH_SIZE")
+    audit_log_flush_interval_seconds: float = Field(default=1.0, alias="AUDIT_LOG_FLUSH_INTERVAL_SECONDS")
+    audit_log_max_buffer: int = Field(default=10_000, alias="AUDIT_LOG_MAX_BUFFER")
+    audit_admin_emails: str = Field(default="", alias="AUDIT_ADMIN_EMAILS")
+    partition_premake_months: int = Field(default=3, alias="PARTITION_PREMAKE_MONTHS")
+    partition_retention_action: str = Field(default="drop", alias="PARTITION_RETENTION_ACTION")
+    notification_retention_months: int = Field(default=12, alias="NOTIFICATION_RETENTION_MONTHS")
+    audit_log_retention_months: int = Field(default=24, alias="AUDIT_LOG_RETENTION_MONTHS")
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    worker_metrics_port: int | None = Field(default=None, alias="WORKER_METRICS_PORT")
+    sql_profiling_enabled: bool = Field(default=False, alias="SQL_PROFILING_ENABLED")
+    sql_profiling_n_plus_one_threshold: int = Field(default=5, alias="SQL_PROFILING_N_PLUS_ONE_THRESHOLD")
+    sql_slow_query_ms: float = Field(default=200.0, alias="SQL_SLOW_QUERY_MS")
+    tracing_enabled: bool = Field(default=False, alias="TRACING_ENABLED")
+    tracing_sample_ratio: float = Field(default=0.1, alias="TRACING_SAMPLE_RATIO")
+    tracing_exporter: str = Field(default="file", alias="TRACING_EXPORTER")
+    tracing_file_path: str = Field(default="traces.jsonl", alias="TRACING_FILE_PATH")
+    tracing_otlp_endpoint: str = Field(default="http://localhost:4318/v1/traces", alias="TRACING_OTLP_ENDPOINT")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -56,6 +116,20 @@ class Settings(BaseSettings):
             return self.database_url.replace("postgresql+asyncpg", "postgresql+psycopg")
         return self.database_url
 
+    @property
+    def audit_admin_email_set(self) -> frozenset[str]:
+        """Return lower-cased emails of users allowed to read any audit log."""
+
+        return frozenset(email.strip().lower() for email in self.audit_admin_emails.split(",") if email.strip())
+
+    @property
+    def resolved_token_store_backend(self) -> str:
+        """Return token store backend, preferring Redis when ``REDIS_URL`` is set explicitly."""
+
+        if self.token_store_backend:
+            return self.token_store_backend
+        return "redis" if "redis_url" in self.model_fields_set else "database"
+
     @computed_field
     @property
     def alembic_ini_path(self) -> Path:
@@ -0,0 +1,180 @@
+"""Prometheus metrics shared by the API and the Celery workers.
+
+Processes that fork, such as Celery's prefork pool or several uvicorn
+workers, need ``PROMETHEUS_MULTIPROC_DIR`` pointing at an empty directory
+so samples from all children are merged.
+"""
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+_DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+_LATENESS_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 4 * 3600.0)
+_SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+_QUERY_START_KEY = "metrics_query_start"
+_CONNECT_START_KEY = "metrics_connect_start"
+
+
+def _counter(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return Counter(name, documentation, labelnames)
+
+
+def _gauge(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+    return Gauge(name, documentation, labelnames, multiprocess_mode="livesum")
+
+
+def _histogram(
+    name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] | None = None
+) -> Histogram:
+    if buckets is None:
+        return Histogram(name, documentation, labelnames)
+    return Histogram(name, documentation, labelnames, buckets=buckets)
+
+
+HTTP_REQUESTS = _counter("http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+HTTP_REQUEST_DURATION = _histogram(
+    "http_request_duration_seconds", "Time to send the complete HTTP response", ("method", "route")
+)
+HTTP_REQUESTS_IN_PROGRESS = _gauge("http_requests_in_progress", "HTTP requests being handled", ("method",))
+
+DB_QUERIES = _counter("db_queries_total", "SQL statements executed", ("operation",))
+DB_QUERY_DURATION = _histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("operation",), buckets=_DB_BUCKETS
+)
+DB_CONNECTION_ACQUIRE_DURATION = _histogram(
+    "db_connection_acquire_seconds", "Time to obtain a new database connection", buckets=_DB_BUCKETS
+)
+DB_CONNECTIONS_IN_USE = _gauge("db_connections_in_use", "Database connections checked out of the pool")
+
+EXTERNAL_CALL_DURATION = _histogram(
+    "external_call_duration_seconds", "Latency of Telegram and SMTP calls", ("service", "operation")
+)
+EXTERNAL_CALL_ERRORS = _counter(
+    "external_call_errors_total", "Failed Telegram and SMTP calls", ("service", "operation")
+)
+
+REMINDER_BACKLOG = _gauge("reminder_dispatch_backlog", "Due subscriptions found by the last dispatcher tick")
+REMINDER_LATENESS = _histogram(
+    "reminder_lateness_seconds", "Delay between next_reminder_at and the send", buckets=_LATENESS_BUCKETS
+)
+
+AUDIT_LOG_ENTRIES = _counter(
+    "audit_log_writer_entries_total", "Audit entries handled by the async writer", ("outcome",)
+)
+AUDIT_LOG_FAILED_BATCHES = _counter(
+    "audit_log_writer_failed_batches_total", "Audit batches the async writer failed to insert"
+)
+AUDIT_LOG_BUFFERED = _gauge("audit_log_writer_buffered", "Audit entries waiting in the async writer buffer")
+
+CELERY_TASK_DURATION = _histogram("celery_task_duration_seconds", "Celery task run time", ("task", "state"))
+
+
+@contextmanager
+def track_external_call(service: str, operation: str) -> Iterator[None]:
+    """Time a call to an external service and count it as failed when it raises."""
+
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EXTERNAL_CALL_ERRORS.labels(service, operation).inc()
+        raise
+    finally:
+        EXTERNAL_CALL_DURATION.labels(service, operation).observe(time.perf_counter() - started)
+
+
+def _sql_operation(statement: str) -> str:
+    verb = statement.lstrip()[:6].upper()
+    return verb if verb in _SQL_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record statement counts and timings and connection acquisition of ``engine``.
+
+    With the ``NullPool`` used by this service every checkout opens a new
+    connection, so the acquisition time is the checkout wait.
+    """
+
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        started = conn.info[_QUERY_START_KEY].pop()
+        operation = _sql_operation(statement)
+        DB_QUERIES.labels(operation).inc()
+        DB_QUERY_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context: Any) -> None:
+        if context.connection is not None:
+            starts = context.connection.info.get(_QUERY_START_KEY)
+            if starts:
+                starts.pop()
+
+    @event.listens_for(sync_engine, "do_connect")
+    def _before_connect(dialect: Any, connection_record: Any, cargs: Any, cparams: Any) -> None:
+        connection_record.info[_CONNECT_START_KEY] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "connect")
+    def _after_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        started = connection_record.info.pop(_CONNECT_START_KEY, None)
+        if started is not None:
+            DB_CONNECTION_ACQUIRE_DURATION.observe(time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        DB_CONNECTIONS_IN_USE.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+        DB_CONNECTIONS_IN_USE.dec()
+
+
+def _collecting_registry() -> CollectorRegistry:
+    if _MULTIPROC_ENV not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the exposition text of all metrics and its content type."""
+
+    return generate_latest(_collecting_registry()), CONTENT_TYPE_LATEST
+
+
+def start_exporter(port: int) -> None:
+    """Serve metrics over HTTP from a background thread, e.g. in a Celery worker."""
+
+    start_http_server(port, registry=_collecting_registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop live gauges of an exited child process in multiprocess mode."""
+
+    if _MULTIPROC_ENV in os.environ:
+        multiprocess.mark_process_dead(pid)
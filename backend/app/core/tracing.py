@@ -0,0 +1,195 @@
+"""Distributed tracing across the API, the database, Telegram, SMTP and Celery.
+
+Built on OpenTelemetry and enabled with ``TRACING_ENABLED`` when the
+``tracing`` extra is installed; otherwise spans are no-ops. Traces are
+sampled at ``TRACING_SAMPLE_RATIO`` at their root and children follow the
+root's decision, so unsampled requests cost little more than a context
+lookup. Spans are written as JSON lines to ``TRACING_FILE_PATH`` or, with
+``TRACING_EXPORTER=otlp``, sent to a collector.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from contextlib import nullcontext
+from typing import Any, ContextManager, TypeAlias
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+try:  # pragma: no cover - optional dependency
+    from opentelemetry import context as otel_context
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover - optional dependency
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+_TRACER_NAME = "subscriptions"
+_STATEMENT_MAX_CHARS = 1000
+_SPAN_STACK_KEY = "tracing_spans"
+
+_provider: Any = None
+
+SpanHandle: TypeAlias = tuple[Any, object]
+
+
+def tracing_available() -> bool:
+    return trace is not None
+
+
+def tracing_active() -> bool:
+    return _provider is not None
+
+
+def _build_exporter() -> SpanExporter | None:
+    if settings.tracing_exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("opentelemetry-exporter-otlp-proto-http is not installed; tracing is disabled")
+            return None
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    if settings.tracing_exporter == "file":
+        stream = open(settings.tracing_file_path, "a", buffering=1, encoding="utf-8")  # noqa: SIM115
+        return ConsoleSpanExporter(out=stream, formatter=lambda span: span.to_json(indent=None) + "\n")
+    logger.warning("Unsupported TRACING_EXPORTER %r; tracing is disabled", settings.tracing_exporter)
+    return None
+
+
+def configure_tracing(service_name: str) -> None:
+    """Install the tracer provider of this process when tracing is enabled.
+
+    Safe to call before forking: the batch processor restarts its export
+    thread in child processes.
+    """
+
+    global _provider
+    if not settings.tracing_enabled or _provider is not None:
+        return
+    if not tracing_available():
+        logger.warning("opentelemetry-sdk is not installed; tracing is disabled")
+        return
+    exporter = _build_exporter()
+    if exporter is None:
+        return
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and stop exporting."""
+
+    global _provider
+    if _provider is not None:
+        provider, _provider = _provider, None
+        provider.shutdown()
+
+
+def _tracer() -> Any:
+    return trace.get_tracer(_TRACER_NAME)
+
+
+def start_span(name: str, *, kind: str = "internal", **attributes: Any) -> ContextManager[Any]:
+    """Return a context manager running the block in a child span of the current one.
+
+    ``kind`` is ``internal``, ``server``, ``client``, ``producer`` or
+    ``consumer``. Exceptions leaving the block are recorded on the span.
+    """
+
+    if _provider is None:
+        return nullcontext()
+    return _tracer().start_as_current_span(name, kind=SpanKind[kind.upper()], attributes=attributes)
+
+
+def inject_context(carrier: dict[str, str]) -> None:
+    """Add the current trace context to outgoing message headers."""
+
+    if _provider is not None:
+        propagate.inject(carrier)
+
+
+def carrier_from_attributes(source: Any) -> dict[str, str]:
+    """Collect trace context fields stored as attributes, e.g. on a Celery task request."""
+
+    if _provider is None:
+        return {}
+    fields = propagate.get_global_textmap().fields
+    return {field: value for field in fields if isinstance(value := getattr(source, field, None), str)}
+
+
+def open_span(
+    name: str, carrier: Mapping[str, str] | None = None, *, kind: str = "internal", **attributes: Any
+) -> SpanHandle | None:
+    """Start a span and make it current until :func:`close_span`.
+
+    With ``carrier`` the span joins the trace propagated in it, otherwise
+    it is a child of the current span. For callbacks that cannot wrap the
+    work in :func:`start_span`, such as ASGI middleware or Celery signals.
+    """
+
+    if _provider is None:
+        return None
+    parent = propagate.extract(carrier) if carrier is not None else None
+    span = _tracer().start_span(name, context=parent, kind=SpanKind[kind.upper()], attributes=attributes)
+    return span, otel_context.attach(trace.set_span_in_context(span, parent))
+
+
+def close_span(handle: SpanHandle | None, *, error: BaseException | bool | None = None) -> None:
+    """Restore the previous context and end the span of :func:`open_span`."""
+
+    if handle is None:
+        return
+    span, token = handle
+    otel_context.detach(token)
+    if isinstance(error, BaseException):
+        span.record_exception(error)
+    if error:
+        span.set_status(Status(StatusCode.ERROR))
+    span.end()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Trace SQL statements executed within sampled traces."""
+
+    if not tracing_available():
+        return
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if _provider is None or not trace.get_current_span().is_recording():
+            return
+        span = _tracer().start_span(
+            "db.query",
+            kind=SpanKind.CLIENT,
+            attributes={"db.system": "postgresql", "db.statement": statement[:_STATEMENT_MAX_CHARS]},
+        )
+        conn.info.setdefault(_SPAN_STACK_KEY, []).append(span)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        spans = conn.info.get(_SPAN_STACK_KEY)
+        if spans:
+            spans.pop().end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context: Any) -> None:
+        spans = context.connection.info.get(_SPAN_STACK_KEY) if context.connection is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
@@ -0,0 +1,181 @@
+"""Per-unit-of-work SQL statement profiling.
+
+A profile collects every statement executed while it is active, across
+``await`` points, as it lives in a context variable. Identical statements
+repeated ``SQL_PROFILING_N_PLUS_ONE_THRESHOLD`` times or more are reported
+as a suspected N+1 pattern, and statements slower than
+``SQL_SLOW_QUERY_MS`` are logged with their parameters redacted.
+
+The API, the Telegram bot and Celery tasks open a profile per request,
+update or task when ``SQL_PROFILING_ENABLED`` is set. Tests can bound the
+number of statements of a code path with :func:`query_budget`.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STATEMENT_PREVIEW_CHARS = 300
+_START_KEY = "profiling_query_start"
+
+_current: ContextVar[QueryProfile | None] = ContextVar("sql_query_profile", default=None)
+_install_lock = threading.Lock()
+_installed = False
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Raised by :func:`query_budget` when a block runs too many statements."""
+
+
+@dataclass
+class QueryProfile:
+    """Statements executed within one request, bot update, task or block."""
+
+    name: str
+    count: int = 0
+    total_seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+    slow: int = 0
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.statements[statement] += 1
+
+    def merge(self, other: QueryProfile) -> None:
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+        self.statements.update(other.statements)
+        self.slow += other.slow
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Return statements executed at least ``threshold`` times, most frequent first."""
+
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+def _redact(parameters: Any) -> Any:
+    """Replace parameter values by their type names."""
+
+    if isinstance(parameters, Mapping):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, Sequence) and not isinstance(parameters, (str, bytes)):
+        return [f"<{type(value).__name__}>" for value in parameters]
+    return f"<{type(parameters).__name__}>"
+
+
+def _preview(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > _STATEMENT_PREVIEW_CHARS:
+        return statement[:_STATEMENT_PREVIEW_CHARS] + "..."
+    return statement
+
+
+def _before_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    profile = _current.get()
+    starts = conn.info.get(_START_KEY)
+    if profile is None or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    profile.record(statement, elapsed)
+    if elapsed * 1000 >= settings.sql_slow_query_ms:
+        profile.slow += 1
+        redacted = f"<{len(parameters)} parameter sets>" if executemany else _redact(parameters)
+        logger.warning(
+            "Slow query in %s (%.1f ms): %s parameters=%s", profile.name, elapsed * 1000, _preview(statement), redacted
+        )
+
+
+def _on_error(context: Any) -> None:
+    if context.connection is not None:
+        starts = context.connection.info.get(_START_KEY)
+        if starts:
+            starts.pop()
+
+
+def install_profiler() -> None:
+    """Attach the statement hooks to every engine; idle until a profile is active."""
+
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_execute)
+        event.listen(Engine, "after_cursor_execute", _after_execute)
+        event.listen(Engine, "handle_error", _on_error)
+        _installed = True
+
+
+def start_profile(name: str) -> tuple[QueryProfile, Token[QueryProfile | None]]:
+    """Make a new profile current; pair every call with :func:`finish_profile`."""
+
+    install_profiler()
+    profile = QueryProfile(name=name)
+    return profile, _current.set(profile)
+
+
+def finish_profile(profile: QueryProfile, token: Token[QueryProfile | None], *, report: bool = True) -> None:
+    """Restore the enclosing profile, fold ``profile`` into it and log findings."""
+
+    _current.reset(token)
+    parent = _current.get()
+    if parent is not None:
+        parent.merge(profile)
+    if report:
+        report_profile(profile)
+
+
+def report_profile(profile: QueryProfile) -> None:
+    """Log statements repeated often enough to suggest an N+1 pattern."""
+
+    for statement, count in profile.repeated(settings.sql_profiling_n_plus_one_threshold):
+        logger.warning("Suspected N+1 in %s: %d executions of %s", profile.name, count, _preview(statement))
+    logger.debug(
+        "%s ran %d statements in %.1f ms", profile.name, profile.count, profile.total_seconds * 1000
+    )
+
+
+@contextmanager
+def profile_queries(name: str = "block", *, report: bool = True) -> Iterator[QueryProfile]:
+    """Profile statements executed inside the block."""
+
+    profile, token = start_profile(name)
+    try:
+        yield profile
+    finally:
+        finish_profile(profile, token, report=report)
+
+
+@contextmanager
+def query_budget(max_queries: int, name: str = "query budget") -> Iterator[QueryProfile]:
+    """Fail with :class:`QueryBudgetExceededError` when the block runs more than ``max_queries`` statements."""
+
+    with profile_queries(name, report=False) as profile:
+        yield profile
+    if profile.count > max_queries:
+        repeated = "; ".join(f"{count}x {_preview(statement)}" for statement, count in profile.repeated(2))
+        raise QueryBudgetExceededError(
+            f"{name}: {profile.count} statements executed, budget is {max_queries}"
+            + (f" (repeated: {repeated})" if repeated else "")
+        )
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
+from app.core import metrics, tracing
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,10 @@ def get_engine() -> AsyncEngine:
             if fallback_engine is None:
                 raise
             _engine = fallback_engine
+        if settings.metrics_enabled:
+            metrics.instrument_engine(_engine)
+        if settings.tracing_enabled:
+            tracing.instrument_engine(_engine)
         _SessionLocal = async_sessionmaker(
             _engine,
             expire_on_commit=False,
@@ -1,18 +1,28 @@
 """Application entry point."""
 from __future__ import annotations
 
+import logging
 import re
 from typing import Any
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 
 from app import models  # noqa: F401  # Ensure models are imported for metadata
+from app.api.compression import CompressionMiddleware
+from app.api.idempotency import IdempotencyMiddleware, IdempotentReplay, replay_response
+from app.api.metrics import MetricsMiddleware
+from app.api.profiling import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, SQLProfilerMiddleware
 from app.api.routes import api_router
 from app.api.routes.health import router as health_router
+from app.api.tracing import TracingMiddleware
 from app.core.config import settings
+from app.core.tracing import configure_tracing, shutdown_tracing
 from app.db.base import Base
-from app.db.session import get_engine
+from app.db.session import get_engine, get_sessionmaker
+
+logger = logging.getLogger(__name__)
 
 
 def _build_cors_options() -> dict[str, Any]:
@@ -43,6 +53,15 @@ def _build_cors_options() -> dict[str, Any]:
         "allow_credentials": True,
         "allow_methods": ["*"],
         "allow_headers": ["*"],
+        "expose_headers": [
+            "Content-Disposition",
+            "ETag",
+            "Idempotent-Replayed",
+            "X-Next-Cursor",
+            "X-Total-Count",
+            QUERY_COUNT_HEADER,
+            QUERY_TIME_HEADER,
+        ],
     }
 
     if origin_regexes:
@@ -55,7 +74,24 @@ def create_application() -> FastAPI:
     """Create and configure FastAPI application instance."""
 
     app = FastAPI(title=settings.project_name)
+    # Innermost, so stored responses are uncompressed and replays are compressed per request.
+    app.add_middleware(IdempotencyMiddleware)
+    app.add_exception_handler(IdempotentReplay, replay_response)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
     app.add_middleware(CORSMiddleware, **_build_cors_options())
+    if settings.sql_profiling_enabled:
+        app.add_middleware(SQLProfilerMiddleware, expose_headers=settings.environment.lower() == "development")
+    if settings.tracing_enabled:
+        configure_tracing("subscriptions-api")
+        app.add_middleware(TracingMiddleware)
+    if settings.metrics_enabled:
+        # Outermost, so latency covers compression and the other middleware.
+        app.add_middleware(MetricsMiddleware)
 
     @app.on_event("startup")
     async def _initialize_database() -> None:
@@ -65,13 +101,38 @@ def create_application() -> FastAPI:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+        from app.services.partitions import ensure_partitions
+
+        try:
+            await ensure_partitions(get_sessionmaker())
+        except SQLAlchemyError:
+            # Upcoming months are usually there already; the maintenance task retries.
+            logger.warning("Failed to create upcoming table partitions", exc_info=True)
+
+    @app.on_event("startup")
+    async def _start_background_writers() -> None:
+        """Start in-process writers enabled by configuration."""
+
+        from app.services.audit import start_audit_writer
+
+        start_audit_writer()
+
     @app.on_event("shutdown")
     async def _shutdown_integrations() -> None:
         """Release external integration resources on shutdown."""
 
+        from app.services.audit import close_audit_writer
+        from app.services.google_oauth import close_http_client
+        from app.services.subscription_events import close_change_listener
         from app.services.telegram_bot import shutdown_application
+        from app.services.token_store import close_token_store
 
+        await close_audit_writer()
+        await close_http_client()
+        await close_change_listener()
+        await close_token_store()
         await shutdown_application()
+        shutdown_tracing()
 
     app.include_router(health_router)
     app.include_router(api_router)
@@ -4,12 +4,16 @@ from app.models.subscription import (
     AuditLog,
     Notification,
     NotificationChannel,
+    NotificationLastSent,
     NotificationStatus,
     Subscription,
     SubscriptionStatus,
+    SubscriptionSummary,
+    SubscriptionTombstone,
 )
 from app.models.user import (
     EmailVerificationToken,
+    IdempotencyKey,
     Identity,
     OAuthProvider,
     OAuthState,
@@ -23,14 +27,18 @@ __all__ = [
     "AuditAction",
     "AuditLog",
     "EmailVerificationToken",
+    "IdempotencyKey",
     "Identity",
     "Notification",
     "NotificationChannel",
+    "NotificationLastSent",
     "NotificationStatus",
     "OAuthProvider",
     "OAuthState",
     "Subscription",
     "SubscriptionStatus",
+    "SubscriptionSummary",
+    "SubscriptionTombstone",
     "TelegramAccount",
     "TelegramLinkToken",
     "User",
@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Index, Numeric, String, Text
+from sqlalchemy import DDL, BigInteger, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String, Text, event, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -33,6 +33,7 @@ class NotificationChannel(enum.StrEnum):
 class NotificationStatus(enum.StrEnum):
     """Notification delivery state."""
 
+    queued = "queued"
     sent = "sent"
     failed = "failed"
 
@@ -47,6 +48,7 @@ class AuditAction(enum.StrEnum):
     subscription_deleted = "subscription_deleted"
     subscription_status_changed = "subscription_status_changed"
     subscription_snoozed = "subscription_snoozed"
+    subscriptions_imported = "subscriptions_imported"
     telegram_link_created = "telegram_link_created"
     telegram_link_completed = "telegram_link_completed"
     notification_test = "notification_test"
@@ -70,8 +72,11 @@ class Subscription(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "subscriptions"
     __table_args__ = (
         Index("ix_subscriptions_user_status_end_at", "user_id", "status", "end_at"),
+        Index("ix_subscriptions_user_end_at_id", "user_id", "end_at", "id"),
         Index("ix_subscriptions_next_reminder_at", "next_reminder_at"),
+        Index("ix_subscriptions_user_next_reminder_at", "user_id", "next_reminder_at"),
         Index("ix_subscriptions_last_notified_at", "last_notified_at"),
+        Index("ix_subscriptions_user_change_version", "user_id", "change_version"),
     )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -89,6 +94,8 @@ class Subscription(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     next_reminder_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     last_notified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Owner's ``subscriptions_version`` as of the last write, used by delta sync.
+    change_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
 
     notifications: Mapped[list[Notification]] = relationship(
         back_populates="subscription",
@@ -102,32 +109,132 @@ class Subscription(UUIDPrimaryKeyMixin, TimestampMixin, Base):
         return self.price_numeric
 
 
-class Notification(UUIDPrimaryKeyMixin, TimestampMixin, Base):
-    """Notification entity."""
+SEARCHABLE_COLUMNS = ("name", "vendor", "category", "notes")
+
+# Trigram GIN indexes serve the ``lower(column) LIKE '%q%'`` search filter.
+for _column_name in SEARCHABLE_COLUMNS:
+    Index(
+        f"ix_subscriptions_{_column_name}_trgm",
+        func.lower(Subscription.__table__.c[_column_name]).label(f"{_column_name}_lower"),
+        postgresql_using="gin",
+        postgresql_ops={f"{_column_name}_lower": "gin_trgm_ops"},
+    )
+
+event.listen(
+    Subscription.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+class SubscriptionSummary(Base):
+    """Per-user aggregate of subscriptions grouped by status and currency.
+
+    Maintained incrementally by every write path so dashboards can read a
+    handful of rows instead of the user's whole subscription list.
+    """
+
+    __tablename__ = "subscription_summaries"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    status: Mapped[SubscriptionStatus] = mapped_column(subscription_status_enum, primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=Decimal("0"), nullable=False)
+
+
+class SubscriptionTombstone(Base):
+    """Trace of a deleted subscription kept for delta sync clients."""
+
+    __tablename__ = "subscription_tombstones"
+    __table_args__ = (
+        Index("ix_subscription_tombstones_user_change_version", "user_id", "change_version"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    change_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+
+
+class Notification(TimestampMixin, Base):
+    """Notification entity.
+
+    The table is range partitioned by ``created_at`` into monthly
+    partitions, see :mod:`app.services.partitions`.
+    """
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_subscription_id_created_at", "subscription_id", "created_at"),
+        Index(
+            "ix_notifications_subscription_channel_status_created_at",
+            "subscription_id",
+            "channel",
+            "status",
+            "created_at",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
+    # The partition key has to be part of the primary key.
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
     subscription_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("subscriptions.id", ondelete="CASCADE"), nullable=True
     )
     channel: Mapped[NotificationChannel] = mapped_column(notification_channel_enum, nullable=False)
     status: Mapped[NotificationStatus] = mapped_column(notification_status_enum, nullable=False)
+    # Delivery time; NULL while queued and for failed attempts, see ``created_at``.
     sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     subscription: Mapped[Subscription | None] = relationship(back_populates="notifications")
 
 
-class AuditLog(UUIDPrimaryKeyMixin, Base):
-    """Audit log entry."""
+class NotificationLastSent(Base):
+    """Time of the latest sent notification per subscription and channel.
+
+    Maintained whenever a notification is recorded as sent, so the reminder
+    dispatcher never looks through delivery history.
+    """
+
+    __tablename__ = "notification_last_sent"
+
+    subscription_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("subscriptions.id", ondelete="CASCADE"), primary_key=True
+    )
+    channel: Mapped[NotificationChannel] = mapped_column(notification_channel_enum, primary_key=True)
+    last_sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class AuditLog(Base):
+    """Audit log entry, range partitioned by ``ts`` into monthly partitions."""
 
     __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_user_id_ts_id", "user_id", "ts", "id"),
+        Index("ix_audit_log_entity_id_ts_id", "entity_id", "ts", "id"),
+        {"postgresql_partition_by": "RANGE (ts)"},
+    )
 
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
     action: Mapped[AuditAction] = mapped_column(audit_action_enum, nullable=False)
     entity: Mapped[str | None] = mapped_column(String(120), nullable=True)
     entity_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
     ts: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+        DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(timezone.utc)
     )
     meta: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
@@ -5,7 +5,17 @@ import enum
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    Enum,
+    ForeignKey,
+    LargeBinary,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -33,6 +43,9 @@ class User(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     email_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     tz: Mapped[str] = mapped_column(String(64), default="Europe/Moscow", nullable=False)
     locale: Mapped[str] = mapped_column(String(5), default="ru", nullable=False)
+    subscriptions_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
 
     identities: Mapped[list[Identity]] = relationship(
         back_populates="user",
@@ -89,17 +102,21 @@ class TelegramAccount(UUIDPrimaryKeyMixin, TimestampMixin, Base):
 
 
 class UserSession(UUIDPrimaryKeyMixin, TimestampMixin, Base):
-    """Access and refresh token pair for user."""
+    """Access and refresh token pair for user.
+
+    Only SHA-256 digests of the issued JWTs are stored, which keeps the unique
+    indexes fixed-width regardless of the token length.
+    """
 
     __tablename__ = "user_sessions"
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    access_token: Mapped[str] = mapped_column(String(1024), unique=True, nullable=False)
-    refresh_token: Mapped[str] = mapped_column(String(1024), unique=True, nullable=False)
+    access_token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, nullable=False)
+    refresh_token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, nullable=False)
     access_expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    refresh_expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    refresh_expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
 
     user: Mapped[User] = relationship(back_populates="sessions")
 
@@ -112,7 +129,7 @@ class OAuthState(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     provider: Mapped[OAuthProvider] = mapped_column(oauth_provider_enum)
     state: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     redirect_uri: Mapped[str] = mapped_column(String(1024), nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
 
 
 class TelegramLinkToken(UUIDPrimaryKeyMixin, TimestampMixin, Base):
@@ -124,8 +141,8 @@ class TelegramLinkToken(UUIDPrimaryKeyMixin, TimestampMixin, Base):
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     token: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
 
     user: Mapped[User] = relationship()
 
@@ -140,7 +157,30 @@ class EmailVerificationToken(UUIDPrimaryKeyMixin, TimestampMixin, Base):
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     token: Mapped[str] = mapped_column(String(255), nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
 
     user: Mapped[User] = relationship(back_populates="verification_tokens")
+
+
+class IdempotencyKey(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """Outcome of a request sent with an ``Idempotency-Key`` header.
+
+    Keys and request fingerprints are stored as SHA-256 digests. A row
+    without ``status_code`` is a claim held by the request in flight until
+    ``locked_until``.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "key_hash", name="uq_idempotency_keys_user_key"),)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    key_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    request_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    status_code: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    content_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,4 +1,5 @@
 """Pydantic schemas for API payloads."""
+from app.schemas.audit import AuditLogRead
 from app.schemas.auth import (
     AuthCallbackResponse,
     AuthLoginResponse,
@@ -6,11 +7,27 @@ from app.schemas.auth import (
     RefreshTokenResponse,
     TokenPair,
 )
-from app.schemas.notification import NotificationTestRequest, NotificationTestResponse
+from app.schemas.notification import (
+    NotificationChannelSummary,
+    NotificationRead,
+    NotificationSummaryRead,
+    NotificationTestRequest,
+    NotificationTestResponse,
+)
 from app.schemas.subscription import (
+    SubscriptionBatchRequest,
+    SubscriptionBatchResponse,
+    SubscriptionBatchResult,
+    SubscriptionChangesRead,
     SubscriptionCreate,
+    SubscriptionImportIssue,
+    SubscriptionImportReport,
+    SubscriptionImportRowError,
     SubscriptionRead,
+    SubscriptionStatusCounts,
     SubscriptionStatusUpdate,
+    SubscriptionSummaryRead,
+    SubscriptionTombstoneRead,
     SubscriptionUpdate,
 )
 from app.schemas.telegram import (
@@ -22,15 +39,29 @@ from app.schemas.telegram import (
 from app.schemas.user import UserRead
 
 __all__ = [
+    "AuditLogRead",
     "AuthCallbackResponse",
     "AuthLoginResponse",
+    "NotificationChannelSummary",
+    "NotificationRead",
+    "NotificationSummaryRead",
     "NotificationTestRequest",
     "NotificationTestResponse",
     "RefreshTokenRequest",
     "RefreshTokenResponse",
+    "SubscriptionBatchRequest",
+    "SubscriptionBatchResponse",
+    "SubscriptionBatchResult",
+    "SubscriptionChangesRead",
     "SubscriptionCreate",
+    "SubscriptionImportIssue",
+    "SubscriptionImportReport",
+    "SubscriptionImportRowError",
     "SubscriptionRead",
+    "SubscriptionStatusCounts",
     "SubscriptionStatusUpdate",
+    "SubscriptionSummaryRead",
+    "SubscriptionTombstoneRead",
     "SubscriptionUpdate",
     "TelegramLinkCompleteRequest",
     "TelegramLinkCompleteResponse",
@@ -0,0 +1,24 @@
+"""Audit log schemas."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.subscription import AuditAction
+
+
+class AuditLogRead(BaseModel):
+    """Audit log entry returned by the audit API."""
+
+    id: UUID
+    user_id: UUID | None
+    action: AuditAction
+    entity: str | None
+    entity_id: UUID | None
+    ts: datetime
+    meta: dict[str, Any] | None
+
+    model_config = ConfigDict(from_attributes=True)
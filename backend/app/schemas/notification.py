@@ -1,6 +1,7 @@
 """Notification related schemas."""
 from __future__ import annotations
 
+from datetime import datetime
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
@@ -26,3 +27,34 @@ class NotificationTestResponse(BaseModel):
     status: NotificationStatus
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class NotificationRead(BaseModel):
+    """Delivery record of a subscription notification."""
+
+    id: UUID
+    subscription_id: UUID | None
+    channel: NotificationChannel
+    status: NotificationStatus
+    sent_at: datetime | None
+    error: str | None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NotificationChannelSummary(BaseModel):
+    """Delivery counts of a single channel."""
+
+    channel: NotificationChannel
+    sent: int
+    failed: int
+    queued: int
+    last_sent_at: datetime | None
+
+
+class NotificationSummaryRead(BaseModel):
+    """Per-channel delivery figures of the user's subscriptions."""
+
+    since: datetime
+    channels: list[NotificationChannelSummary]
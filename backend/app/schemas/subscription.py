@@ -3,9 +3,11 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
+from typing import Annotated, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, TypeAdapter, field_validator
+from typing_extensions import TypedDict
 
 from app.models.subscription import SubscriptionStatus
 
@@ -61,6 +63,48 @@ class SubscriptionStatusUpdate(BaseModel):
     status: SubscriptionStatus
 
 
+class SubscriptionBatchCreate(BaseModel):
+    """Batch operation creating a subscription."""
+
+    op: Literal["create"]
+    data: SubscriptionCreate
+
+
+class SubscriptionBatchUpdate(BaseModel):
+    """Batch operation partially updating a subscription."""
+
+    op: Literal["update"]
+    id: UUID
+    data: SubscriptionUpdate
+
+
+class SubscriptionBatchDelete(BaseModel):
+    """Batch operation deleting a subscription."""
+
+    op: Literal["delete"]
+    id: UUID
+
+
+class SubscriptionBatchStatus(BaseModel):
+    """Batch operation changing subscription status."""
+
+    op: Literal["status"]
+    id: UUID
+    status: SubscriptionStatus
+
+
+SubscriptionBatchOperation = Annotated[
+    SubscriptionBatchCreate | SubscriptionBatchUpdate | SubscriptionBatchDelete | SubscriptionBatchStatus,
+    Field(discriminator="op"),
+]
+
+
+class SubscriptionBatchRequest(BaseModel):
+    """Operations applied together in one transaction."""
+
+    operations: list[SubscriptionBatchOperation] = Field(..., min_length=1, max_length=500)
+
+
 class SubscriptionRead(BaseModel):
     """Representation of subscription returned to clients."""
 
@@ -83,3 +127,128 @@ class SubscriptionRead(BaseModel):
         from_attributes=True,
         json_encoders={Decimal: lambda value: format(value, "0.2f")},
     )
+
+
+class SubscriptionBatchResult(BaseModel):
+    """Outcome of a single batch operation."""
+
+    index: int
+    op: Literal["create", "update", "delete", "status"]
+    id: UUID | None
+    ok: bool
+    error: str | None = None
+    subscription: SubscriptionRead | None = None
+
+
+class SubscriptionBatchResponse(BaseModel):
+    """Per-operation results in request order."""
+
+    results: list[SubscriptionBatchResult]
+
+
+class SubscriptionImportIssue(BaseModel):
+    """Validation problem found in an imported row."""
+
+    field: str | None
+    message: str
+
+
+class SubscriptionImportRowError(BaseModel):
+    """Validation problems of a single imported row (1-based)."""
+
+    row: int
+    errors: list[SubscriptionImportIssue]
+
+
+class SubscriptionImportReport(BaseModel):
+    """Outcome of a bulk import."""
+
+    dry_run: bool
+    total_rows: int
+    valid_rows: int
+    imported: int
+    error_count: int
+    errors: list[SubscriptionImportRowError]
+
+
+PriceDecimal = Annotated[Decimal, PlainSerializer(lambda value: format(value, "0.2f"), return_type=str, when_used="json")]
+
+
+class SubscriptionReadRow(TypedDict):
+    """Column-level mirror of :class:`SubscriptionRead` for the fast list path.
+
+    Rows come straight from the database and are only serialized, never
+    validated; the JSON output is identical to ``SubscriptionRead``.
+    """
+
+    id: UUID
+    user_id: UUID
+    name: str
+    price: PriceDecimal
+    currency: str
+    end_at: datetime
+    status: SubscriptionStatus
+    category: str | None
+    vendor: str | None
+    notes: str | None
+    next_reminder_at: datetime | None
+    last_notified_at: datetime | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class SubscriptionTombstoneRead(BaseModel):
+    """Deleted subscription reported to delta sync clients."""
+
+    id: UUID
+    deleted_at: datetime
+
+
+class SubscriptionChangesRead(BaseModel):
+    """Changes of the subscription collection since a sync cursor."""
+
+    cursor: str
+    reset: bool
+    upserted: list[SubscriptionRead]
+    deleted: list[SubscriptionTombstoneRead]
+
+
+class SubscriptionTombstoneRow(TypedDict):
+    """Column-level mirror of :class:`SubscriptionTombstoneRead`."""
+
+    id: UUID
+    deleted_at: datetime
+
+
+class SubscriptionChangesRow(TypedDict):
+    """Column-level mirror of :class:`SubscriptionChangesRead`."""
+
+    cursor: str
+    reset: bool
+    upserted: list[SubscriptionReadRow]
+    deleted: list[SubscriptionTombstoneRow]
+
+
+subscription_row_adapter = TypeAdapter(SubscriptionReadRow)
+subscription_rows_adapter = TypeAdapter(list[SubscriptionReadRow])
+subscription_changes_adapter = TypeAdapter(SubscriptionChangesRow)
+
+
+class SubscriptionStatusCounts(BaseModel):
+    """Number of subscriptions per status."""
+
+    active: int
+    expired: int
+    canceled: int
+    archived: int
+    total: int
+
+
+class SubscriptionSummaryRead(BaseModel):
+    """Dashboard figures computed on the server."""
+
+    counts: SubscriptionStatusCounts
+    reminders_due: int
+    totals_by_currency: dict[str, Decimal]
+
+    model_config = ConfigDict(json_encoders={Decimal: lambda value: format(value, "0.2f")})
@@ -1,12 +1,46 @@
-"""Audit logging helpers."""
+"""Audit logging helpers.
+
+Entries are buffered on the session and written with one multi-row insert
+when it commits, so recording them costs no round-trip of its own and
+rolled back work leaves no entries. With ``AUDIT_LOG_DURABILITY=async`` the
+API process hands committed entries to :class:`AuditWriter` instead, which
+inserts them in batches in the background; entries that do not fit its
+bounded buffer are dropped and counted in ``audit_log_writer_entries_total``.
+"""
 from __future__ import annotations
 
+import asyncio
+import logging
 import uuid
-from typing import Any
+from collections import deque
+from collections.abc import Sequence
+from typing import Any, NamedTuple
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction
 
+from app.core.config import settings
+from app.core.metrics import AUDIT_LOG_BUFFERED, AUDIT_LOG_ENTRIES, AUDIT_LOG_FAILED_BATCHES
+from app.db.session import get_sessionmaker
 from app.models.subscription import AuditAction, AuditLog
+from app.services.subscriptions import current_time
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "audit_log_entries"
+
+_writer: AuditWriter | None = None
+
+
+class AuditEntry(NamedTuple):
+    """Audit log row pending a bulk insert."""
+
+    user_id: uuid.UUID | None
+    action: AuditAction
+    entity: str | None = None
+    entity_id: uuid.UUID | None = None
+    meta: dict[str, Any] | None = None
 
 
 async def record_audit_log(
@@ -17,16 +51,179 @@ async def record_audit_log(
     entity: str | None = None,
     entity_id: uuid.UUID | None = None,
     meta: dict[str, Any] | None = None,
-) -> AuditLog:
-    """Create audit log entry in database."""
-
-    log = AuditLog(
-        user_id=user_id,
-        action=action,
-        entity=entity,
-        entity_id=entity_id,
-        meta=meta or {},
+) -> None:
+    """Queue audit log entry to be written when session commits."""
+
+    await record_audit_logs(
+        session, [AuditEntry(user_id=user_id, action=action, entity=entity, entity_id=entity_id, meta=meta)]
+    )
+
+
+async def record_audit_logs(session: AsyncSession, entries: Sequence[AuditEntry]) -> None:
+    """Queue several audit log entries to be written when session commits."""
+
+    if not session.in_transaction():
+        # Tie the entries to a transaction so a rollback discards them; no
+        # connection is acquired until the first statement.
+        session.sync_session.begin()
+    # Timestamps are taken now, the insert may run well after the request.
+    ts = current_time()
+    session.info.setdefault(_PENDING_KEY, []).extend(
+        {
+            "user_id": entry.user_id,
+            "action": entry.action,
+            "entity": entry.entity,
+            "entity_id": entry.entity_id,
+            "meta": entry.meta or {},
+            "ts": ts,
+        }
+        for entry in entries
     )
-    session.add(log)
-    await session.flush()
-    return log
+
+
+@event.listens_for(Session, "before_commit")
+def _write_pending_entries(session: Session) -> None:
+    if not session.info.get(_PENDING_KEY) or (_writer is not None and _writer.running):
+        return
+    session.execute(insert(AuditLog).values(session.info.pop(_PENDING_KEY)))
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_pending_entries(session: Session) -> None:
+    rows = session.info.pop(_PENDING_KEY, None)
+    if rows and _writer is not None:
+        _writer.submit(rows)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_entries(session: Session, previous_transaction: SessionTransaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+class AuditWriter:
+    """Bounded buffer of committed audit entries written in batches.
+
+    A batch is written once ``batch_size`` entries are waiting or every
+    ``flush_interval`` seconds. Failed batches are put back while there is
+    room, so a short database outage loses nothing unless the buffer fills.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        batch_size: int,
+        flush_interval: float,
+        max_buffer: int,
+    ) -> None:
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._dropped_since_flush = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="audit-log-writer")
+
+    def submit(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Buffer committed rows without blocking; overflow is dropped."""
+
+        room = max(self._max_buffer - len(self._buffer), 0)
+        self._buffer.extend(rows[:room])
+        AUDIT_LOG_ENTRIES.labels("enqueued").inc(min(len(rows), room))
+        self._drop(len(rows) - room)
+        AUDIT_LOG_BUFFERED.set(len(self._buffer))
+        if len(self._buffer) >= self._batch_size:
+            self._wakeup.set()
+
+    def _drop(self, count: int) -> None:
+        if count > 0:
+            AUDIT_LOG_ENTRIES.labels("dropped").inc(count)
+            self._dropped_since_flush += count
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered entries; stops at the first failed batch."""
+
+        if self._dropped_since_flush:
+            logger.warning("Audit log buffer full, dropped %d entries", self._dropped_since_flush)
+            self._dropped_since_flush = 0
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self._batch_size, len(self._buffer)))]
+            try:
+                async with self._session_factory() as session:
+                    await session.execute(insert(AuditLog).values(batch))
+                    await session.commit()
+            except Exception:
+                AUDIT_LOG_FAILED_BATCHES.inc()
+                logger.warning("Failed to write %d audit log entries", len(batch), exc_info=True)
+                room = max(self._max_buffer - len(self._buffer), 0)
+                self._buffer.extendleft(reversed(batch[:room]))
+                self._drop(len(batch) - room)
+                AUDIT_LOG_BUFFERED.set(len(self._buffer))
+                return
+            AUDIT_LOG_ENTRIES.labels("written").inc(len(batch))
+            AUDIT_LOG_BUFFERED.set(len(self._buffer))
+
+    async def close(self) -> None:
+        """Stop the background task and write what is left."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+def get_audit_writer() -> AuditWriter | None:
+    """Return the running background writer, if any."""
+
+    return _writer
+
+
+def start_audit_writer() -> None:
+    """Start background audit writes when ``AUDIT_LOG_DURABILITY`` is ``async``.
+
+    Processes that never start the writer, such as Celery workers, keep
+    writing entries in the committing transaction.
+    """
+
+    global _writer
+    if settings.audit_log_durability != "async" or _writer is not None:
+        return
+    _writer = AuditWriter(
+        get_sessionmaker(),
+        batch_size=settings.audit_log_batch_size,
+        flush_interval=settings.audit_log_flush_interval_seconds,
+        max_buffer=settings.audit_log_max_buffer,
+    )
+    _writer.start()
+
+
+async def close_audit_writer() -> None:
+    """Flush and stop the background writer."""
+
+    global _writer
+    if _writer is not None:
+        writer, _writer = _writer, None
+        await writer.close()
@@ -1,8 +1,11 @@
 """Authentication helpers."""
 from __future__ import annotations
 
+import hashlib
+import hmac
 import uuid
 from datetime import datetime, timezone
+from typing import NamedTuple
 
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,13 +20,26 @@ from app.services.jwt import (
 )
 
 
+class IssuedTokens(NamedTuple):
+    """Plain JWT pair handed to the client; only digests are persisted."""
+
+    access_token: str
+    refresh_token: str
+
+
 def _now() -> datetime:
     """Return current UTC time."""
 
     return datetime.now(timezone.utc)
 
 
-async def create_user_session(session: AsyncSession, user: User) -> UserSession:
+def hash_token(token: str) -> bytes:
+    """Return fixed-width SHA-256 digest used to store and compare tokens."""
+
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+async def create_user_session(session: AsyncSession, user: User) -> tuple[UserSession, IssuedTokens]:
     """Create a new user session with JWT access and refresh tokens."""
 
     session_id = uuid.uuid4()
@@ -33,14 +49,14 @@ async def create_user_session(session: AsyncSession, user: User) -> UserSession:
     user_session = UserSession(
         id=session_id,
         user_id=user.id,
-        access_token=access_token,
-        refresh_token=refresh_token,
+        access_token_hash=hash_token(access_token),
+        refresh_token_hash=hash_token(refresh_token),
         access_expires_at=access_expires_at,
         refresh_expires_at=refresh_expires_at,
     )
     session.add(user_session)
     await session.flush()
-    return user_session
+    return user_session, IssuedTokens(access_token=access_token, refresh_token=refresh_token)
 
 
 async def _get_session_with_user(
@@ -73,7 +89,7 @@ async def get_user_by_access_token(
     user, user_session = row
     if user_session.access_expires_at <= _now():
         return None
-    if user_session.access_token != token:
+    if not hmac.compare_digest(user_session.access_token_hash, hash_token(token)):
         return None
     return user, user_session
 
@@ -96,7 +112,7 @@ async def get_user_by_refresh_token(
     user, user_session = row
     if user_session.refresh_expires_at <= _now():
         return None
-    if user_session.refresh_token != token:
+    if not hmac.compare_digest(user_session.refresh_token_hash, hash_token(token)):
         return None
     return user, user_session
 
@@ -104,17 +120,17 @@ async def get_user_by_refresh_token(
 async def rotate_session_tokens(
     session: AsyncSession,
     user_session: UserSession,
-) -> UserSession:
+) -> IssuedTokens:
     """Rotate access and refresh tokens for session."""
 
     new_access, access_expires_at = create_access_token(subject=user_session.user_id, session_id=user_session.id)
     new_refresh, refresh_expires_at = create_refresh_token(subject=user_session.user_id, session_id=user_session.id)
-    user_session.access_token = new_access
-    user_session.refresh_token = new_refresh
+    user_session.access_token_hash = hash_token(new_access)
+    user_session.refresh_token_hash = hash_token(new_refresh)
     user_session.access_expires_at = access_expires_at
     user_session.refresh_expires_at = refresh_expires_at
     await session.flush()
-    return user_session
+    return IssuedTokens(access_token=new_access, refresh_token=new_refresh)
 
 
 async def revoke_user_session(session: AsyncSession, session_id: uuid.UUID) -> None:
@@ -1,14 +1,25 @@
 """Email delivery helpers."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import smtplib
+import threading
+import uuid
 from email.message import EmailMessage
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.config import settings
+from app.core.metrics import track_external_call
+from app.core.tracing import start_span
+from app.models.subscription import Notification, NotificationChannel, NotificationStatus
 
 logger = logging.getLogger(__name__)
 
+_client: smtplib.SMTP | None = None
+_client_lock = threading.Lock()
+
 
 class EmailDeliveryError(RuntimeError):
     """Raised when email cannot be delivered."""
@@ -25,16 +36,49 @@ def _build_client() -> smtplib.SMTP | None:
     return client
 
 
-def send_email(*, to_address: str, subject: str, text_body: str) -> None:
-    """Send a plain text email if SMTP is configured."""
+def _get_client() -> smtplib.SMTP | None:
+    """Return process-wide SMTP connection, reconnecting if the server dropped it."""
 
-    if not settings.email_from:
-        logger.warning("EMAIL_FROM is not configured; skipping email send.")
-        return
+    global _client
+    if _client is not None:
+        try:
+            _client.noop()
+            return _client
+        except smtplib.SMTPException:
+            logger.debug("SMTP connection is stale; reconnecting", exc_info=True)
+            _discard_client()
+    _client = _build_client()
+    return _client
 
-    client = _build_client()
-    if client is None:
+
+def _discard_client() -> None:
+    global _client
+    if _client is None:
         return
+    try:
+        _client.quit()
+    except Exception:  # pragma: no cover - cleanup best-effort
+        logger.debug("Failed to close SMTP connection", exc_info=True)
+    _client = None
+
+
+def close_connection() -> None:
+    """Close cached SMTP connection, e.g. on worker shutdown."""
+
+    with _client_lock:
+        _discard_client()
+
+
+def send_email(*, to_address: str, subject: str, text_body: str) -> bool:
+    """Send a plain text email if SMTP is configured.
+
+    Blocks on network I/O, so it must only be called from worker processes.
+    Returns ``False`` when sending is skipped because email is not configured.
+    """
+
+    if not settings.email_from:
+        logger.warning("EMAIL_FROM is not configured; skipping email send.")
+        return False
 
     message = EmailMessage()
     message["From"] = settings.email_from
@@ -42,14 +86,58 @@ def send_email(*, to_address: str, subject: str, text_body: str) -> None:
     message["Subject"] = subject
     message.set_content(text_body)
 
-    try:
-        client.send_message(message)
-        logger.info("Verification email sent to %s", to_address)
-    except Exception as exc:  # pragma: no cover - network errors
-        logger.exception("Failed to send email message")
-        raise EmailDeliveryError("Failed to send email") from exc
-    finally:
+    with start_span("send_email", kind="client"), _client_lock:
         try:
-            client.quit()
-        except Exception:  # pragma: no cover - cleanup best-effort
-            logger.debug("Failed to close SMTP connection", exc_info=True)
+            client = _get_client()
+            if client is None:
+                return False
+            with track_external_call("smtp", "send_message"):
+                client.send_message(message)
+        except Exception as exc:  # pragma: no cover - network errors
+            logger.exception("Failed to send email message")
+            _discard_client()
+            raise EmailDeliveryError("Failed to send email") from exc
+
+    logger.info("Email sent to %s", to_address)
+    return True
+
+
+async def create_email_notification(session: AsyncSession) -> Notification:
+    """Persist a queued email delivery record to be updated by the worker."""
+
+    notification = Notification(
+        channel=NotificationChannel.email,
+        status=NotificationStatus.queued,
+    )
+    session.add(notification)
+    await session.flush()
+    return notification
+
+
+async def mark_email_notification_failed(session: AsyncSession, notification: Notification, error: str) -> None:
+    """Fail a queued delivery record whose task could not be handed to the broker."""
+
+    notification.status = NotificationStatus.failed
+    notification.sent_at = None
+    notification.error = error
+    await session.commit()
+
+
+async def enqueue_email(
+    *,
+    to_address: str,
+    subject: str,
+    text_body: str,
+    notification_id: uuid.UUID | None = None,
+) -> None:
+    """Queue email for background delivery without blocking the event loop."""
+
+    from app.workers.tasks import send_email_task
+
+    await asyncio.to_thread(
+        send_email_task.delay,
+        to_address=to_address,
+        subject=subject,
+        text_body=text_body,
+        notification_id=str(notification_id) if notification_id else None,
+    )
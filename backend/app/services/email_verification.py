@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import secrets
+import uuid
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import select
@@ -11,7 +12,7 @@ from urllib.parse import urlencode, urljoin
 
 from app.core.config import settings
 from app.models.user import EmailVerificationToken, User
-from app.services.email import send_email
+from app.services.email import enqueue_email
 
 _VERIFICATION_TTL = timedelta(hours=24)
 
@@ -51,8 +52,13 @@ async def create_verification_token(session: AsyncSession, user: User) -> EmailV
     return verification
 
 
-def send_verification_email(user: User, token: EmailVerificationToken) -> None:
-    """Send verification email to user if SMTP configured."""
+async def send_verification_email(
+    user: User,
+    token: EmailVerificationToken,
+    *,
+    notification_id: uuid.UUID | None = None,
+) -> None:
+    """Queue verification email for background delivery."""
 
     frontend_base = settings.frontend_url.rstrip("/") + "/"
     verification_path = urljoin(frontend_base, "auth/verify-email")
@@ -64,10 +70,11 @@ def send_verification_email(user: User, token: EmailVerificationToken) -> None:
         f"{verification_link}\n\n"
         "Если вы не запрашивали вход, проигнорируйте это письмо."
     )
-    send_email(
+    await enqueue_email(
         to_address=user.email,
         subject="Подтвердите email для Subscriptions",
         text_body=body,
+        notification_id=notification_id,
     )
 
 
@@ -0,0 +1,161 @@
+"""Google OAuth code exchange with local id_token verification."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, NamedTuple
+
+import httpx
+from jose import JWTError, jwt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_ID_TOKEN_ALGORITHMS = ["RS256"]
+_JWKS_MIN_REFRESH_INTERVAL = 60.0
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+_client: httpx.AsyncClient | None = None
+_jwks: dict[str, Any] | None = None
+_jwks_expires_at = 0.0
+_jwks_fetched_at = 0.0
+_jwks_lock = asyncio.Lock()
+
+
+class GoogleOAuthError(RuntimeError):
+    """Raised when Google rejects the code or returns an unusable identity."""
+
+
+class GoogleIdentity(NamedTuple):
+    """Identity extracted from Google token response."""
+
+    sub: str
+    email: str
+    email_verified: bool
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return process-wide pooled HTTP client used for OAuth calls."""
+
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=10, keepalive_expiry=60.0),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close pooled HTTP client on shutdown."""
+
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _cache_lifetime(response: httpx.Response) -> float:
+    match = _MAX_AGE_PATTERN.search(response.headers.get("Cache-Control", ""))
+    if match:
+        return float(match.group(1))
+    return float(settings.google_jwks_cache_seconds)
+
+
+async def _get_jwks(*, force_refresh: bool = False) -> dict[str, Any]:
+    """Return cached Google signing keys, refreshing them when stale."""
+
+    global _jwks, _jwks_expires_at, _jwks_fetched_at
+    async with _jwks_lock:
+        now = time.monotonic()
+        if _jwks is not None and now < _jwks_expires_at:
+            if not force_refresh or now - _jwks_fetched_at < _JWKS_MIN_REFRESH_INTERVAL:
+                return _jwks
+
+        response = await get_http_client().get(settings.google_jwks_url)
+        if response.status_code != 200:
+            if _jwks is not None:
+                logger.warning("Google JWKS refresh failed, using cached keys: %s", response.text)
+                return _jwks
+            raise GoogleOAuthError("Failed to fetch Google signing keys")
+        _jwks = response.json()
+        _jwks_fetched_at = now
+        _jwks_expires_at = now + _cache_lifetime(response)
+        return _jwks
+
+
+def _has_key(jwks: dict[str, Any], kid: str | None) -> bool:
+    return any(key.get("kid") == kid for key in jwks.get("keys", []))
+
+
+async def verify_id_token(id_token: str, *, access_token: str | None = None) -> dict[str, Any]:
+    """Validate id_token signature and claims against cached JWKS."""
+
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid")
+    except JWTError as exc:
+        raise GoogleOAuthError("Malformed id_token") from exc
+
+    jwks = await _get_jwks()
+    if not _has_key(jwks, kid):
+        # Google rotates keys periodically; refetch once before giving up.
+        jwks = await _get_jwks(force_refresh=True)
+
+    issuer = settings.google_issuer
+    try:
+        return jwt.decode(
+            id_token,
+            jwks,
+            algorithms=_ID_TOKEN_ALGORITHMS,
+            audience=settings.oauth_client_id,
+            issuer=[issuer, issuer.removeprefix("https://")],
+            access_token=access_token,
+        )
+    except JWTError as exc:
+        raise GoogleOAuthError("Invalid id_token") from exc
+
+
+async def _fetch_userinfo(access_token: str) -> dict[str, Any]:
+    response = await get_http_client().get(
+        settings.google_userinfo_url,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    if response.status_code != 200:
+        logger.warning("Google userinfo failed: %s", response.text)
+        raise GoogleOAuthError("Failed to fetch user info")
+    return response.json()
+
+
+async def exchange_code(*, code: str, redirect_uri: str) -> GoogleIdentity:
+    """Exchange authorization code and resolve the Google identity."""
+
+    token_payload = {
+        "client_id": settings.oauth_client_id,
+        "client_secret": settings.oauth_client_secret,
+        "code": code,
+        "grant_type": "authorization_code",
+        "redirect_uri": redirect_uri,
+    }
+    token_response = await get_http_client().post(settings.google_token_url, data=token_payload)
+    if token_response.status_code != 200:
+        logger.warning("Google token exchange failed: %s", token_response.text)
+        raise GoogleOAuthError("Failed to exchange authorization code")
+    token_data = token_response.json()
+    access_token = token_data.get("access_token")
+    if not access_token:
+        raise GoogleOAuthError("Google token response missing access token")
+
+    id_token = token_data.get("id_token")
+    if id_token:
+        claims = await verify_id_token(id_token, access_token=access_token)
+    else:
+        claims = await _fetch_userinfo(access_token)
+
+    sub = claims.get("sub")
+    email = claims.get("email")
+    if not sub or not email:
+        raise GoogleOAuthError("Incomplete user info")
+    return GoogleIdentity(sub=sub, email=email, email_verified=bool(claims.get("email_verified", False)))
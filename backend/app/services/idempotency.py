@@ -0,0 +1,188 @@
+"""Response store for requests carrying an ``Idempotency-Key`` header.
+
+The first request with a key claims it in a short transaction of its own,
+so concurrent duplicates see the claim immediately and wait for the
+outcome instead of executing again. Rows expire after
+``IDEMPOTENCY_KEY_TTL_MINUTES`` and are purged by the maintenance task.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.user import IdempotencyKey
+from app.services.subscriptions import current_time
+
+_POLL_INITIAL_SECONDS = 0.05
+_POLL_MAX_SECONDS = 0.5
+
+
+class IdempotencyKeyMismatchError(ValueError):
+    """Raised when a key is reused for a different request."""
+
+
+class IdempotencyKeyInProgressError(RuntimeError):
+    """Raised when the original request is still running after the wait."""
+
+
+@dataclass(frozen=True)
+class IdempotencyClaim:
+    """Exclusive right of the current request to execute for a key."""
+
+    record_id: uuid.UUID
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """Response recorded for a completed request."""
+
+    status_code: int
+    content_type: str | None
+    body: bytes
+
+
+def hash_key(key: str) -> bytes:
+    return hashlib.sha256(key.encode("utf-8")).digest()
+
+
+def hash_request(parts: Iterable[bytes]) -> bytes:
+    """Return fingerprint of request parts such as method, path and body."""
+
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.digest()
+
+
+async def _try_claim(
+    session: AsyncSession, *, user_id: uuid.UUID, key_hash: bytes, request_hash: bytes, now: datetime
+) -> uuid.UUID | None:
+    stmt = pg_insert(IdempotencyKey).values(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        key_hash=key_hash,
+        request_hash=request_hash,
+        locked_until=now + timedelta(seconds=settings.idempotency_lock_seconds),
+        expires_at=now + timedelta(minutes=settings.idempotency_key_ttl_minutes),
+    )
+    # Expired rows and claims abandoned by a crashed request are taken over.
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_idempotency_keys_user_key",
+        set_={
+            "request_hash": stmt.excluded.request_hash,
+            "status_code": None,
+            "content_type": None,
+            "body": None,
+            "locked_until": stmt.excluded.locked_until,
+            "expires_at": stmt.excluded.expires_at,
+            "created_at": now,
+            "updated_at": now,
+        },
+        where=or_(
+            IdempotencyKey.expires_at < now,
+            and_(
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.locked_until < now,
+                IdempotencyKey.request_hash == stmt.excluded.request_hash,
+            ),
+        ),
+    ).returning(IdempotencyKey.id)
+    record_id = await session.scalar(stmt)
+    await session.commit()
+    return record_id
+
+
+async def claim_idempotency_key(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    user_id: uuid.UUID,
+    key: str,
+    request_hash: bytes,
+) -> IdempotencyClaim | StoredResponse:
+    """Claim ``key`` for the current request or return the stored response.
+
+    While another request holds the key this polls until it completes, for
+    at most ``IDEMPOTENCY_WAIT_SECONDS``. Raises
+    :class:`IdempotencyKeyMismatchError` when the key was used with another
+    request and :class:`IdempotencyKeyInProgressError` when the wait runs out.
+    """
+
+    key_hash = hash_key(key)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.idempotency_wait_seconds
+    delay = _POLL_INITIAL_SECONDS
+    async with session_factory() as session:
+        while True:
+            now = current_time()
+            record_id = await _try_claim(
+                session, user_id=user_id, key_hash=key_hash, request_hash=request_hash, now=now
+            )
+            if record_id is not None:
+                return IdempotencyClaim(record_id=record_id)
+
+            row = (
+                await session.execute(
+                    select(
+                        IdempotencyKey.request_hash,
+                        IdempotencyKey.status_code,
+                        IdempotencyKey.content_type,
+                        IdempotencyKey.body,
+                    ).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key_hash == key_hash)
+                )
+            ).one_or_none()
+            await session.rollback()
+            if row is None:
+                # The claim was released by a failed request; try again.
+                continue
+            if row.request_hash != request_hash:
+                raise IdempotencyKeyMismatchError("Idempotency key was already used for a different request")
+            if row.status_code is not None:
+                return StoredResponse(status_code=row.status_code, content_type=row.content_type, body=row.body)
+            if loop.time() + delay > deadline:
+                raise IdempotencyKeyInProgressError("A request with this idempotency key is in progress")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _POLL_MAX_SECONDS)
+
+
+async def complete_idempotency_key(
+    session_factory: async_sessionmaker[AsyncSession], claim: IdempotencyClaim, response: StoredResponse
+) -> None:
+    """Record the response replayed to later requests with the same key."""
+
+    async with session_factory() as session:
+        await session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.id == claim.record_id)
+            .values(
+                status_code=response.status_code,
+                content_type=response.content_type,
+                body=response.body,
+                locked_until=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+
+async def release_idempotency_key(
+    session_factory: async_sessionmaker[AsyncSession], claim: IdempotencyClaim
+) -> None:
+    """Drop the claim of a failed request so a retry can execute."""
+
+    async with session_factory() as session:
+        await session.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.id == claim.record_id, IdempotencyKey.status_code.is_(None))
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
@@ -0,0 +1,141 @@
+"""Housekeeping helpers for short-lived tokens, idempotency keys and sync tombstones."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.base import Base
+from app.models.subscription import SubscriptionTombstone
+from app.models.user import EmailVerificationToken, IdempotencyKey, OAuthState, TelegramLinkToken, UserSession
+from app.services.subscriptions import current_time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CleanupStats:
+    """Counters collected while purging a single table."""
+
+    table: str
+    deleted: int = 0
+    batches: int = 0
+    duration_seconds: float = 0.0
+    exhausted: bool = False
+
+
+@dataclass
+class CleanupReport:
+    """Summary of a token cleanup run."""
+
+    tables: list[CleanupStats] = field(default_factory=list)
+
+    @property
+    def total_deleted(self) -> int:
+        return sum(stats.deleted for stats in self.tables)
+
+    def as_dict(self) -> dict[str, dict[str, float | int | bool]]:
+        return {
+            stats.table: {
+                "deleted": stats.deleted,
+                "batches": stats.batches,
+                "duration_seconds": round(stats.duration_seconds, 3),
+                "exhausted": stats.exhausted,
+            }
+            for stats in self.tables
+        }
+
+
+def _cleanup_targets(now: datetime) -> list[tuple[type[Base], ColumnElement[bool]]]:
+    """Return models with the predicate selecting rows that are safe to delete."""
+
+    oauth_cutoff = now - timedelta(minutes=settings.oauth_state_retention_minutes)
+    link_cutoff = now - timedelta(minutes=settings.telegram_link_token_retention_minutes)
+    verification_cutoff = now - timedelta(minutes=settings.email_verification_token_retention_minutes)
+    session_cutoff = now - timedelta(minutes=settings.user_session_retention_minutes)
+    tombstone_cutoff = now - timedelta(minutes=settings.subscription_tombstone_retention_minutes)
+    return [
+        (OAuthState, OAuthState.expires_at < oauth_cutoff),
+        (
+            TelegramLinkToken,
+            or_(TelegramLinkToken.expires_at < link_cutoff, TelegramLinkToken.used_at < link_cutoff),
+        ),
+        (
+            EmailVerificationToken,
+            or_(
+                EmailVerificationToken.expires_at < verification_cutoff,
+                EmailVerificationToken.used_at < verification_cutoff,
+            ),
+        ),
+        (UserSession, UserSession.refresh_expires_at < session_cutoff),
+        (SubscriptionTombstone, SubscriptionTombstone.deleted_at < tombstone_cutoff),
+        (IdempotencyKey, IdempotencyKey.expires_at < now),
+    ]
+
+
+async def _delete_batch(
+    session: AsyncSession, model: type[Base], predicate: ColumnElement[bool], batch_size: int
+) -> int:
+    """Delete up to ``batch_size`` rows matched through the column index."""
+
+    id_column = model.__table__.c.id
+    victims = (
+        select(id_column)
+        .where(predicate)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        delete(model).where(id_column.in_(victims)).execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return result.rowcount or 0
+
+
+async def purge_expired_tokens(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    now: datetime | None = None,
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+    max_batches: int | None = None,
+) -> CleanupReport:
+    """Delete expired or used token rows in short, separately committed batches."""
+
+    now = now or current_time()
+    batch_size = batch_size or settings.token_cleanup_batch_size
+    pause_seconds = settings.token_cleanup_pause_seconds if pause_seconds is None else pause_seconds
+    max_batches = max_batches or settings.token_cleanup_max_batches
+
+    report = CleanupReport()
+    for model, predicate in _cleanup_targets(now):
+        stats = CleanupStats(table=model.__tablename__)
+        started = time.perf_counter()
+        async with session_factory() as session:
+            while stats.batches < max_batches:
+                deleted = await _delete_batch(session, model, predicate, batch_size)
+                stats.batches += 1
+                stats.deleted += deleted
+                if deleted < batch_size:
+                    stats.exhausted = True
+                    break
+                if pause_seconds > 0:
+                    await asyncio.sleep(pause_seconds)
+        stats.duration_seconds = time.perf_counter() - started
+        report.tables.append(stats)
+        logger.info(
+            "Token cleanup for %s: deleted=%d batches=%d duration=%.3fs exhausted=%s",
+            stats.table,
+            stats.deleted,
+            stats.batches,
+            stats.duration_seconds,
+            stats.exhausted,
+        )
+    return report
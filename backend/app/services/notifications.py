@@ -0,0 +1,86 @@
+"""Notification delivery bookkeeping and per-user delivery summary."""
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.subscription import (
+    Notification,
+    NotificationChannel,
+    NotificationLastSent,
+    NotificationStatus,
+    Subscription,
+)
+
+
+class ChannelDeliverySummary(NamedTuple):
+    """Delivery counts of a channel since the summary start."""
+
+    channel: NotificationChannel
+    counts: dict[NotificationStatus, int]
+    last_sent_at: datetime | None
+
+
+async def record_last_sent(
+    session: AsyncSession, *, subscription_id: uuid.UUID, channel: NotificationChannel, sent_at: datetime
+) -> None:
+    """Advance the subscription's last sent time for ``channel``.
+
+    The upsert keeps the later of both times, so out-of-order writers never
+    move it backwards.
+    """
+
+    stmt = pg_insert(NotificationLastSent).values(
+        subscription_id=subscription_id, channel=channel, last_sent_at=sent_at
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[NotificationLastSent.subscription_id, NotificationLastSent.channel],
+            set_={"last_sent_at": func.greatest(NotificationLastSent.last_sent_at, stmt.excluded.last_sent_at)},
+        )
+    )
+
+
+async def load_delivery_summary(
+    session: AsyncSession, user_id: uuid.UUID, *, since: datetime
+) -> list[ChannelDeliverySummary]:
+    """Return per-channel delivery counts of the user's subscriptions since ``since``.
+
+    Attempts are counted by ``created_at``, so queued and failed ones are
+    included and partitions before ``since`` are pruned. Counts are read
+    from the ``(subscription_id, channel, status, created_at)`` index alone;
+    last sent times come from :class:`NotificationLastSent`.
+    """
+
+    counts: defaultdict[NotificationChannel, dict[NotificationStatus, int]] = defaultdict(dict)
+    result = await session.execute(
+        select(Notification.channel, Notification.status, func.count())
+        .join(Subscription, Subscription.id == Notification.subscription_id)
+        .where(Subscription.user_id == user_id, Notification.created_at >= since)
+        .group_by(Notification.channel, Notification.status)
+    )
+    for channel, delivery_status, count in result:
+        counts[channel][delivery_status] = count
+
+    result = await session.execute(
+        select(NotificationLastSent.channel, func.max(NotificationLastSent.last_sent_at))
+        .join(Subscription, Subscription.id == NotificationLastSent.subscription_id)
+        .where(Subscription.user_id == user_id)
+        .group_by(NotificationLastSent.channel)
+    )
+    last_sent = dict(result.tuples().all())
+
+    return [
+        ChannelDeliverySummary(
+            channel=channel,
+            counts={delivery_status: counts[channel].get(delivery_status, 0) for delivery_status in NotificationStatus},
+            last_sent_at=last_sent.get(channel),
+        )
+        for channel in NotificationChannel
+    ]
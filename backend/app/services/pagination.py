@@ -0,0 +1,61 @@
+"""Opaque cursors for keyset pagination."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client supplies a malformed cursor."""
+
+
+def encode_cursor(*values: datetime | uuid.UUID | int | str) -> str:
+    """Encode keyset position into URL-safe opaque string."""
+
+    parts = [value.isoformat() if isinstance(value, datetime) else str(value) for value in values]
+    raw = json.dumps(parts, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """Decode cursor produced by :func:`encode_cursor` into its raw parts."""
+
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        parts = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    if not isinstance(parts, list) or len(parts) != size or not all(isinstance(part, str) for part in parts):
+        raise InvalidCursorError("Malformed cursor")
+    return parts
+
+
+def _parse_timestamp(raw: str) -> datetime:
+    value = datetime.fromisoformat(raw)
+    # Keyset columns are timestamptz; a naive value cannot be compared with them.
+    if value.tzinfo is None:
+        raise InvalidCursorError("Malformed cursor")
+    return value
+
+
+def decode_datetime_uuid_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode ``(timestamp, id)`` keyset cursor."""
+
+    raw_ts, raw_id = decode_cursor(cursor, 2)
+    try:
+        return _parse_timestamp(raw_ts), uuid.UUID(raw_id)
+    except ValueError as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+
+def decode_version_datetime_cursor(cursor: str) -> tuple[int, datetime]:
+    """Decode ``(version, timestamp)`` sync cursor."""
+
+    raw_version, raw_ts = decode_cursor(cursor, 2)
+    try:
+        return int(raw_version), _parse_timestamp(raw_ts)
+    except ValueError as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
@@ -0,0 +1,187 @@
+"""Monthly range partitions of the notifications and audit log tables.
+
+Partitions are named ``<table>_pYYYYMM`` and cover one calendar month in
+UTC. They are created ``PARTITION_PREMAKE_MONTHS`` ahead of time, at API
+startup and by the maintenance task, so inserts never hit a missing range.
+Retention removes whole months that fell out of the configured window,
+which costs a catalog update instead of a ``DELETE`` visiting every row.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.subscription import AuditLog, Notification
+from app.services.subscriptions import current_time
+
+logger = logging.getLogger(__name__)
+
+# Serialises partition DDL issued by several processes at once.
+_ADVISORY_LOCK_KEY = 0x70617274
+# Partition DDL locks the parent table; give up instead of queueing writers behind it.
+_LOCK_TIMEOUT = "5s"
+
+RETENTION_ACTIONS = frozenset({"drop", "detach"})
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """Partitioned parent table with its retention in months, 0 keeps everything."""
+
+    name: str
+    retention_months: int
+
+
+@dataclass
+class PartitionReport:
+    """Partitions touched by a maintenance run."""
+
+    created: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    detached: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, list[str]]:
+        return {"created": self.created, "dropped": self.dropped, "detached": self.detached}
+
+
+def _partitioned_tables() -> list[PartitionedTable]:
+    return [
+        PartitionedTable(Notification.__tablename__, settings.notification_retention_months),
+        PartitionedTable(AuditLog.__tablename__, settings.audit_log_retention_months),
+    ]
+
+
+def month_start(moment: datetime) -> datetime:
+    """Return the first instant of the UTC month containing ``moment``."""
+
+    return moment.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift the first day of a month by whole months."""
+
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+async def _lock(session: AsyncSession) -> None:
+    await session.execute(text(f"SET LOCAL lock_timeout = '{_LOCK_TIMEOUT}'"))
+    await session.execute(select(func.pg_advisory_xact_lock(_ADVISORY_LOCK_KEY)))
+
+
+async def _list_partitions(session: AsyncSession, table: str) -> dict[datetime, str]:
+    """Return the monthly partitions attached to ``table`` keyed by month."""
+
+    names = await session.scalars(
+        text(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " WHERE pg_inherits.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    )
+    pattern = re.compile(rf"{re.escape(table)}_p(\d{{4}})(\d{{2}})")
+    partitions: dict[datetime, str] = {}
+    for name in names:
+        match = pattern.fullmatch(name)
+        if match is not None:
+            month = datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+            partitions[month] = name
+    return partitions
+
+
+async def ensure_partitions(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    now: datetime | None = None,
+    months_ahead: int | None = None,
+) -> list[str]:
+    """Create missing partitions from the current month ``months_ahead`` months on."""
+
+    first = month_start(now or current_time())
+    months_ahead = settings.partition_premake_months if months_ahead is None else months_ahead
+    created: list[str] = []
+    async with session_factory() as session:
+        await _lock(session)
+        for table in _partitioned_tables():
+            existing = await _list_partitions(session, table.name)
+            for offset in range(months_ahead + 1):
+                month = add_months(first, offset)
+                if month in existing:
+                    continue
+                name = partition_name(table.name, month)
+                await session.execute(
+                    text(
+                        f'CREATE TABLE "{name}" PARTITION OF "{table.name}"'
+                        f" FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                    )
+                )
+                created.append(name)
+        await session.commit()
+    return created
+
+
+async def remove_expired_partitions(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    now: datetime | None = None,
+    action: str | None = None,
+) -> PartitionReport:
+    """Drop or detach partitions lying entirely before the retention window.
+
+    Rows are kept for at least the configured number of months. Detached
+    partitions stay in the database as plain tables, e.g. for archiving,
+    and are no longer visible through the parent.
+    """
+
+    current_month = month_start(now or current_time())
+    action = action or settings.partition_retention_action
+    if action not in RETENTION_ACTIONS:
+        raise ValueError(f"Unsupported partition retention action: {action}")
+
+    report = PartitionReport()
+    for table in _partitioned_tables():
+        if table.retention_months <= 0:
+            continue
+        cutoff = add_months(current_month, -table.retention_months)
+        async with session_factory() as session:
+            existing = await _list_partitions(session, table.name)
+        for month, name in sorted(existing.items()):
+            if add_months(month, 1) > cutoff:
+                break
+            # One short transaction per partition keeps the parent locked briefly.
+            async with session_factory() as session:
+                await _lock(session)
+                if action == "drop":
+                    await session.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+                    report.dropped.append(name)
+                else:
+                    await session.execute(text(f'ALTER TABLE "{table.name}" DETACH PARTITION "{name}"'))
+                    report.detached.append(name)
+                await session.commit()
+    return report
+
+
+async def maintain_partitions(
+    session_factory: async_sessionmaker[AsyncSession], *, now: datetime | None = None
+) -> PartitionReport:
+    """Create upcoming partitions and apply retention to old ones."""
+
+    now = now or current_time()
+    created = await ensure_partitions(session_factory, now=now)
+    report = await remove_expired_partitions(session_factory, now=now)
+    report.created = created
+    logger.info(
+        "Partition maintenance: created=%s dropped=%s detached=%s", report.created, report.dropped, report.detached
+    )
+    return report
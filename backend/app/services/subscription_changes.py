@@ -0,0 +1,114 @@
+"""Change tracking for the per-user subscription collection.
+
+Every write bumps ``User.subscriptions_version`` and stamps the touched rows
+(or tombstones of deleted ones) with the new value. The bump locks the user
+row until commit, so versions become visible in increasing order and delta
+sync clients can safely resume from the last version they saw.
+
+Each bump also queues a ``NOTIFY`` on :data:`CHANGES_CHANNEL`. Postgres
+delivers it only if the transaction commits, which is what the live event
+stream in :mod:`app.services.subscription_events` listens to.
+"""
+from __future__ import annotations
+
+import json
+import uuid
+from collections.abc import Collection, Iterable, Mapping
+
+from sqlalchemy import ARRAY, Text, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.subscription import Subscription, SubscriptionTombstone
+from app.models.user import User
+
+CHANGES_CHANNEL = "subscription_changes"
+
+
+async def bump_subscriptions_version(session: AsyncSession, *, user_id: uuid.UUID) -> int:
+    """Increment user's collection version and return the new value."""
+
+    # ``updated_at`` is pinned so the bump does not count as a profile change.
+    version = await session.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(subscriptions_version=User.subscriptions_version + 1, updated_at=User.updated_at)
+        .returning(User.subscriptions_version)
+        .execution_options(synchronize_session=False)
+    )
+    await _notify(session, {user_id: version})
+    return version
+
+
+async def record_subscription_change(
+    session: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    changed: Iterable[uuid.UUID] = (),
+    deleted: Iterable[uuid.UUID] = (),
+) -> int:
+    """Register a write to the user's subscriptions in the current transaction.
+
+    ``changed`` lists created or updated subscriptions and ``deleted`` the
+    removed ones. Returns the new collection version.
+    """
+
+    version = await bump_subscriptions_version(session, user_id=user_id)
+    await _stamp_changes(session, user_id=user_id, version=version, changed=changed, deleted=deleted)
+    return version
+
+
+async def record_subscription_changes(
+    session: AsyncSession, *, changed: Mapping[uuid.UUID, Collection[uuid.UUID]]
+) -> None:
+    """Register updates of subscriptions belonging to several users."""
+
+    if not changed:
+        return
+    result = await session.execute(
+        update(User)
+        .where(User.id.in_(sorted(changed)))
+        .values(subscriptions_version=User.subscriptions_version + 1, updated_at=User.updated_at)
+        .returning(User.id, User.subscriptions_version)
+        .execution_options(synchronize_session=False)
+    )
+    versions = dict(result.all())
+    for user_id, version in versions.items():
+        await _stamp_changes(session, user_id=user_id, version=version, changed=changed[user_id])
+    await _notify(session, versions)
+
+
+async def _notify(session: AsyncSession, versions: Mapping[uuid.UUID, int]) -> None:
+    payloads = [json.dumps({"user_id": str(user_id), "version": version}) for user_id, version in versions.items()]
+    if payloads:
+        # One statement regardless of how many users a worker batch touched.
+        await session.execute(select(func.pg_notify(CHANGES_CHANNEL, func.unnest(literal(payloads, ARRAY(Text))))))
+
+
+async def _stamp_changes(
+    session: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    version: int,
+    changed: Iterable[uuid.UUID] = (),
+    deleted: Iterable[uuid.UUID] = (),
+) -> None:
+    changed_ids = sorted(set(changed))
+    if changed_ids:
+        await session.execute(
+            update(Subscription)
+            .where(Subscription.id.in_(changed_ids))
+            .values(change_version=version, updated_at=Subscription.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+    deleted_ids = sorted(set(deleted))
+    if deleted_ids:
+        stmt = pg_insert(SubscriptionTombstone).values(
+            [{"id": subscription_id, "user_id": user_id, "change_version": version} for subscription_id in deleted_ids]
+        )
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[SubscriptionTombstone.id],
+                set_={"change_version": stmt.excluded.change_version, "deleted_at": stmt.excluded.deleted_at},
+            )
+        )
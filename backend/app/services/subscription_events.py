@@ -0,0 +1,165 @@
+"""Live fan-out of subscription change notifications.
+
+Every API process keeps one ``LISTEN`` connection on
+:data:`~app.services.subscription_changes.CHANGES_CHANNEL` and hands the
+notifications to in-memory per-user subscribers, so open event streams do
+not hold database connections of their own. Notifications only say that a
+user's collection moved to a new version; clients fetch the actual rows
+through delta sync.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from app.db.session import get_engine
+from app.services.subscription_changes import CHANGES_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+_KEEPALIVE_SECONDS = 60.0
+_MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+_listener: ChangeListener | None = None
+
+
+class ChangeSubscription:
+    """Change signal of a single client.
+
+    Bursts of notifications collapse into one wake-up; ``version`` is the
+    highest collection version announced so far.
+    """
+
+    def __init__(self, user_id: uuid.UUID) -> None:
+        self.user_id = user_id
+        self.version: int | None = None
+        self._event = asyncio.Event()
+
+    def push(self, version: int | None) -> None:
+        """Signal a change; ``None`` asks for a resync after missed notifications."""
+
+        if version is not None and (self.version is None or version > self.version):
+            self.version = version
+        self._event.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a change; return ``False`` when ``timeout`` passes first."""
+
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+class ChangeListener:
+    """Single ``LISTEN`` connection dispatching notifications to subscribers.
+
+    The connection is opened with the first subscriber, kept until shutdown
+    and re-established with backoff when it drops. Subscribers are told to
+    resynchronise after every (re)connect since notifications sent meanwhile
+    are lost.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[uuid.UUID, set[ChangeSubscription]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: uuid.UUID) -> AsyncIterator[ChangeSubscription]:
+        """Register a subscriber for user's changes for the duration of the block."""
+
+        subscription = ChangeSubscription(user_id)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="subscription-change-listener")
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _dispatch(self, user_id: uuid.UUID, version: int | None) -> None:
+        for subscription in self._subscribers.get(user_id, ()):
+            subscription.push(version)
+
+    def _resync_all(self) -> None:
+        for user_id in list(self._subscribers):
+            self._dispatch(user_id, None)
+
+    def _on_notification(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            user_id = uuid.UUID(data["user_id"])
+            version = int(data["version"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed subscription change notification: %r", payload)
+            return
+        self._dispatch(user_id, version)
+
+    async def _run(self) -> None:
+        driver = get_engine().dialect.driver
+        if driver != "asyncpg":
+            logger.warning("Live subscription events need the asyncpg driver, not %s", driver)
+            return
+        delay = 1.0
+        while True:
+            try:
+                await self._listen()
+                delay = 1.0
+            except Exception:
+                logger.warning("Subscription change listener disconnected", exc_info=True)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _MAX_RECONNECT_DELAY_SECONDS)
+
+    async def _listen(self) -> None:
+        async with get_engine().connect() as connection:
+            await connection.execution_options(isolation_level="AUTOCOMMIT")
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            lost = asyncio.Event()
+            driver_connection.add_termination_listener(lambda _connection: lost.set())
+            await driver_connection.add_listener(CHANGES_CHANNEL, self._on_notification)
+            self._resync_all()
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), _KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    # Surfaces half-open connections that never report termination.
+                    await driver_connection.execute("SELECT 1")
+
+
+def get_change_listener() -> ChangeListener:
+    """Return process-wide change listener."""
+
+    global _listener
+    if _listener is None:
+        _listener = ChangeListener()
+    return _listener
+
+
+async def close_change_listener() -> None:
+    """Stop listening and release the connection."""
+
+    global _listener
+    if _listener is not None:
+        await _listener.close()
+        _listener = None
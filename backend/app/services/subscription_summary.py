@@ -0,0 +1,158 @@
+"""Incrementally maintained per-user subscription summary."""
+from __future__ import annotations
+
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import NamedTuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.subscription import Subscription, SubscriptionStatus, SubscriptionSummary
+from app.services.subscriptions import REMINDER_WINDOW_DAYS, current_time
+
+_SPENDING_STATUSES = frozenset({SubscriptionStatus.active, SubscriptionStatus.expired})
+
+
+class SummaryKey(NamedTuple):
+    """Part of a subscription that contributes to the summary."""
+
+    status: SubscriptionStatus
+    currency: str
+    price: Decimal
+
+
+class SummaryData(NamedTuple):
+    """Aggregated dashboard figures for a user."""
+
+    counts: dict[SubscriptionStatus, int]
+    totals_by_currency: dict[str, Decimal]
+    reminders_due: int
+
+
+def summary_key(subscription: Subscription) -> SummaryKey:
+    """Return summary contribution of subscription in its current state."""
+
+    return SummaryKey(
+        status=SubscriptionStatus(subscription.status),
+        currency=subscription.currency,
+        price=subscription.price_numeric,
+    )
+
+
+async def apply_summary_delta(
+    session: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    before: SummaryKey | None,
+    after: SummaryKey | None,
+) -> None:
+    """Move a subscription's contribution from ``before`` to ``after``.
+
+    ``before`` is ``None`` for created subscriptions and ``after`` is ``None``
+    for deleted ones. Deltas are applied as atomic upserts so concurrent
+    writers for the same user never lose updates.
+    """
+
+    await apply_summary_deltas(session, user_id=user_id, changes=[(before, after)])
+
+
+async def apply_summary_deltas(
+    session: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    changes: Iterable[tuple[SummaryKey | None, SummaryKey | None]],
+) -> None:
+    """Apply several ``(before, after)`` moves with one multi-row upsert."""
+
+    deltas: dict[tuple[SubscriptionStatus, str], tuple[int, Decimal]] = {}
+    for before, after in changes:
+        if before == after:
+            continue
+        for key, sign in ((before, -1), (after, 1)):
+            if key is None:
+                continue
+            count, total = deltas.get((key.status, key.currency), (0, Decimal("0")))
+            deltas[(key.status, key.currency)] = (count + sign, total + sign * key.price)
+
+    rows = [
+        {"user_id": user_id, "status": status, "currency": currency, "count": count, "total": total}
+        for (status, currency), (count, total) in sorted(deltas.items())
+        if count != 0 or total != 0
+    ]
+    if not rows:
+        return
+
+    # Rows are keyed by (status, currency), so no row is touched twice by
+    # the upsert; sorting keeps lock order stable across writers.
+    stmt = pg_insert(SubscriptionSummary).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SubscriptionSummary.user_id, SubscriptionSummary.status, SubscriptionSummary.currency],
+        set_={
+            "count": SubscriptionSummary.count + stmt.excluded.count,
+            "total": SubscriptionSummary.total + stmt.excluded.total,
+        },
+    )
+    await session.execute(stmt)
+
+
+async def rebuild_summary(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """Recompute summary rows for user from the subscriptions table."""
+
+    await session.execute(delete(SubscriptionSummary).where(SubscriptionSummary.user_id == user_id))
+    aggregate = (
+        select(
+            Subscription.user_id,
+            Subscription.status,
+            Subscription.currency,
+            func.count(),
+            func.sum(Subscription.price_numeric),
+        )
+        .where(Subscription.user_id == user_id)
+        .group_by(Subscription.user_id, Subscription.status, Subscription.currency)
+    )
+    await session.execute(
+        insert(SubscriptionSummary).from_select(
+            ["user_id", "status", "currency", "count", "total"],
+            aggregate,
+        )
+    )
+
+
+async def load_summary(session: AsyncSession, user_id: uuid.UUID, *, now: datetime | None = None) -> SummaryData:
+    """Return dashboard summary for user."""
+
+    now = now or current_time()
+    result = await session.execute(
+        select(
+            SubscriptionSummary.status,
+            SubscriptionSummary.currency,
+            SubscriptionSummary.count,
+            SubscriptionSummary.total,
+        ).where(SubscriptionSummary.user_id == user_id, SubscriptionSummary.count > 0)
+    )
+    counts: Counter[SubscriptionStatus] = Counter({status: 0 for status in SubscriptionStatus})
+    totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0"))
+    for status, currency, count, total in result:
+        counts[status] += count
+        if status in _SPENDING_STATUSES:
+            totals[currency] += total
+
+    # Due reminders depend on the clock, so they are counted live through the
+    # (user_id, next_reminder_at) index rather than stored.
+    horizon = now + timedelta(days=REMINDER_WINDOW_DAYS)
+    reminders_due = await session.scalar(
+        select(func.count())
+        .select_from(Subscription)
+        .where(
+            Subscription.user_id == user_id,
+            Subscription.next_reminder_at.isnot(None),
+            Subscription.next_reminder_at <= horizon,
+            Subscription.status.in_(_SPENDING_STATUSES),
+        )
+    )
+    return SummaryData(counts=dict(counts), totals_by_currency=dict(sorted(totals.items())), reminders_due=reminders_due or 0)
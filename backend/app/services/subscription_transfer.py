@@ -0,0 +1,239 @@
+"""Bulk import and export of subscriptions."""
+from __future__ import annotations
+
+import csv
+import enum
+import io
+import json
+import uuid
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.subscription import AuditAction, Subscription
+from app.schemas.subscription import (
+    SubscriptionCreate,
+    SubscriptionImportIssue,
+    SubscriptionImportRowError,
+    SubscriptionRead,
+)
+from app.services.audit import record_audit_log
+from app.services.subscription_changes import bump_subscriptions_version
+from app.services.subscription_summary import SummaryKey, apply_summary_deltas
+from app.services.subscriptions import current_time, new_subscription_values
+
+EXPORT_FIELDS = tuple(SubscriptionRead.model_fields)
+_MAX_REPORTED_ERRORS = 1000
+_COPY_COLUMNS = (
+    "id",
+    "user_id",
+    "name",
+    "price_numeric",
+    "currency",
+    "end_at",
+    "status",
+    "category",
+    "vendor",
+    "notes",
+    "next_reminder_at",
+    "last_notified_at",
+    "change_version",
+)
+
+
+class TransferFormat(str, enum.Enum):
+    """Encodings supported for streaming, export and import."""
+
+    json = "json"
+    ndjson = "ndjson"
+    csv = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return {
+            TransferFormat.json: "application/json",
+            TransferFormat.ndjson: "application/x-ndjson",
+            TransferFormat.csv: "text/csv",
+        }[self]
+
+
+class ImportLimitError(ValueError):
+    """Raised when an import holds more rows than allowed."""
+
+
+@dataclass
+class ImportResult:
+    """Counters and row errors collected while importing."""
+
+    total_rows: int = 0
+    valid_rows: int = 0
+    imported: int = 0
+    error_count: int = 0
+    errors: list[SubscriptionImportRowError] = field(default_factory=list)
+
+
+def _csv_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, Decimal):
+        return format(value, "0.2f")
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def csv_header(fields: Sequence[str] = EXPORT_FIELDS) -> bytes:
+    """Return CSV header line for exported subscriptions."""
+
+    return encode_csv_rows([{name: name for name in fields}], fields)
+
+
+def encode_csv_rows(rows: Iterable[Mapping[str, Any]], fields: Sequence[str] = EXPORT_FIELDS) -> bytes:
+    """Encode rows as CSV lines with one column per field."""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(row[name]) for name in fields] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def iter_import_rows(body: bytes, file_format: TransferFormat) -> Iterator[tuple[int, Any]]:
+    """Yield ``(row_number, raw_row)`` pairs from an uploaded document.
+
+    CSV rows become dicts without empty cells, NDJSON rows stay raw JSON
+    text for :meth:`SubscriptionCreate.model_validate_json`. Raises
+    ``UnicodeDecodeError``, ``csv.Error`` or ``ValueError`` for documents
+    that cannot be split into rows at all.
+    """
+
+    text = body.decode("utf-8-sig")
+    if file_format is TransferFormat.csv:
+        reader = csv.DictReader(io.StringIO(text, newline=""))
+        for number, row in enumerate(reader, start=1):
+            yield number, {key: value for key, value in row.items() if key and value not in (None, "")}
+    elif file_format is TransferFormat.ndjson:
+        number = 0
+        for line in text.splitlines():
+            if line.strip():
+                number += 1
+                yield number, line
+    else:
+        document = json.loads(text)
+        if not isinstance(document, list):
+            raise ValueError("Expected a JSON array of subscriptions")
+        yield from enumerate(document, start=1)
+
+
+def _row_error(number: int, exc: ValidationError) -> SubscriptionImportRowError:
+    return SubscriptionImportRowError(
+        row=number,
+        errors=[
+            SubscriptionImportIssue(
+                field=".".join(str(part) for part in error["loc"]) or None,
+                message=error["msg"],
+            )
+            for error in exc.errors(include_url=False)
+        ],
+    )
+
+
+async def _write_batch(session: AsyncSession, batch: list[dict[str, Any]]) -> None:
+    connection = await session.connection()
+    if connection.dialect.driver == "asyncpg":
+        # COPY skips per-row statement overhead entirely.
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Subscription.__tablename__,
+            records=[tuple(values[column] for column in _COPY_COLUMNS) for values in batch],
+            columns=_COPY_COLUMNS,
+        )
+    else:
+        await session.execute(insert(Subscription), batch)
+    await apply_summary_deltas(
+        session,
+        user_id=batch[0]["user_id"],
+        changes=[
+            (None, SummaryKey(status=values["status"], currency=values["currency"], price=values["price_numeric"]))
+            for values in batch
+        ],
+    )
+
+
+async def import_subscriptions(
+    session: AsyncSession,
+    rows: Iterable[tuple[int, Any]],
+    *,
+    user_id: uuid.UUID,
+    user_timezone: str | None,
+    dry_run: bool,
+    skip_invalid: bool,
+    batch_size: int,
+    max_rows: int,
+) -> ImportResult:
+    """Validate rows and load valid ones for user in batches.
+
+    Without ``skip_invalid`` a single invalid row discards the whole import,
+    so ``imported`` is zero and the caller must roll back. The caller also
+    commits when anything was imported.
+    """
+
+    now = current_time()
+    result = ImportResult()
+    batch: list[dict[str, Any]] = []
+    version: int | None = None
+
+    def writable() -> bool:
+        return not dry_run and (skip_invalid or result.error_count == 0)
+
+    for number, raw in rows:
+        result.total_rows += 1
+        if result.total_rows > max_rows:
+            raise ImportLimitError(f"Import is limited to {max_rows} rows")
+        try:
+            if isinstance(raw, str):
+                payload = SubscriptionCreate.model_validate_json(raw)
+            else:
+                payload = SubscriptionCreate.model_validate(raw)
+        except ValidationError as exc:
+            result.error_count += 1
+            if len(result.errors) < _MAX_REPORTED_ERRORS:
+                result.errors.append(_row_error(number, exc))
+            continue
+
+        result.valid_rows += 1
+        if not writable():
+            continue
+        if version is None:
+            # Taken before the first write so COPY can stamp rows directly.
+            version = await bump_subscriptions_version(session, user_id=user_id)
+        values = new_subscription_values(payload, user_id=user_id, now=now, user_timezone=user_timezone)
+        values["id"] = uuid.uuid4()
+        values["change_version"] = version
+        batch.append(values)
+        if len(batch) >= batch_size:
+            await _write_batch(session, batch)
+            result.imported += len(batch)
+            batch = []
+
+    if batch and writable():
+        await _write_batch(session, batch)
+        result.imported += len(batch)
+    if not writable():
+        result.imported = 0
+        return result
+
+    if result.imported:
+        await record_audit_log(
+            session,
+            user_id=user_id,
+            action=AuditAction.subscriptions_imported,
+            entity="subscription",
+            meta={"rows": result.imported, "skipped": result.error_count},
+        )
+    return result
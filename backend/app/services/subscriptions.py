@@ -1,11 +1,14 @@
 """Business logic helpers for subscriptions."""
 from __future__ import annotations
 
+import uuid
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal, ROUND_HALF_UP
+from typing import Any
 from zoneinfo import ZoneInfo
 
 from app.models.subscription import Subscription, SubscriptionStatus
+from app.schemas.subscription import SubscriptionCreate
 
 REMINDER_WINDOW_DAYS = 7
 REMINDER_INTERVAL = timedelta(days=1)
@@ -102,3 +105,43 @@ def apply_business_rules(
         now=now,
         user_timezone=user_timezone,
     )
+
+
+def new_subscription_values(
+    payload: SubscriptionCreate,
+    *,
+    user_id: uuid.UUID,
+    now: datetime,
+    user_timezone: str | None = None,
+) -> dict[str, Any]:
+    """Return column values for a subscription created from payload."""
+
+    status = resolve_subscription_status(
+        end_at=payload.end_at,
+        provided_status=payload.status,
+        existing_status=None,
+        now=now,
+    )
+    if "next_reminder_at" in payload.model_fields_set:
+        next_reminder_at = payload.next_reminder_at
+    else:
+        next_reminder_at = calculate_next_reminder(
+            end_at=payload.end_at,
+            status=status,
+            last_notified_at=payload.last_notified_at,
+            now=now,
+            user_timezone=user_timezone,
+        )
+    return {
+        "user_id": user_id,
+        "name": payload.name,
+        "price_numeric": normalize_price(payload.price),
+        "currency": payload.currency,
+        "end_at": payload.end_at,
+        "status": status,
+        "category": payload.category,
+        "vendor": payload.vendor,
+        "notes": payload.notes,
+        "next_reminder_at": next_reminder_at,
+        "last_notified_at": payload.last_notified_at,
+    }
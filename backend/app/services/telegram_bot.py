@@ -24,10 +24,15 @@ from telegram.ext import (
 )
 
 from app.core.config import settings
+from app.core.metrics import track_external_call
+from app.core.tracing import start_span
+from app.db.profiling import profile_queries
 from app.db.session import get_sessionmaker
 from app.models.subscription import AuditAction, Subscription, SubscriptionStatus
 from app.models.user import TelegramAccount, User
 from app.services.audit import record_audit_log
+from app.services.subscription_changes import record_subscription_change
+from app.services.subscription_summary import apply_summary_delta, summary_key
 from app.services.subscriptions import calculate_next_reminder, current_time, resolve_subscription_status
 from app.services.telegram_link import complete_telegram_link
 
@@ -291,11 +296,13 @@ async def handle_callback_action(update: Update, context: ContextTypes.DEFAULT_T
         user = await _find_user_by_chat_id(session, chat_id)
         if user is None:
             return "Аккаунт не привязан."
-        subscription = await session.get(Subscription, subscription_id)
+        # Locked because the summary delta is computed from the loaded state.
+        subscription = await session.get(Subscription, subscription_id, with_for_update=True)
         if subscription is None or subscription.user_id != user.id:
             return "Подписка не найдена."
 
         now = current_time()
+        previous_key = summary_key(subscription)
 
         if action == "extend_1m":
             subscription.end_at = _add_months(subscription.end_at, 1)
@@ -331,6 +338,8 @@ async def handle_callback_action(update: Update, context: ContextTypes.DEFAULT_T
                 user_timezone=user.tz,
             )
         await session.flush()
+        await apply_summary_delta(session, user_id=user.id, before=previous_key, after=summary_key(subscription))
+        await record_subscription_change(session, user_id=user.id, changed=[subscription.id])
         await record_audit_log(
             session,
             user_id=user.id,
@@ -344,7 +353,10 @@ async def handle_callback_action(update: Update, context: ContextTypes.DEFAULT_T
 
         text = _format_subscription_message(subscription)
         keyboard = _subscription_keyboard(subscription)
-        await query.edit_message_text(text=text, parse_mode=ParseMode.HTML, reply_markup=keyboard)
+        with start_span("telegram.edit_message_text", kind="client"), track_external_call(
+            "telegram", "edit_message_text"
+        ):
+            await query.edit_message_text(text=text, parse_mode=ParseMode.HTML, reply_markup=keyboard)
         return "Готово"
 
     result = await _with_session(_apply)
@@ -355,15 +367,17 @@ async def handle_callback_action(update: Update, context: ContextTypes.DEFAULT_T
 async def send_subscription_notification(chat_id: int, subscription: Subscription, bot: Application | None = None) -> None:
     """Utility for future usage to send notifications with inline keyboard."""
 
-    application = bot or await ensure_application_ready()
-    text = _format_subscription_message(subscription)
-    keyboard = _subscription_keyboard(subscription)
-    await application.bot.send_message(
-        chat_id=chat_id,
-        text=text,
-        parse_mode=ParseMode.HTML,
-        reply_markup=keyboard,
-    )
+    with start_span("send_subscription_notification", **{"subscription.id": str(subscription.id)}):
+        application = bot or await ensure_application_ready()
+        text = _format_subscription_message(subscription)
+        keyboard = _subscription_keyboard(subscription)
+        with start_span("telegram.send_message", kind="client"), track_external_call("telegram", "send_message"):
+            await application.bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                parse_mode=ParseMode.HTML,
+                reply_markup=keyboard,
+            )
 
 
 async def ensure_application_ready() -> Application:
@@ -395,4 +409,8 @@ async def process_update(update: Update) -> None:
     """Process incoming Telegram update via configured application."""
 
     application = await ensure_application_ready()
-    await application.process_update(update)
+    if not settings.sql_profiling_enabled:
+        await application.process_update(update)
+        return
+    with profile_queries(f"telegram update {update.update_id}"):
+        await application.process_update(update)
@@ -3,13 +3,14 @@ from __future__ import annotations
 
 import secrets
 import uuid
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.user import TelegramAccount, TelegramLinkToken
+from app.models.user import TelegramAccount
 from app.services.subscriptions import current_time
+from app.services.token_store import LinkTokenRecord, get_token_store
 
 _LINK_TOKEN_TTL = timedelta(minutes=10)
 
@@ -19,20 +20,17 @@ async def create_link_token(
     *,
     user_id: uuid.UUID,
     ttl: timedelta = _LINK_TOKEN_TTL,
-) -> TelegramLinkToken:
+) -> LinkTokenRecord:
     """Create and return a one-time Telegram link token."""
 
     now = current_time()
-    expires_at = now + ttl
-    token_value = secrets.token_urlsafe(16)
-
-    link_token = TelegramLinkToken(
+    link_token = LinkTokenRecord(
+        id=uuid.uuid4(),
         user_id=user_id,
-        token=token_value,
-        expires_at=expires_at,
+        token=secrets.token_urlsafe(16),
+        expires_at=now + ttl,
     )
-    session.add(link_token)
-    await session.flush()
+    await get_token_store().put_link_token(session, link_token)
     return link_token
 
 
@@ -42,17 +40,13 @@ async def complete_telegram_link(
     token: str,
     chat_id: int,
 ) -> TelegramAccount | None:
-    """Mark link token as used and ensure TelegramAccount exists."""
+    """Consume link token and ensure TelegramAccount exists."""
 
-    result = await session.execute(
-        select(TelegramLinkToken).where(TelegramLinkToken.token == token)
-    )
-    link_token = result.scalar_one_or_none()
-    now = current_time()
-    if link_token is None or link_token.expires_at < now or link_token.used_at is not None:
+    link_token = await get_token_store().consume_link_token(session, token)
+    if link_token is None:
         return None
 
-    link_token.used_at = now
+    now = current_time()
 
     account_result = await session.execute(
         select(TelegramAccount).where(TelegramAccount.user_id == link_token.user_id)
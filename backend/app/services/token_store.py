@@ -0,0 +1,215 @@
+"""Storage for short-lived OAuth states and Telegram link tokens.
+
+Both kinds of tokens live for minutes and are consumed exactly once. They are
+kept in Redis with native TTLs when ``REDIS_URL`` is configured, with the
+tables as a fallback when Redis is unreachable, and in the database
+otherwise, where consumption is part of the request transaction.
+``TOKEN_STORE_BACKEND`` overrides the choice.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import NamedTuple, Protocol
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user import OAuthProvider, OAuthState, TelegramLinkToken
+from app.services.subscriptions import current_time
+
+logger = logging.getLogger(__name__)
+
+_OAUTH_STATE_PREFIX = "oauth_state:"
+_LINK_TOKEN_PREFIX = "telegram_link_token:"
+
+_redis: Redis | None = None
+_store: TokenStore | None = None
+
+
+class OAuthStateRecord(NamedTuple):
+    """OAuth state issued on login."""
+
+    provider: OAuthProvider
+    state: str
+    redirect_uri: str
+    expires_at: datetime
+
+
+class LinkTokenRecord(NamedTuple):
+    """One-time Telegram link token."""
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    token: str
+    expires_at: datetime
+
+
+class TokenStore(Protocol):
+    """Backend able to persist tokens and consume each of them at most once."""
+
+    async def put_oauth_state(self, session: AsyncSession, record: OAuthStateRecord) -> None: ...
+
+    async def consume_oauth_state(self, session: AsyncSession, state: str) -> OAuthStateRecord | None: ...
+
+    async def put_link_token(self, session: AsyncSession, record: LinkTokenRecord) -> None: ...
+
+    async def consume_link_token(self, session: AsyncSession, token: str) -> LinkTokenRecord | None: ...
+
+
+class DatabaseTokenStore:
+    """Token store backed by ``oauth_states`` and ``telegram_link_tokens`` tables."""
+
+    async def put_oauth_state(self, session: AsyncSession, record: OAuthStateRecord) -> None:
+        session.add(
+            OAuthState(
+                provider=record.provider,
+                state=record.state,
+                redirect_uri=record.redirect_uri,
+                expires_at=record.expires_at,
+            )
+        )
+        await session.flush()
+
+    async def consume_oauth_state(self, session: AsyncSession, state: str) -> OAuthStateRecord | None:
+        result = await session.execute(
+            delete(OAuthState)
+            .where(OAuthState.state == state, OAuthState.expires_at >= current_time())
+            .returning(OAuthState.provider, OAuthState.redirect_uri, OAuthState.expires_at)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        provider, redirect_uri, expires_at = row
+        return OAuthStateRecord(provider=provider, state=state, redirect_uri=redirect_uri, expires_at=expires_at)
+
+    async def put_link_token(self, session: AsyncSession, record: LinkTokenRecord) -> None:
+        session.add(
+            TelegramLinkToken(
+                id=record.id,
+                user_id=record.user_id,
+                token=record.token,
+                expires_at=record.expires_at,
+            )
+        )
+        await session.flush()
+
+    async def consume_link_token(self, session: AsyncSession, token: str) -> LinkTokenRecord | None:
+        now = current_time()
+        result = await session.execute(
+            update(TelegramLinkToken)
+            .where(
+                TelegramLinkToken.token == token,
+                TelegramLinkToken.used_at.is_(None),
+                TelegramLinkToken.expires_at >= now,
+            )
+            .values(used_at=now)
+            .returning(TelegramLinkToken.id, TelegramLinkToken.user_id, TelegramLinkToken.expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        token_id, user_id, expires_at = row
+        return LinkTokenRecord(id=token_id, user_id=user_id, token=token, expires_at=expires_at)
+
+
+class RedisTokenStore:
+    """Token store keeping records in Redis with TTLs and ``GETDEL`` consumption.
+
+    Writes fall back to the database store when Redis is unreachable, and a
+    Redis miss is retried against the database so such records stay usable.
+    Unlike the database store, consumption is not undone when the caller's
+    transaction rolls back.
+    """
+
+    def __init__(self, client: Redis, fallback: DatabaseTokenStore) -> None:
+        self._client = client
+        self._fallback = fallback
+
+    async def _put(self, key: str, payload: dict[str, str], expires_at: datetime) -> bool:
+        ttl = max(int((expires_at - current_time()).total_seconds()), 1)
+        try:
+            await self._client.set(key, json.dumps(payload), ex=ttl, nx=True)
+        except RedisError:
+            logger.warning("Redis unavailable; storing %s in database", key.split(":", 1)[0], exc_info=True)
+            return False
+        return True
+
+    async def _consume(self, key: str) -> dict[str, str] | None:
+        try:
+            raw = await self._client.getdel(key)
+        except RedisError:
+            logger.warning("Redis unavailable; consuming %s from database", key.split(":", 1)[0], exc_info=True)
+            return None
+        return json.loads(raw) if raw else None
+
+    async def put_oauth_state(self, session: AsyncSession, record: OAuthStateRecord) -> None:
+        payload = {
+            "provider": record.provider.value,
+            "redirect_uri": record.redirect_uri,
+            "expires_at": record.expires_at.isoformat(),
+        }
+        if not await self._put(_OAUTH_STATE_PREFIX + record.state, payload, record.expires_at):
+            await self._fallback.put_oauth_state(session, record)
+
+    async def consume_oauth_state(self, session: AsyncSession, state: str) -> OAuthStateRecord | None:
+        payload = await self._consume(_OAUTH_STATE_PREFIX + state)
+        if payload is None:
+            return await self._fallback.consume_oauth_state(session, state)
+        record = OAuthStateRecord(
+            provider=OAuthProvider(payload["provider"]),
+            state=state,
+            redirect_uri=payload["redirect_uri"],
+            expires_at=datetime.fromisoformat(payload["expires_at"]),
+        )
+        return record if record.expires_at >= current_time() else None
+
+    async def put_link_token(self, session: AsyncSession, record: LinkTokenRecord) -> None:
+        payload = {
+            "id": str(record.id),
+            "user_id": str(record.user_id),
+            "expires_at": record.expires_at.isoformat(),
+        }
+        if not await self._put(_LINK_TOKEN_PREFIX + record.token, payload, record.expires_at):
+            await self._fallback.put_link_token(session, record)
+
+    async def consume_link_token(self, session: AsyncSession, token: str) -> LinkTokenRecord | None:
+        payload = await self._consume(_LINK_TOKEN_PREFIX + token)
+        if payload is None:
+            return await self._fallback.consume_link_token(session, token)
+        record = LinkTokenRecord(
+            id=uuid.UUID(payload["id"]),
+            user_id=uuid.UUID(payload["user_id"]),
+            token=token,
+            expires_at=datetime.fromisoformat(payload["expires_at"]),
+        )
+        return record if record.expires_at >= current_time() else None
+
+
+def get_token_store() -> TokenStore:
+    """Return configured token store singleton."""
+
+    global _redis, _store
+    if _store is None:
+        if settings.resolved_token_store_backend == "redis":
+            _redis = Redis.from_url(settings.redis_url, socket_timeout=1.0, socket_connect_timeout=1.0)
+            _store = RedisTokenStore(_redis, DatabaseTokenStore())
+        else:
+            _store = DatabaseTokenStore()
+    return _store
+
+
+async def close_token_store() -> None:
+    """Release Redis connections held by the token store."""
+
+    global _redis, _store
+    if _redis is not None:
+        await _redis.aclose()
+    _redis = None
+    _store = None
@@ -24,7 +24,15 @@ celery_app.conf.beat_schedule = {
     "dispatch-telegram-reminders": {
         "task": "subscriptions.reminders.dispatch_due",
         "schedule": schedule(60.0),
-    }
+    },
+    "purge-expired-tokens": {
+        "task": "subscriptions.maintenance.purge_expired_tokens",
+        "schedule": schedule(60.0 * 15),
+    },
+    "maintain-partitions": {
+        "task": "subscriptions.maintenance.maintain_partitions",
+        "schedule": schedule(60.0 * 60 * 6),
+    },
 }
 
 
@@ -4,20 +4,58 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from contextvars import Token
 from datetime import datetime, timedelta
 
-from sqlalchemy import and_, select
+from celery import Task
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from sqlalchemy import and_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.metrics import (
+    CELERY_TASK_DURATION,
+    REMINDER_BACKLOG,
+    REMINDER_LATENESS,
+    mark_process_dead,
+    start_exporter,
+)
+from app.core.tracing import (
+    SpanHandle,
+    carrier_from_attributes,
+    close_span,
+    configure_tracing,
+    inject_context,
+    open_span,
+    shutdown_tracing,
+)
+from app.db.profiling import QueryProfile, finish_profile, start_profile
 from app.db.session import get_sessionmaker
 from app.models.subscription import (
     Notification,
     NotificationChannel,
+    NotificationLastSent,
     NotificationStatus,
     Subscription,
     SubscriptionStatus,
 )
 from app.models.user import TelegramAccount, User
+from app.services.email import EmailDeliveryError, close_connection, send_email
+from app.services.maintenance import purge_expired_tokens
+from app.services.notifications import record_last_sent
+from app.services.partitions import maintain_partitions
+from app.services.subscription_changes import record_subscription_changes
 from app.services.subscriptions import calculate_next_reminder, current_time
 from app.services.telegram_bot import send_subscription_notification
 from app.workers.celery_app import celery_app
@@ -25,6 +63,10 @@ from app.workers.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
+_task_started: dict[str, float] = {}
+_task_profiles: dict[str, tuple[QueryProfile, Token[QueryProfile | None]]] = {}
+_task_spans: dict[str, SpanHandle] = {}
+
 
 @celery_app.task(name="subscriptions.ping")
 def ping() -> str:
@@ -40,31 +82,166 @@ def dispatch_due_reminders() -> None:
     asyncio.run(_dispatch_due_reminders())
 
 
+@celery_app.task(
+    name="subscriptions.email.send",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=30,
+    acks_late=True,
+)
+def send_email_task(
+    self,
+    *,
+    to_address: str,
+    subject: str,
+    text_body: str,
+    notification_id: str | None = None,
+) -> str:
+    """Deliver transactional email and record the delivery outcome."""
+
+    try:
+        sent = send_email(to_address=to_address, subject=subject, text_body=text_body)
+    except EmailDeliveryError as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        asyncio.run(_record_email_delivery(notification_id, NotificationStatus.failed, str(exc)))
+        raise
+
+    if not sent:
+        asyncio.run(
+            _record_email_delivery(notification_id, NotificationStatus.failed, "Email delivery is not configured")
+        )
+        return NotificationStatus.failed.value
+
+    asyncio.run(_record_email_delivery(notification_id, NotificationStatus.sent, None))
+    return NotificationStatus.sent.value
+
+
+@worker_process_shutdown.connect
+def _close_smtp_connection(**_: object) -> None:
+    close_connection()
+
+
+@worker_process_shutdown.connect
+def _release_process_metrics(pid: int | None = None, **_: object) -> None:
+    mark_process_dead(pid or os.getpid())
+
+
+@worker_init.connect
+def _start_tracing(**_: object) -> None:
+    # Pool processes forked later restart the span export thread themselves.
+    configure_tracing("subscriptions-worker")
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _flush_traces(**_: object) -> None:
+    shutdown_tracing()
+
+
+@before_task_publish.connect
+def _propagate_trace_context(headers: dict[str, str] | None = None, **_: object) -> None:
+    if headers is not None:
+        inject_context(headers)
+
+
+@worker_init.connect
+def _start_metrics_exporter(**_: object) -> None:
+    if settings.metrics_enabled and settings.worker_metrics_port:
+        start_exporter(settings.worker_metrics_port)
+
+
+@task_prerun.connect
+def _start_task_timer(task_id: str, task: Task, **_: object) -> None:
+    _task_started[task_id] = time.perf_counter()
+    handle = open_span(f"task {task.name}", carrier_from_attributes(task.request), kind="consumer")
+    if handle is not None:
+        _task_spans[task_id] = handle
+    if settings.sql_profiling_enabled:
+        _task_profiles[task_id] = start_profile(f"task {task.name}")
+
+
+@task_postrun.connect
+def _observe_task_duration(task_id: str, task: Task, state: str | None = None, **_: object) -> None:
+    profiled = _task_profiles.pop(task_id, None)
+    if profiled is not None:
+        finish_profile(*profiled)
+    close_span(_task_spans.pop(task_id, None), error=state == "FAILURE")
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+async def _record_email_delivery(
+    notification_id: str | None, delivery_status: NotificationStatus, error: str | None
+) -> None:
+    if notification_id is None:
+        return
+    sessionmaker = get_sessionmaker()
+    async with sessionmaker() as session:
+        # ``sent_at`` stays NULL unless the message was actually delivered.
+        sent_at = current_time() if delivery_status is NotificationStatus.sent else None
+        result = await session.execute(
+            update(Notification)
+            .where(Notification.id == uuid.UUID(notification_id))
+            .values(status=delivery_status, sent_at=sent_at, error=error)
+            .returning(Notification.subscription_id, Notification.channel)
+        )
+        row = result.one_or_none()
+        if row is not None and row.subscription_id is not None and delivery_status is NotificationStatus.sent:
+            await record_last_sent(session, subscription_id=row.subscription_id, channel=row.channel, sent_at=sent_at)
+        await session.commit()
+
+
+@celery_app.task(name="subscriptions.maintenance.purge_expired_tokens")
+def purge_expired_tokens_task() -> dict[str, dict[str, float | int | bool]]:
+    """Delete expired OAuth states, link/verification tokens, sessions and sync tombstones."""
+
+    report = asyncio.run(purge_expired_tokens(get_sessionmaker()))
+    logger.info("Token cleanup removed %d rows", report.total_deleted)
+    return report.as_dict()
+
+
+@celery_app.task(name="subscriptions.maintenance.maintain_partitions")
+def maintain_partitions_task() -> dict[str, list[str]]:
+    """Create upcoming notification/audit log partitions and drop expired ones."""
+
+    report = asyncio.run(maintain_partitions(get_sessionmaker()))
+    return report.as_dict()
+
+
 async def _dispatch_due_reminders() -> None:
     sessionmaker = get_sessionmaker()
     async with sessionmaker() as session:
         now = current_time()
         rows = await _load_due_subscriptions(session=session, now=now)
+        REMINDER_BACKLOG.set(len(rows))
         if not rows:
             return
 
-        for subscription, user, account in rows:
+        for subscription, user, account, last_sent_at in rows:
             await _process_subscription_reminder(
                 session=session,
                 subscription=subscription,
                 user=user,
                 account=account,
+                last_sent_at=last_sent_at,
                 now=now,
             )
 
+        await session.flush()
+        changed: defaultdict[uuid.UUID, list[uuid.UUID]] = defaultdict(list)
+        for subscription, user, _, _ in rows:
+            changed[user.id].append(subscription.id)
+        await record_subscription_changes(session, changed=changed)
         await session.commit()
 
 
 async def _load_due_subscriptions(
     *, session: AsyncSession, now: datetime
-) -> list[tuple[Subscription, User, TelegramAccount]]:
+) -> list[tuple[Subscription, User, TelegramAccount, datetime | None]]:
     stmt = (
-        select(Subscription, User, TelegramAccount)
+        select(Subscription, User, TelegramAccount, NotificationLastSent.last_sent_at)
         .join(User, Subscription.user_id == User.id)
         .join(
             TelegramAccount,
@@ -73,6 +250,13 @@ async def _load_due_subscriptions(
                 TelegramAccount.is_active.is_(True),
             ),
         )
+        .outerjoin(
+            NotificationLastSent,
+            and_(
+                NotificationLastSent.subscription_id == Subscription.id,
+                NotificationLastSent.channel == NotificationChannel.telegram,
+            ),
+        )
         .where(
             Subscription.next_reminder_at.isnot(None),
             Subscription.next_reminder_at <= now,
@@ -92,10 +276,10 @@ async def _process_subscription_reminder(
     subscription: Subscription,
     user: User,
     account: TelegramAccount,
+    last_sent_at: datetime | None,
     now: datetime,
 ) -> None:
-    should_send, last_sent_at = await _should_send_notification(session=session, subscription=subscription, now=now)
-    if not should_send:
+    if not _should_send_notification(last_sent_at=last_sent_at, now=now):
         if last_sent_at is not None:
             subscription.next_reminder_at = last_sent_at + timedelta(days=1)
         else:
@@ -108,6 +292,7 @@ async def _process_subscription_reminder(
             )
         return
 
+    REMINDER_LATENESS.observe((current_time() - subscription.next_reminder_at).total_seconds())
     try:
         await send_subscription_notification(chat_id=account.telegram_chat_id, subscription=subscription)
         delivery_status = NotificationStatus.sent
@@ -123,32 +308,20 @@ async def _process_subscription_reminder(
         subscription_id=subscription.id,
         channel=NotificationChannel.telegram,
         status=delivery_status,
-        sent_at=now,
+        sent_at=now if delivery_status is NotificationStatus.sent else None,
         error=error_message,
     )
     session.add(notification)
 
     if delivery_status is NotificationStatus.sent:
+        await record_last_sent(
+            session, subscription_id=subscription.id, channel=NotificationChannel.telegram, sent_at=now
+        )
         subscription.last_notified_at = now
         subscription.next_reminder_at = now + timedelta(days=1)
 
 
-async def _should_send_notification(
-    *, session: AsyncSession, subscription: Subscription, now: datetime
-) -> tuple[bool, datetime | None]:
-    threshold = now - timedelta(hours=24)
-    stmt = (
-        select(Notification.sent_at)
-        .where(
-            Notification.subscription_id == subscription.id,
-            Notification.channel == NotificationChannel.telegram,
-            Notification.status == NotificationStatus.sent,
-        )
-        .order_by(Notification.sent_at.desc())
-        .limit(1)
-    )
-    result = await session.execute(stmt)
-    last_sent = result.scalar_one_or_none()
-    if last_sent is None:
-        return True, None
-    return last_sent <= threshold, last_sent
+def _should_send_notification(*, last_sent_at: datetime | None, now: datetime) -> bool:
+    """Return whether a day has passed since the last Telegram reminder."""
+
+    return last_sent_at is None or last_sent_at <= now - timedelta(hours=24)
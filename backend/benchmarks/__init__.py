@@ -0,0 +1,5 @@
+"""Reproducible performance benchmarks of the backend.
+
+Run ``python -m benchmarks run --database-url URL`` from ``backend/``; see
+``python -m benchmarks --help`` and the README for details.
+"""
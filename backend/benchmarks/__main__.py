@@ -0,0 +1,161 @@
+"""Command line entry point: ``python -m benchmarks run|compare``."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Reproducible performance benchmarks of the backend."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Generate a dataset and time the benchmark cases")
+    run.add_argument(
+        "--database-url",
+        required=True,
+        help="Database used for the run. ALL its application tables are dropped and recreated.",
+    )
+    run.add_argument("--output", type=Path, default=Path("benchmark-results.json"), help="Result file")
+    run.add_argument("--only", nargs="+", metavar="PATTERN", help="Run cases matching shell-style patterns")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--users", type=int, default=200)
+    run.add_argument("--subscriptions-per-user", type=int, default=50)
+    run.add_argument("--notifications-per-subscription", type=int, default=12)
+    run.add_argument("--history-months", type=int, default=12)
+    run.add_argument("--telegram-ratio", type=float, default=0.6, help="Share of users with a linked Telegram chat")
+    run.add_argument("--session-users", type=int, default=20, help="Users whose access tokens drive API cases")
+    run.add_argument("--iterations", type=int, default=30)
+    run.add_argument("--warmup", type=int, default=3)
+    run.add_argument("--due", type=int, default=100, help="Reminders due on every dispatcher tick")
+    run.add_argument("--telegram-latency-ms", type=float, default=0.0, help="Latency of the fake Telegram API")
+    run.add_argument("--import-rows", type=int, default=1000, help="Rows per import request")
+    run.add_argument(
+        "--import-large-rows", type=int, default=100_000, help="Rows per request of the large import case"
+    )
+    run.add_argument("--redis-url", help="Redis of the token_store.redis case (default REDIS_URL)")
+
+    commands.add_parser("list", help="List the benchmark cases in run order")
+
+    compare = commands.add_parser("compare", help="Compare two result files")
+    compare.add_argument("base", type=Path)
+    compare.add_argument("head", type=Path)
+    compare.add_argument(
+        "--threshold", type=float, default=0.1, help="Median slowdown reported as a regression (default 0.1 = 10%%)"
+    )
+    compare.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions")
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace) -> bool:
+    """Run the selected cases; return whether any of them exceeded its query budget."""
+
+    import httpx
+
+    from app.db.profiling import QueryBudgetExceededError
+    from app.db.session import get_engine, get_sessionmaker
+    from app.main import create_application
+    from app.services.subscriptions import current_time
+    from benchmarks.cases import CASES, Context, Options, select_cases
+    from benchmarks.dataset import DatasetSpec, generate_dataset, reset_schema
+    from benchmarks.runner import CaseSkipped, environment_info, write_results
+
+    names = select_cases(args.only)
+    if not names:
+        raise SystemExit("No case matches the given patterns")
+
+    spec = DatasetSpec(
+        users=args.users,
+        subscriptions_per_user=args.subscriptions_per_user,
+        notifications_per_subscription=args.notifications_per_subscription,
+        history_months=args.history_months,
+        telegram_ratio=args.telegram_ratio,
+        session_users=args.session_users,
+        seed=args.seed,
+    )
+    options = Options(
+        iterations=args.iterations,
+        warmup=args.warmup,
+        due_subscriptions=args.due,
+        telegram_latency_ms=args.telegram_latency_ms,
+        import_rows=args.import_rows,
+        import_large_rows=args.import_large_rows,
+        redis_url=args.redis_url,
+    )
+    meta = environment_info()
+
+    engine = get_engine()
+    session_factory = get_sessionmaker()
+    await reset_schema(engine)
+    dataset = await generate_dataset(session_factory, spec, now=current_time())
+    async with engine.connect() as conn:
+        server_version = (await conn.exec_driver_sql("SHOW server_version")).scalar()
+    print(f"Generated {dataset.row_counts}", file=sys.stderr)
+
+    results = []
+    skipped: dict[str, str] = {}
+    over_budget: dict[str, str] = {}
+    transport = httpx.ASGITransport(app=create_application())
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        context = Context(dataset=dataset, session_factory=session_factory, client=client, options=options)
+        for name in names:
+            try:
+                result = await CASES[name](context)
+            except CaseSkipped as exc:
+                print(f"{name:<40} skipped: {exc}", file=sys.stderr)
+                skipped[name] = str(exc)
+                continue
+            except QueryBudgetExceededError as exc:
+                print(f"{name:<40} FAILED: {exc}", file=sys.stderr)
+                over_budget[name] = str(exc)
+                continue
+            summary = result.as_dict()
+            print(
+                f"{name:<40} median {summary['median_ms']:>9.3f} ms  p95 {summary['p95_ms']:>9.3f} ms"
+                f"  queries/op {summary['queries_per_op']:g}",
+                file=sys.stderr,
+            )
+            results.append(result)
+    await engine.dispose()
+
+    meta.update(
+        postgres=server_version,
+        dataset=spec.as_dict(),
+        row_counts=dataset.row_counts,
+        options=asdict(options),
+        skipped=skipped,
+        over_budget=over_budget,
+    )
+    write_results(args.output, meta=meta, results=results)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return bool(over_budget)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    if args.command == "list":
+        from benchmarks.cases import CASES
+
+        print("\n".join(CASES))
+        return 0
+    if args.command == "compare":
+        from benchmarks.runner import compare_results
+
+        regressions = compare_results(args.base, args.head, threshold=args.threshold)
+        return 1 if regressions and args.fail_on_regression else 0
+
+    # Settings are read on import, so the database must be chosen first.
+    os.environ["DATABASE_URL"] = args.database_url
+    over_budget = asyncio.run(_run(args))
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
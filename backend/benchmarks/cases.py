@@ -0,0 +1,585 @@
+"""Benchmark cases run against the generated dataset."""
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import functools
+import random
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+import httpx
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import bindparam, delete, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.compression import _Compressor, available_encodings
+from app.api.msgpack_codec import msgpack_available, pack_rows
+from app.api.routes.subscriptions import READ_FIELDS, _read_columns
+from app.core.config import settings
+
+from app.models.subscription import (
+    Notification,
+    NotificationChannel,
+    NotificationLastSent,
+    NotificationStatus,
+    Subscription,
+    SubscriptionStatus,
+)
+from app.models.user import TelegramAccount, User
+from app.schemas.subscription import SubscriptionRead, SubscriptionReadRow, subscription_rows_adapter
+from app.services import telegram_bot
+from app.services.auth import create_user_session, get_user_by_access_token
+from app.services.subscriptions import calculate_next_reminder, current_time
+from app.services.token_store import DatabaseTokenStore, LinkTokenRecord, RedisTokenStore, TokenStore
+from app.workers import tasks
+from benchmarks.dataset import TIMEZONES, VENDORS, Dataset
+from benchmarks.runner import CaseResult, CaseSkipped, measure
+
+API_PREFIX = "/api/v1"
+_CALCULATE_BATCH = 1000
+_NOTIFICATION_BATCH = 1000
+_CODEC_ROWS = 1000
+_LARGE_IMPORT_ITERATIONS = 3
+_TOKEN_TTL = timedelta(minutes=10)
+_READ_COLUMNS = _read_columns(READ_FIELDS)
+_subscription_models_adapter = TypeAdapter(list[SubscriptionRead])
+
+
+@dataclass
+class Options:
+    """Run-time knobs shared by the cases."""
+
+    iterations: int = 30
+    warmup: int = 3
+    due_subscriptions: int = 100
+    telegram_latency_ms: float = 0.0
+    import_rows: int = 1000
+    import_large_rows: int = 100_000
+    # Defaults to REDIS_URL.
+    redis_url: str | None = None
+
+
+class FakeBot:
+    """Stands in for the Telegram Bot API, answering after a fixed latency."""
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000
+        self.sent = 0
+
+    async def send_message(self, **_: Any) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sent += 1
+
+
+class FakeTelegramApplication:
+    def __init__(self, latency_ms: float) -> None:
+        self.bot = FakeBot(latency_ms)
+
+
+@dataclass
+class Context:
+    dataset: Dataset
+    session_factory: async_sessionmaker[AsyncSession]
+    client: httpx.AsyncClient
+    options: Options
+
+    @functools.cached_property
+    def session_users(self) -> list[uuid.UUID]:
+        return list(self.dataset.access_tokens)
+
+    def user_for(self, index: int) -> uuid.UUID:
+        return self.session_users[index % len(self.session_users)]
+
+    def headers_for(self, user_id: uuid.UUID) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.dataset.access_tokens[user_id]}",
+            # Fixed, so results do not depend on whether brotli is installed.
+            "Accept-Encoding": "gzip",
+        }
+
+    async def request(self, index: int, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        user_id = self.user_for(index)
+        response = await self.client.request(method, API_PREFIX + path, headers=self.headers_for(user_id), **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {path} failed with {response.status_code}: {response.text[:200]}")
+        return response
+
+    async def run(self, name: str, operation: Callable[[int], Awaitable[None]], **kwargs: Any) -> CaseResult:
+        return await measure(
+            name, operation, iterations=self.options.iterations, warmup=self.options.warmup, **kwargs
+        )
+
+
+Case = Callable[[Context], Awaitable[CaseResult]]
+
+
+async def bench_calculate_next_reminder(ctx: Context) -> CaseResult:
+    rng = random.Random(ctx.dataset.spec.seed)
+    now = ctx.dataset.now
+    statuses = (SubscriptionStatus.active, SubscriptionStatus.expired, SubscriptionStatus.canceled)
+    inputs = [
+        {
+            "end_at": now + timedelta(days=rng.randint(-30, 60), hours=rng.randint(0, 23)),
+            "status": rng.choice(statuses),
+            "last_notified_at": now - timedelta(days=rng.randint(1, 40)) if rng.random() < 0.5 else None,
+            "now": now,
+            "user_timezone": rng.choice(TIMEZONES),
+        }
+        for _ in range(_CALCULATE_BATCH)
+    ]
+
+    async def operation(_: int) -> None:
+        for arguments in inputs:
+            calculate_next_reminder(**arguments)
+
+    return await ctx.run("reminders.calculate_next_reminder", operation, ops_per_iteration=_CALCULATE_BATCH)
+
+
+async def bench_get_user_by_access_token(ctx: Context) -> CaseResult:
+    async def operation(index: int) -> None:
+        token = ctx.dataset.access_tokens[ctx.user_for(index)]
+        async with ctx.session_factory() as session:
+            if await get_user_by_access_token(session, token) is None:
+                raise RuntimeError("Access token was rejected")
+
+    return await ctx.run("auth.get_user_by_access_token", operation)
+
+
+def _list_case(name: str, params: Callable[[int], dict[str, Any]]) -> Case:
+    async def case(ctx: Context) -> CaseResult:
+        async def operation(index: int) -> None:
+            await ctx.request(index, "GET", "/subscriptions", params=params(index))
+
+        # Session lookup and the page itself.
+        return await ctx.run(name, operation, max_queries=2)
+
+    return case
+
+
+def _search_term(index: int) -> dict[str, Any]:
+    vendor = VENDORS[index % len(VENDORS)][0]
+    return {"q": vendor.split()[0].lower()}
+
+
+bench_list_subscriptions = _list_case("api.list_subscriptions", lambda _: {})
+bench_list_subscriptions_page = _list_case("api.list_subscriptions.page", lambda _: {"limit": 20})
+bench_list_subscriptions_q = _list_case("api.list_subscriptions.q", _search_term)
+bench_list_subscriptions_soon = _list_case("api.list_subscriptions.soon", lambda _: {"soon": "true"})
+
+
+async def bench_get_subscription(ctx: Context) -> CaseResult:
+    async def operation(index: int) -> None:
+        subscriptions = ctx.dataset.subscription_ids[ctx.user_for(index)]
+        await ctx.request(index, "GET", f"/subscriptions/{subscriptions[index % len(subscriptions)]}")
+
+    return await ctx.run("api.get_subscription", operation, max_queries=2)
+
+
+async def _subscription_rows(ctx: Context, count: int) -> list[dict[str, Any]]:
+    async with ctx.session_factory() as session:
+        result = await session.execute(select(*_READ_COLUMNS).order_by(Subscription.id).limit(count))
+        rows = [dict(row) for row in result.mappings()]
+    if len(rows) < count:
+        raise CaseSkipped(f"needs {count} subscriptions, the dataset has {len(rows)}")
+    return rows
+
+
+def _serialize_case(name: str, count: int, *, orm: bool) -> Case:
+    """Select ``count`` subscriptions and encode them as the list endpoint does.
+
+    The ``columns`` variant is the current path (column rows, precompiled
+    adapter); the ``orm`` variant hydrates models and validates them
+    through ``SubscriptionRead`` like a ``response_model`` would.
+    """
+
+    async def case(ctx: Context) -> CaseResult:
+        await _subscription_rows(ctx, count)
+        size = 0
+
+        async def operation(_: int) -> None:
+            nonlocal size
+            async with ctx.session_factory() as session:
+                if orm:
+                    subscriptions = (
+                        await session.scalars(select(Subscription).order_by(Subscription.id).limit(count))
+                    ).all()
+                    body = _subscription_models_adapter.dump_json(
+                        _subscription_models_adapter.validate_python(subscriptions, from_attributes=True)
+                    )
+                else:
+                    result = await session.execute(select(*_READ_COLUMNS).order_by(Subscription.id).limit(count))
+                    body = subscription_rows_adapter.dump_json([SubscriptionReadRow(**row) for row in result.mappings()])
+            size = len(body)
+
+        result = await ctx.run(name, operation, ops_per_iteration=count)
+        result.details["bytes"] = size
+        return result
+
+    return case
+
+
+bench_serialize_columns_1k = _serialize_case("serialize.subscriptions.columns.1k", 1_000, orm=False)
+bench_serialize_orm_1k = _serialize_case("serialize.subscriptions.orm.1k", 1_000, orm=True)
+bench_serialize_columns_10k = _serialize_case("serialize.subscriptions.columns.10k", 10_000, orm=False)
+bench_serialize_orm_10k = _serialize_case("serialize.subscriptions.orm.10k", 10_000, orm=True)
+
+
+def _codec_case(name: str, encoding: str) -> Case:
+    """Time one response encoding of ``_CODEC_ROWS`` list rows, without the database."""
+
+    async def case(ctx: Context) -> CaseResult:
+        if encoding == "br" and "br" not in available_encodings():
+            raise CaseSkipped("brotli is not installed")
+        if encoding == "msgpack" and not msgpack_available():
+            raise CaseSkipped("msgpack is not installed")
+        rows = [SubscriptionReadRow(**row) for row in await _subscription_rows(ctx, _CODEC_ROWS)]
+        body = subscription_rows_adapter.dump_json(rows)
+        size = 0
+
+        def encode() -> bytes:
+            if encoding == "json":
+                return subscription_rows_adapter.dump_json(rows)
+            if encoding == "msgpack":
+                return pack_rows(rows)
+            compressor = _Compressor(encoding, settings.compression_gzip_level, settings.compression_brotli_quality)
+            return compressor.finish(body)
+
+        async def operation(_: int) -> None:
+            nonlocal size
+            size = len(encode())
+
+        result = await ctx.run(name, operation)
+        result.details.update(bytes=size, json_bytes=len(body))
+        return result
+
+    return case
+
+
+bench_codec_json = _codec_case("codec.json", "json")
+bench_codec_gzip = _codec_case("codec.gzip", "gzip")
+bench_codec_brotli = _codec_case("codec.brotli", "br")
+bench_codec_msgpack = _codec_case("codec.msgpack", "msgpack")
+
+
+async def bench_subscription_notifications(ctx: Context) -> CaseResult:
+    async def operation(index: int) -> None:
+        subscriptions = ctx.dataset.subscription_ids[ctx.user_for(index)]
+        subscription_id = subscriptions[index % len(subscriptions)]
+        await ctx.request(index, "GET", f"/subscriptions/{subscription_id}/notifications", params={"limit": 20})
+
+    return await ctx.run("api.subscription_notifications", operation, max_queries=3)
+
+
+async def bench_notification_summary(ctx: Context) -> CaseResult:
+    async def operation(index: int) -> None:
+        await ctx.request(index, "GET", "/notifications/summary")
+
+    return await ctx.run("api.notification_summary", operation)
+
+
+def _export_case(file_format: str) -> Case:
+    async def case(ctx: Context) -> CaseResult:
+        async def operation(index: int) -> None:
+            await ctx.request(index, "GET", "/subscriptions/export", params={"format": file_format})
+
+        return await ctx.run(f"api.export_subscriptions.{file_format}", operation)
+
+    return case
+
+
+bench_export_csv = _export_case("csv")
+bench_export_json = _export_case("json")
+
+
+async def bench_create_subscription(ctx: Context) -> CaseResult:
+    now = ctx.dataset.now
+
+    async def operation(index: int) -> None:
+        vendor, category = VENDORS[index % len(VENDORS)]
+        payload = {
+            "name": f"{vendor} benchmark {index}",
+            "price": "499.00",
+            "currency": "RUB",
+            "end_at": (now + timedelta(days=30 + index % 60)).isoformat(),
+            "vendor": vendor,
+            "category": category,
+        }
+        await ctx.request(index, "POST", "/subscriptions", json=payload)
+
+    return await ctx.run("api.create_subscription", operation, max_queries=8)
+
+
+async def bench_patch_subscription(ctx: Context) -> CaseResult:
+    async def operation(index: int) -> None:
+        subscriptions = ctx.dataset.subscription_ids[ctx.user_for(index)]
+        subscription_id = subscriptions[index % len(subscriptions)]
+        payload = {"price": str(Decimal(100 + index) / 100 + 1), "notes": f"benchmark patch {index}"}
+        await ctx.request(index, "PATCH", f"/subscriptions/{subscription_id}", json=payload)
+
+    return await ctx.run("api.patch_subscription", operation, max_queries=9)
+
+
+async def _create_bench_user(ctx: Context, label: str) -> tuple[User, str]:
+    async with ctx.session_factory() as session:
+        user = User(email=f"bench-{label}-{uuid.uuid4().hex}@example.com", email_verified=True)
+        session.add(user)
+        await session.flush()
+        _, tokens = await create_user_session(session, user)
+        await session.commit()
+    return user, tokens.access_token
+
+
+def _import_case(name: str, rows_of: Callable[[Options], int], *, large: bool = False) -> Case:
+    """Import a generated CSV of ``rows_of(options)`` rows per operation.
+
+    The large variant runs at most ``_LARGE_IMPORT_ITERATIONS`` times and
+    deletes the imported rows before each run, so every import starts
+    from the same table size.
+    """
+
+    async def case(ctx: Context) -> CaseResult:
+        rows = rows_of(ctx.options)
+        end_at = (ctx.dataset.now + timedelta(days=90)).isoformat()
+        lines = ["name,price,currency,end_at,vendor,category,notes"]
+        for number in range(rows):
+            vendor, category = VENDORS[number % len(VENDORS)]
+            lines.append(f"{vendor} import {number},{100 + number % 900}.00,RUB,{end_at},{vendor},{category},")
+        body = ("\n".join(lines) + "\n").encode()
+
+        # A separate user per run, so the imported rows do not skew the other cases.
+        user, access_token = await _create_bench_user(ctx, "import")
+        headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "text/csv"}
+
+        async def operation(_: int) -> None:
+            response = await ctx.client.post(
+                f"{API_PREFIX}/subscriptions/import", params={"format": "csv"}, content=body, headers=headers
+            )
+            if response.status_code != 200 or response.json()["imported"] != rows:
+                raise RuntimeError(f"Import failed with {response.status_code}: {response.text[:200]}")
+
+        if not large:
+            return await ctx.run(name, operation, ops_per_iteration=rows)
+
+        async def clear(_: int) -> None:
+            async with ctx.session_factory() as session:
+                await session.execute(delete(Subscription).where(Subscription.user_id == user.id))
+                await session.commit()
+
+        return await measure(
+            name,
+            operation,
+            iterations=min(ctx.options.iterations, _LARGE_IMPORT_ITERATIONS),
+            warmup=min(ctx.options.warmup, 1),
+            ops_per_iteration=rows,
+            setup=clear,
+        )
+
+    return case
+
+
+bench_import_subscriptions = _import_case("api.import_subscriptions.csv", lambda options: options.import_rows)
+bench_import_subscriptions_large = _import_case(
+    "api.import_subscriptions.csv.large", lambda options: options.import_large_rows, large=True
+)
+
+
+def _token_store_case(name: str, backend: str) -> Case:
+    """Issue and consume one Telegram link token per operation."""
+
+    async def case(ctx: Context) -> CaseResult:
+        redis: Redis | None = None
+        store: TokenStore = DatabaseTokenStore()
+        if backend == "redis":
+            redis = Redis.from_url(
+                ctx.options.redis_url or settings.redis_url, socket_timeout=1.0, socket_connect_timeout=1.0
+            )
+            try:
+                await redis.ping()
+            except RedisError as exc:
+                await redis.aclose()
+                raise CaseSkipped(f"Redis is unreachable: {exc}") from exc
+            store = RedisTokenStore(redis, DatabaseTokenStore())
+
+        async def operation(index: int) -> None:
+            record = LinkTokenRecord(
+                id=uuid.uuid4(),
+                user_id=ctx.user_for(index),
+                token=uuid.uuid4().hex,
+                expires_at=current_time() + _TOKEN_TTL,
+            )
+            async with ctx.session_factory() as session:
+                await store.put_link_token(session, record)
+                await session.commit()
+            async with ctx.session_factory() as session:
+                if await store.consume_link_token(session, record.token) is None:
+                    raise RuntimeError("Link token was not found")
+                await session.commit()
+
+        try:
+            return await ctx.run(name, operation)
+        finally:
+            if redis is not None:
+                await redis.aclose()
+
+    return case
+
+
+bench_token_store_database = _token_store_case("token_store.database", "database")
+bench_token_store_redis = _token_store_case("token_store.redis", "redis")
+
+
+async def _session_index_sizes(ctx: Context) -> dict[str, int]:
+    async with ctx.session_factory() as session:
+        result = await session.execute(
+            text(
+                "SELECT c.relname, pg_relation_size(c.oid) FROM pg_index i"
+                " JOIN pg_class c ON c.oid = i.indexrelid"
+                " WHERE i.indrelid = 'user_sessions'::regclass ORDER BY 1"
+            )
+        )
+        return dict(result.tuples().all())
+
+
+async def bench_rotate_session_tokens(ctx: Context) -> CaseResult:
+    """Refresh tokens through the API, one extra session per generated user.
+
+    Also records the size of the ``user_sessions`` indexes, which hold the
+    fixed-width token digests.
+    """
+
+    async with ctx.session_factory() as session:
+        users = (await session.scalars(select(User).where(User.id.in_(ctx.dataset.user_ids)))).all()
+        refresh_tokens = [(await create_user_session(session, user))[1].refresh_token for user in users]
+        await session.commit()
+
+    async def operation(index: int) -> None:
+        slot = index % len(refresh_tokens)
+        response = await ctx.client.post(f"{API_PREFIX}/auth/refresh", json={"refresh_token": refresh_tokens[slot]})
+        if response.status_code != 200:
+            raise RuntimeError(f"Refresh failed with {response.status_code}: {response.text[:200]}")
+        refresh_tokens[slot] = response.json()["tokens"]["refresh_token"]
+
+    result = await ctx.run("auth.rotate_session_tokens", operation)
+    result.details["index_bytes"] = await _session_index_sizes(ctx)
+    return result
+
+
+async def bench_insert_notifications(ctx: Context) -> CaseResult:
+    subscription_ids = [ids[0] for ids in ctx.dataset.subscription_ids.values()]
+
+    async def operation(index: int) -> None:
+        now = current_time()
+        rows = [
+            {
+                "subscription_id": subscription_ids[(index + number) % len(subscription_ids)],
+                "channel": NotificationChannel.telegram,
+                "status": NotificationStatus.sent,
+                "sent_at": now,
+            }
+            for number in range(_NOTIFICATION_BATCH)
+        ]
+        async with ctx.session_factory() as session:
+            await session.execute(insert(Notification), rows)
+            await session.commit()
+
+    return await ctx.run("db.insert_notifications", operation, ops_per_iteration=_NOTIFICATION_BATCH)
+
+
+async def bench_dispatch_tick(ctx: Context) -> CaseResult:
+    async with ctx.session_factory() as session:
+        due_ids = list(
+            await session.scalars(
+                select(Subscription.id)
+                .join(
+                    TelegramAccount,
+                    (TelegramAccount.user_id == Subscription.user_id) & TelegramAccount.is_active.is_(True),
+                )
+                .where(Subscription.status.in_([SubscriptionStatus.active, SubscriptionStatus.expired]))
+                .order_by(Subscription.id)
+                .limit(ctx.options.due_subscriptions)
+            )
+        )
+    if not due_ids:
+        raise RuntimeError("No subscriptions of Telegram users to dispatch; raise --telegram-ratio")
+
+    fake = FakeTelegramApplication(ctx.options.telegram_latency_ms)
+    original = tasks.send_subscription_notification
+    tasks.send_subscription_notification = functools.partial(telegram_bot.send_subscription_notification, bot=fake)
+    try:
+        # Drain reminders that are due in the generated data, so every tick sees the same backlog.
+        await tasks._dispatch_due_reminders()
+
+        async def make_due(_: int) -> None:
+            async with ctx.session_factory() as session:
+                await session.execute(
+                    update(Subscription)
+                    .where(Subscription.id.in_(bindparam("ids", expanding=True)))
+                    .values(next_reminder_at=current_time() - timedelta(minutes=5)),
+                    {"ids": due_ids},
+                )
+                await session.execute(
+                    delete(NotificationLastSent).where(
+                        NotificationLastSent.subscription_id.in_(due_ids),
+                        NotificationLastSent.channel == NotificationChannel.telegram,
+                    )
+                )
+                await session.commit()
+
+        async def operation(_: int) -> None:
+            sent_before = fake.bot.sent
+            await tasks._dispatch_due_reminders()
+            if fake.bot.sent - sent_before != len(due_ids):
+                raise RuntimeError(f"Expected {len(due_ids)} reminders, sent {fake.bot.sent - sent_before}")
+
+        return await ctx.run("dispatcher.tick", operation, ops_per_iteration=len(due_ids), setup=make_due)
+    finally:
+        tasks.send_subscription_notification = original
+
+
+# Reads first, then writes, so writes cannot change what the reads see.
+CASES: dict[str, Case] = {
+    "reminders.calculate_next_reminder": bench_calculate_next_reminder,
+    "auth.get_user_by_access_token": bench_get_user_by_access_token,
+    "api.list_subscriptions": bench_list_subscriptions,
+    "api.list_subscriptions.page": bench_list_subscriptions_page,
+    "api.list_subscriptions.q": bench_list_subscriptions_q,
+    "api.list_subscriptions.soon": bench_list_subscriptions_soon,
+    "api.get_subscription": bench_get_subscription,
+    "serialize.subscriptions.columns.1k": bench_serialize_columns_1k,
+    "serialize.subscriptions.orm.1k": bench_serialize_orm_1k,
+    "serialize.subscriptions.columns.10k": bench_serialize_columns_10k,
+    "serialize.subscriptions.orm.10k": bench_serialize_orm_10k,
+    "codec.json": bench_codec_json,
+    "codec.gzip": bench_codec_gzip,
+    "codec.brotli": bench_codec_brotli,
+    "codec.msgpack": bench_codec_msgpack,
+    "api.subscription_notifications": bench_subscription_notifications,
+    "api.notification_summary": bench_notification_summary,
+    "api.export_subscriptions.csv": bench_export_csv,
+    "api.export_subscriptions.json": bench_export_json,
+    "token_store.database": bench_token_store_database,
+    "token_store.redis": bench_token_store_redis,
+    "auth.rotate_session_tokens": bench_rotate_session_tokens,
+    "api.create_subscription": bench_create_subscription,
+    "api.patch_subscription": bench_patch_subscription,
+    "api.import_subscriptions.csv": bench_import_subscriptions,
+    "api.import_subscriptions.csv.large": bench_import_subscriptions_large,
+    "db.insert_notifications": bench_insert_notifications,
+    "dispatcher.tick": bench_dispatch_tick,
+}
+
+
+def select_cases(patterns: list[str] | None) -> list[str]:
+    """Return case names matching any of the shell-style ``patterns``, in run order."""
+
+    if not patterns:
+        return list(CASES)
+    return [name for name in CASES if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
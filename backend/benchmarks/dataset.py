@@ -0,0 +1,259 @@
+"""Seeded synthetic data: users, subscriptions, Telegram accounts and notification history."""
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.db.base import Base
+from app.models.subscription import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+    Subscription,
+    SubscriptionStatus,
+)
+from app.models.user import TelegramAccount, User
+from app.services.auth import create_user_session
+from app.services.partitions import add_months, ensure_partitions, month_start
+from app.services.subscription_summary import rebuild_summary
+from app.services.subscriptions import calculate_next_reminder, resolve_subscription_status
+
+VENDORS = (
+    ("Netflix", "video"),
+    ("Spotify", "music"),
+    ("YouTube Premium", "video"),
+    ("Yandex Plus", "bundle"),
+    ("Apple One", "bundle"),
+    ("iCloud", "storage"),
+    ("Google One", "storage"),
+    ("Dropbox", "storage"),
+    ("GitHub Copilot", "software"),
+    ("JetBrains", "software"),
+    ("Notion", "software"),
+    ("Figma", "software"),
+    ("Adobe Creative Cloud", "software"),
+    ("Duolingo", "education"),
+    ("Coursera", "education"),
+    ("Kinopoisk", "video"),
+    ("Telegram Premium", "messaging"),
+    ("ChatGPT Plus", "software"),
+    ("Strava", "fitness"),
+    ("World Class", "fitness"),
+)
+PLANS = ("Basic", "Standard", "Premium", "Family", "Pro", "Student", "Annual", "Monthly")
+NOTE_WORDS = (
+    "shared", "with", "family", "cancel", "before", "renewal", "work", "account", "promo", "price",
+    "increase", "card", "ending", "trial", "yearly", "discount", "check", "usage", "team", "personal",
+)
+TIMEZONES = ("Europe/Moscow", "Europe/Berlin", "Asia/Yekaterinburg", "Asia/Novosibirsk", "America/New_York", "UTC")
+CURRENCIES = ("RUB", "RUB", "RUB", "USD", "EUR")
+
+_INSERT_CHUNK = 5000
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Shape of the generated data; equal specs produce equal data relative to ``now``."""
+
+    users: int = 200
+    subscriptions_per_user: int = 50
+    notifications_per_subscription: int = 12
+    history_months: int = 12
+    telegram_ratio: float = 0.6
+    session_users: int = 20
+    seed: int = 42
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Dataset:
+    """Identifiers of the generated rows the benchmark cases work with."""
+
+    spec: DatasetSpec
+    now: datetime
+    user_ids: list[uuid.UUID] = field(default_factory=list)
+    telegram_user_ids: list[uuid.UUID] = field(default_factory=list)
+    subscription_ids: dict[uuid.UUID, list[uuid.UUID]] = field(default_factory=dict)
+    access_tokens: dict[uuid.UUID, str] = field(default_factory=dict)
+    search_terms: list[str] = field(default_factory=list)
+    row_counts: dict[str, int] = field(default_factory=dict)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+async def _insert_chunks(session: AsyncSession, model: type[Base], rows: list[dict[str, Any]]) -> None:
+    for start in range(0, len(rows), _INSERT_CHUNK):
+        await session.execute(insert(model), rows[start : start + _INSERT_CHUNK])
+
+
+async def reset_schema(engine: AsyncEngine) -> None:
+    """Drop and recreate every table of the application metadata."""
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def _subscription_rows(
+    rng: random.Random, dataset: Dataset, user_id: uuid.UUID, user_timezone: str
+) -> list[dict[str, Any]]:
+    now = dataset.now
+    rows = []
+    for _ in range(dataset.spec.subscriptions_per_user):
+        vendor, category = rng.choice(VENDORS)
+        end_at = now + timedelta(days=rng.randint(-90, 365), minutes=rng.randint(0, 24 * 60))
+        provided = rng.choices((None, SubscriptionStatus.canceled, SubscriptionStatus.archived), weights=(85, 10, 5))[0]
+        status = resolve_subscription_status(end_at=end_at, provided_status=provided, now=now)
+        last_notified_at = now - timedelta(hours=rng.randint(1, 72)) if rng.random() < 0.3 else None
+        notes = " ".join(rng.choices(NOTE_WORDS, k=rng.randint(3, 12))) if rng.random() < 0.4 else None
+        subscription_id = _uuid(rng)
+        dataset.subscription_ids[user_id].append(subscription_id)
+        rows.append(
+            {
+                "id": subscription_id,
+                "user_id": user_id,
+                "name": f"{vendor} {rng.choice(PLANS)}",
+                "price_numeric": Decimal(rng.randint(99, 199_900)) / 100,
+                "currency": rng.choice(CURRENCIES),
+                "end_at": end_at,
+                "status": status,
+                "category": category,
+                "vendor": vendor,
+                "notes": notes,
+                "next_reminder_at": calculate_next_reminder(
+                    end_at=end_at,
+                    status=status,
+                    last_notified_at=last_notified_at,
+                    now=now,
+                    user_timezone=user_timezone,
+                ),
+                "last_notified_at": last_notified_at,
+            }
+        )
+    return rows
+
+
+def _notification_rows(rng: random.Random, dataset: Dataset, subscription_id: uuid.UUID) -> list[dict[str, Any]]:
+    spec = dataset.spec
+    history = timedelta(days=30 * spec.history_months)
+    rows = []
+    for _ in range(spec.notifications_per_subscription):
+        created_at = dataset.now - history * rng.random()
+        status = rng.choices(
+            (NotificationStatus.sent, NotificationStatus.failed, NotificationStatus.queued), weights=(90, 8, 2)
+        )[0]
+        rows.append(
+            {
+                "id": _uuid(rng),
+                "created_at": created_at,
+                "updated_at": created_at,
+                "subscription_id": subscription_id,
+                "channel": rng.choices((NotificationChannel.telegram, NotificationChannel.email), weights=(3, 1))[0],
+                "status": status,
+                "sent_at": created_at if status is NotificationStatus.sent else None,
+                "error": "Bad Request: chat not found" if status is NotificationStatus.failed else None,
+            }
+        )
+    return rows
+
+
+async def generate_dataset(
+    session_factory: async_sessionmaker[AsyncSession], spec: DatasetSpec, *, now: datetime
+) -> Dataset:
+    """Insert ``spec.users`` × ``spec.subscriptions_per_user`` subscriptions with related rows.
+
+    The schema must be empty. Access tokens are issued for the first
+    ``spec.session_users`` users.
+    """
+
+    rng = random.Random(spec.seed)
+    dataset = Dataset(spec=spec, now=now)
+    # From the oldest month of history up to the next one.
+    await ensure_partitions(
+        session_factory,
+        now=add_months(month_start(now), -spec.history_months),
+        months_ahead=spec.history_months + 1,
+    )
+
+    users: list[dict[str, Any]] = []
+    accounts: list[dict[str, Any]] = []
+    subscriptions: list[dict[str, Any]] = []
+    for index in range(spec.users):
+        user_id = _uuid(rng)
+        user_timezone = rng.choice(TIMEZONES)
+        dataset.user_ids.append(user_id)
+        dataset.subscription_ids[user_id] = []
+        users.append(
+            {
+                "id": user_id,
+                "email": f"bench-{index:06d}@example.com",
+                "email_verified": True,
+                "tz": user_timezone,
+                "locale": "ru",
+            }
+        )
+        if rng.random() < spec.telegram_ratio:
+            dataset.telegram_user_ids.append(user_id)
+            accounts.append(
+                {
+                    "id": _uuid(rng),
+                    "user_id": user_id,
+                    "telegram_chat_id": 100_000_000 + index,
+                    "linked_at": now - timedelta(days=rng.randint(1, 365)),
+                    "is_active": True,
+                }
+            )
+        subscriptions.extend(_subscription_rows(rng, dataset, user_id, user_timezone))
+
+    notifications: list[dict[str, Any]] = []
+    for subscription in subscriptions:
+        notifications.extend(_notification_rows(rng, dataset, subscription["id"]))
+
+    async with session_factory() as session:
+        await _insert_chunks(session, User, users)
+        await _insert_chunks(session, TelegramAccount, accounts)
+        await _insert_chunks(session, Subscription, subscriptions)
+        await _insert_chunks(session, Notification, notifications)
+        await session.execute(
+            text(
+                """
+                INSERT INTO notification_last_sent (subscription_id, channel, last_sent_at)
+                SELECT subscription_id, channel, max(sent_at)
+                FROM notifications
+                WHERE subscription_id IS NOT NULL AND status = 'sent' AND sent_at IS NOT NULL
+                GROUP BY subscription_id, channel
+                """
+            )
+        )
+        for user_id in dataset.user_ids:
+            await rebuild_summary(session, user_id)
+        for user_id in dataset.user_ids[: spec.session_users]:
+            user = await session.get(User, user_id)
+            _, tokens = await create_user_session(session, user)
+            dataset.access_tokens[user_id] = tokens.access_token
+        await session.commit()
+
+    async with session_factory() as session:
+        # Fresh statistics, so plans do not depend on when autovacuum last ran.
+        await session.execute(text("ANALYZE"))
+        await session.commit()
+
+    dataset.search_terms = sorted({vendor.split()[0].lower() for vendor, _ in VENDORS})
+    dataset.row_counts = {
+        "users": len(users),
+        "telegram_accounts": len(accounts),
+        "subscriptions": len(subscriptions),
+        "notifications": len(notifications),
+    }
+    return dataset
@@ -0,0 +1,161 @@
+"""Timing harness, result files and comparison of two runs."""
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from app.db.profiling import profile_queries, query_budget
+
+SCHEMA_VERSION = 1
+
+Operation = Callable[[int], Awaitable[None]]
+Setup = Callable[[int], Awaitable[None]]
+
+
+class CaseSkipped(Exception):
+    """Raised by a case whose prerequisites are missing, e.g. an optional package."""
+
+
+@dataclass
+class CaseResult:
+    """Timings of one benchmark case, normalised per operation."""
+
+    name: str
+    iterations: int
+    ops_per_iteration: int
+    samples: list[float]
+    queries: list[int]
+    # Non-timing measurements, such as index or payload sizes in bytes.
+    details: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        per_op_ms = sorted(sample * 1000 / self.ops_per_iteration for sample in self.samples)
+        p95_index = min(len(per_op_ms) - 1, round(0.95 * (len(per_op_ms) - 1)))
+        mean_ms = statistics.fmean(per_op_ms)
+        summary = {
+            "iterations": self.iterations,
+            "ops_per_iteration": self.ops_per_iteration,
+            "mean_ms": round(mean_ms, 4),
+            "median_ms": round(statistics.median(per_op_ms), 4),
+            "p95_ms": round(per_op_ms[p95_index], 4),
+            "min_ms": round(per_op_ms[0], 4),
+            "max_ms": round(per_op_ms[-1], 4),
+            "stdev_ms": round(statistics.stdev(per_op_ms), 4) if len(per_op_ms) > 1 else 0.0,
+            "ops_per_second": round(1000 / mean_ms, 2) if mean_ms else None,
+            # Statement counts are deterministic, so any change is worth a look.
+            "queries_per_op": round(statistics.median(self.queries) / self.ops_per_iteration, 3),
+        }
+        if self.details:
+            summary["details"] = self.details
+        return summary
+
+
+async def measure(
+    name: str,
+    operation: Operation,
+    *,
+    iterations: int,
+    warmup: int,
+    ops_per_iteration: int = 1,
+    setup: Setup | None = None,
+    max_queries: int | None = None,
+) -> CaseResult:
+    """Run ``operation`` ``warmup`` times untimed, then ``iterations`` times timed.
+
+    ``setup`` runs before every call outside the timed region, e.g. to
+    make reminders due again. With ``max_queries``, a timed call running
+    more statements per operation raises ``QueryBudgetExceededError``.
+    """
+
+    for index in range(warmup):
+        if setup is not None:
+            await setup(index)
+        await operation(index)
+
+    samples: list[float] = []
+    queries: list[int] = []
+    for index in range(iterations):
+        if setup is not None:
+            await setup(warmup + index)
+        if max_queries is None:
+            profiled = profile_queries(name, report=False)
+        else:
+            profiled = query_budget(max_queries * ops_per_iteration, name)
+        with profiled as profile:
+            started = time.perf_counter()
+            await operation(warmup + index)
+            samples.append(time.perf_counter() - started)
+        queries.append(profile.count)
+    return CaseResult(
+        name=name, iterations=iterations, ops_per_iteration=ops_per_iteration, samples=samples, queries=queries
+    )
+
+
+def _git(*args: str) -> str | None:
+    try:
+        completed = subprocess.run(["git", *args], capture_output=True, text=True, check=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip()
+
+
+def environment_info() -> dict[str, Any]:
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def write_results(path: Path, *, meta: dict[str, Any], results: Sequence[CaseResult]) -> None:
+    document = {
+        "schema_version": SCHEMA_VERSION,
+        "meta": meta,
+        "results": {result.name: result.as_dict() for result in results},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, sort_keys=True, default=str) + "\n", encoding="utf-8")
+
+
+def compare_results(base_path: Path, head_path: Path, *, threshold: float) -> list[str]:
+    """Print median and statement count changes per case; return the regressed cases.
+
+    A case regresses when its median grows by more than ``threshold``
+    (a fraction) or it runs more statements per operation.
+    """
+
+    base_document = json.loads(base_path.read_text(encoding="utf-8"))
+    head_document = json.loads(head_path.read_text(encoding="utf-8"))
+    for key in ("dataset", "options"):
+        if base_document["meta"].get(key) != head_document["meta"].get(key):
+            print(f"Warning: the runs used different {key} settings, timings are not comparable")
+    base, head = base_document["results"], head_document["results"]
+    regressions: list[str] = []
+    width = max((len(name) for name in base.keys() | head.keys()), default=4)
+    print(f"{'case':<{width}}  {'base ms':>10}  {'head ms':>10}  {'change':>8}  queries")
+    for name in sorted(base.keys() | head.keys()):
+        if name not in base or name not in head:
+            print(f"{name:<{width}}  {'only in ' + ('head' if name in head else 'base'):>32}")
+            continue
+        before, after = base[name], head[name]
+        change = (after["median_ms"] - before["median_ms"]) / before["median_ms"] if before["median_ms"] else 0.0
+        regressed = change > threshold or after["queries_per_op"] > before["queries_per_op"]
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<{width}}  {before['median_ms']:>10.3f}  {after['median_ms']:>10.3f}  {change:>+8.1%}"
+            f"  {before['queries_per_op']:g} -> {after['queries_per_op']:g}{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
@@ -83,3 +83,64 @@ export const apiRequest = async <T>(path: string, options: RequestOptions = {}):
 
   return data as T
 }
+
+export interface ServerSentEvent {
+  event: string
+  data: string
+  id?: string
+}
+
+// EventSource cannot send the Authorization header, so events are read from a fetch body.
+export const streamEvents = async (
+  path: string,
+  onEvent: (event: ServerSentEvent) => void,
+  signal?: AbortSignal,
+): Promise<number | null> => {
+  const requestHeaders = new Headers({ Accept: 'text/event-stream' })
+  const accessToken = getStoredAccessToken()
+  if (accessToken) {
+    requestHeaders.set('Authorization', `Bearer ${accessToken}`)
+  }
+
+  const response = await fetch(normalizeUrl(path), {
+    headers: requestHeaders,
+    credentials: 'omit',
+    cache: 'no-store',
+    signal,
+  })
+  if (!response.ok || !response.body) {
+    throw new ApiError(`Request to ${path} failed with status ${response.status}`, response.status, null)
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  let retry: number | null = null
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) return retry
+    buffer += value
+    let boundary = buffer.indexOf('\n\n')
+    while (boundary !== -1) {
+      const block = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      boundary = buffer.indexOf('\n\n')
+
+      const event: ServerSentEvent = { event: 'message', data: '' }
+      const data: string[] = []
+      for (const line of block.split('\n')) {
+        const separator = line.indexOf(':')
+        if (separator === 0) continue
+        const field = separator === -1 ? line : line.slice(0, separator)
+        const fieldValue = separator === -1 ? '' : line.slice(separator + 1).replace(/^ /, '')
+        if (field === 'event') event.event = fieldValue
+        else if (field === 'data') data.push(fieldValue)
+        else if (field === 'id') event.id = fieldValue
+        else if (field === 'retry' && /^\d+$/.test(fieldValue)) retry = Number(fieldValue)
+      }
+      if (data.length > 0) {
+        event.data = data.join('\n')
+        onEvent(event)
+      }
+    }
+  }
+}
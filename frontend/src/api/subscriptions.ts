@@ -1,5 +1,5 @@
-import type { Status, Subscription } from '../types'
-import { apiRequest } from './client'
+import type { Currency, Status, Subscription } from '../types'
+import { apiRequest, streamEvents } from './client'
 
 interface ApiSubscription {
   id: string
@@ -18,6 +18,32 @@ interface ApiSubscription {
   updated_at: string
 }
 
+interface ApiSubscriptionChanges {
+  cursor: string
+  reset: boolean
+  upserted: ApiSubscription[]
+  deleted: { id: string; deleted_at: string }[]
+}
+
+export interface SubscriptionChanges {
+  cursor: string
+  reset: boolean
+  upserted: Subscription[]
+  deletedIds: string[]
+}
+
+interface ApiSubscriptionSummary {
+  counts: Record<Status | 'total', number>
+  reminders_due: number
+  totals_by_currency: Record<string, string | number>
+}
+
+export interface SubscriptionSummary {
+  counts: Record<Status | 'total', number>
+  remindersDue: number
+  totalsByCurrency: Partial<Record<Currency, number>>
+}
+
 export interface SubscriptionCreatePayload extends Record<string, unknown> {
   name: string
   price: number
@@ -54,6 +80,47 @@ export const listSubscriptions = async (): Promise<Subscription[]> => {
   return data.map(mapSubscription)
 }
 
+// Dashboard figures aggregated on the server, so the totals do not need the full list.
+export const getSubscriptionSummary = async (): Promise<SubscriptionSummary> => {
+  const data = await apiRequest<ApiSubscriptionSummary>('/api/v1/subscriptions/summary')
+  return {
+    counts: data.counts,
+    remindersDue: data.reminders_due,
+    totalsByCurrency: Object.fromEntries(
+      Object.entries(data.totals_by_currency).map(([currency, total]) => [
+        currency,
+        typeof total === 'string' ? Number.parseFloat(total) : total,
+      ]),
+    ),
+  }
+}
+
+export const listSubscriptionChanges = async (
+  since?: string | null,
+): Promise<SubscriptionChanges> => {
+  const query = since ? `?since=${encodeURIComponent(since)}` : ''
+  const data = await apiRequest<ApiSubscriptionChanges>(`/api/v1/subscriptions/changes${query}`)
+  return {
+    cursor: data.cursor,
+    reset: data.reset,
+    upserted: data.upserted.map(mapSubscription),
+    deletedIds: data.deleted.map((tombstone) => tombstone.id),
+  }
+}
+
+// Resolves when the server closes the stream with the suggested reconnect delay.
+export const watchSubscriptionChanges = (
+  onChange: () => void,
+  signal?: AbortSignal,
+): Promise<number | null> =>
+  streamEvents(
+    '/api/v1/subscriptions/events',
+    (event) => {
+      if (event.event === 'changes') onChange()
+    },
+    signal,
+  )
+
 export const createSubscription = async (
   payload: SubscriptionCreatePayload,
 ): Promise<Subscription> => {
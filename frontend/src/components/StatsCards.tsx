@@ -1,21 +1,22 @@
 import { formatMoney } from '../utils/format'
-import type { Currency, Settings, Subscription } from '../types'
-import { normalizedTotalUsd, resolveStatus, totalsByCurrency } from '../utils/subscriptions'
+import type { Currency, Settings } from '../types'
+import type { SubscriptionSummary } from '../api/subscriptions'
+import { normalizedTotalUsd } from '../utils/subscriptions'
 import { FX_RATES } from '../utils/constants'
 import { useI18n } from '../i18n'
 
 interface StatsCardsProps {
-  subscriptions: Subscription[]
+  summary: SubscriptionSummary | null
   settings: Settings
-  remindersDue: number
 }
 
-const StatsCards = ({ subscriptions, settings, remindersDue }: StatsCardsProps) => {
+const StatsCards = ({ summary, settings }: StatsCardsProps) => {
   const { t } = useI18n()
-  const totals = totalsByCurrency(subscriptions)
-  const normalized = normalizedTotalUsd(subscriptions)
-  const activeCount = subscriptions.filter((subscription) => resolveStatus(subscription) === 'active').length
-  const archivedCount = subscriptions.filter((subscription) => resolveStatus(subscription) === 'archived').length
+  const totals = summary?.totalsByCurrency ?? {}
+  const normalized = normalizedTotalUsd(totals)
+  const activeCount = summary?.counts.active ?? 0
+  const archivedCount = summary?.counts.archived ?? 0
+  const remindersDue = summary?.remindersDue ?? 0
 
   return (
     <section className="grid gap-4 md:grid-cols-2 xl:grid-cols-4">
@@ -37,7 +38,7 @@ const StatsCards = ({ subscriptions, settings, remindersDue }: StatsCardsProps)
           {Object.entries(totals).map(([currency, total]) => (
             <li key={currency} className="flex items-center justify-between">
               <span className="uppercase tracking-[0.2em] text-midnight/50">{currency}</span>
-              <span className="font-medium text-midnight">{formatMoney(total, currency as keyof typeof FX_RATES, settings.locale)}</span>
+              <span className="font-medium text-midnight">{formatMoney(total ?? 0, currency as keyof typeof FX_RATES, settings.locale)}</span>
             </li>
           ))}
           {Object.keys(totals).length === 0 ? (
@@ -1,8 +1,10 @@
+import { useEffect, useState } from 'react'
 import StatsCards from '../components/StatsCards'
 import ReminderList from '../components/ReminderList'
 import Sparkline from '../components/Sparkline'
 import { selectSettings, selectSubscriptions, useStore } from '../store/useStore'
 import { shouldShowInReminders, monthlySparkline } from '../utils/subscriptions'
+import { getSubscriptionSummary, type SubscriptionSummary } from '../api/subscriptions'
 import { useI18n } from '../i18n'
 
 const DashboardPage = () => {
@@ -12,13 +14,27 @@ const DashboardPage = () => {
   const clearReminder = useStore((state) => state.clearReminder)
   const pushToast = useStore((state) => state.pushToast)
   const { t } = useI18n()
+  const [summary, setSummary] = useState<SubscriptionSummary | null>(null)
+
+  // The store changes after every mutation and live sync, so refetch the totals then.
+  useEffect(() => {
+    let cancelled = false
+    getSubscriptionSummary()
+      .then((nextSummary) => {
+        if (!cancelled) setSummary(nextSummary)
+      })
+      .catch((error) => console.error('Failed to load subscription summary', error))
+    return () => {
+      cancelled = true
+    }
+  }, [subscriptions])
 
   const remindersDue = subscriptions.filter((subscription) => shouldShowInReminders(subscription, settings)).length
   const sparkline = monthlySparkline(subscriptions)
 
   return (
     <div className="space-y-6">
-      <StatsCards subscriptions={subscriptions} settings={settings} remindersDue={remindersDue} />
+      <StatsCards summary={summary} settings={settings} />
 
       <section className="grid gap-6 lg:grid-cols-[2fr,1fr]">
         <div className="space-y-4">
@@ -5,12 +5,13 @@ import { resolveStatus } from '../utils/subscriptions'
 import {
   createSubscription as apiCreateSubscription,
   deleteSubscription as apiDeleteSubscription,
-  listSubscriptions as apiListSubscriptions,
+  listSubscriptionChanges as apiListSubscriptionChanges,
   patchSubscription as apiPatchSubscription,
   snoozeSubscription as apiSnoozeSubscription,
   type SubscriptionCreatePayload,
   type SubscriptionUpdatePayload,
   updateSubscriptionStatus as apiUpdateSubscriptionStatus,
+  watchSubscriptionChanges as apiWatchSubscriptionChanges,
 } from '../api/subscriptions'
 
 export type ToastVariant = 'info' | 'success' | 'error'
@@ -97,18 +98,64 @@ const toUpdatePayload = (input: Partial<SubscriptionDraft>): SubscriptionUpdateP
 }
 
 export const useStore = create<StoreState>()((set, get) => {
-  const refreshSubscriptions = async () => {
-    const subscriptions = await apiListSubscriptions()
-    set(() => ({
-      subscriptions: subscriptions.map((subscription) => ({
-        ...subscription,
-        status:
-          subscription.status === 'archived' || subscription.status === 'canceled'
-            ? subscription.status
-            : resolveStatus(subscription),
-      })),
-    }))
-    return subscriptions
+  const withResolvedStatus = (subscription: Subscription): Subscription => ({
+    ...subscription,
+    status:
+      subscription.status === 'archived' || subscription.status === 'canceled'
+        ? subscription.status
+        : resolveStatus(subscription),
+  })
+
+  // Cursor of the last delta sync; the first sync returns the full list.
+  let syncCursor: string | null = null
+
+  const syncSubscriptions = async () => {
+    const changes = await apiListSubscriptionChanges(syncCursor)
+    syncCursor = changes.cursor
+    set((state) => {
+      const upserted = changes.upserted.map(withResolvedStatus)
+      if (changes.reset) {
+        return { subscriptions: upserted }
+      }
+      const replaced = new Map(upserted.map((subscription) => [subscription.id, subscription]))
+      const deleted = new Set(changes.deletedIds)
+      const kept = state.subscriptions
+        .filter((subscription) => !deleted.has(subscription.id))
+        .map((subscription) => replaced.get(subscription.id) ?? withResolvedStatus(subscription))
+      const keptIds = new Set(kept.map((subscription) => subscription.id))
+      return {
+        subscriptions: [...upserted.filter((subscription) => !keptIds.has(subscription.id)), ...kept],
+      }
+    })
+    return get().subscriptions
+  }
+
+  // Syncs run one at a time so every request starts from the latest cursor.
+  let syncQueue: Promise<unknown> = Promise.resolve()
+  const refreshSubscriptions = () => {
+    const run = syncQueue.then(syncSubscriptions)
+    syncQueue = run.catch(() => undefined)
+    return run
+  }
+
+  // Live change events from the server trigger a delta sync.
+  const watchChanges = async () => {
+    let failures = 0
+    for (;;) {
+      let delay = 5000
+      try {
+        delay =
+          (await apiWatchSubscriptionChanges(() => {
+            refreshSubscriptions().catch((error) => console.error('Failed to sync subscriptions', error))
+          })) ?? delay
+        failures = 0
+      } catch (error) {
+        failures += 1
+        delay = Math.min(delay * 2 ** failures, 60000)
+        console.warn('Live subscription updates disconnected', error)
+      }
+      await new Promise((resolve) => setTimeout(resolve, delay))
+    }
   }
 
   return {
@@ -132,6 +179,7 @@ export const useStore = create<StoreState>()((set, get) => {
       } finally {
         set({ hydrated: true })
       }
+      void watchChanges()
     },
     addSubscription: async (input) => {
       const created = await apiCreateSubscription(toCreatePayload(input))
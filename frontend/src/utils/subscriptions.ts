@@ -6,7 +6,7 @@ import {
   startOfMonth,
   subMonths,
 } from 'date-fns'
-import type { Settings, Subscription, Status } from '../types'
+import type { Currency, Settings, Subscription, Status } from '../types'
 import { FX_RATES } from './constants'
 import { createSnoozeDate, daysUntil, isDueSoonDate, isPast, isReminderDue, parseDate } from './dates'
 
@@ -101,22 +101,11 @@ export const sortSubscriptions = (subscriptions: Subscription[], sort: Subscript
   })
 }
 
-export const totalsByCurrency = (subscriptions: Subscription[]) => {
-  return subscriptions.reduce<Record<string, number>>((acc, subscription) => {
-    const status = resolveStatus(subscription)
-    if (status === 'archived' || status === 'canceled') return acc
-    acc[subscription.currency] =
-      (acc[subscription.currency] ?? 0) + Number.parseFloat(subscription.price.toFixed(2))
-    return acc
-  }, {})
-}
-
-export const normalizedTotalUsd = (subscriptions: Subscription[]) => {
-  return subscriptions.reduce((total, subscription) => {
-    const status = resolveStatus(subscription)
-    if (status === 'archived' || status === 'canceled') return total
-    return total + subscription.price * FX_RATES[subscription.currency]
-  }, 0)
+export const normalizedTotalUsd = (totals: Partial<Record<Currency, number>>) => {
+  return Object.entries(totals).reduce(
+    (total, [currency, amount]) => total + (amount ?? 0) * (FX_RATES[currency as Currency] ?? 0),
+    0,
+  )
 }
 
 export interface SparklinePoint {